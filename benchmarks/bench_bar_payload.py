@@ -0,0 +1,61 @@
+"""
+Compare bar payload encodings: JSON rows (current default), JSON columnar, and
+the packed binary body served for Accept: application/vnd.fta.bars.
+
+Usage: PYTHONPATH=src python benchmarks/bench_bar_payload.py [days ...]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.services.data.bar_serialization import pack_bars, serialize_bars
+
+BARS_PER_DAY = 81
+
+
+def synthetic_bars(days: int) -> pd.DataFrame:
+    sessions = pd.bdate_range("2025-01-02", periods=days) + pd.Timedelta(hours=8, minutes=30)
+    stamps = (sessions.to_numpy()[:, None] + np.arange(BARS_PER_DAY) * np.timedelta64(5, "m")).ravel()
+    rng = np.random.default_rng(7)
+    close = 5600 + np.cumsum(rng.normal(0, 1.5, stamps.size)).round(2)
+    return pd.DataFrame(
+        {
+            "Datetime": pd.DatetimeIndex(stamps).tz_localize("US/Central"),
+            "Open": close - 0.25,
+            "High": close + 1.0,
+            "Low": close - 1.0,
+            "Close": close,
+            "Volume": rng.integers(100, 5000, stamps.size).astype(float),
+        }
+    )
+
+
+def _timed(fn, repeat: int = 5):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - started)
+    return out, best
+
+
+def run(days: int) -> None:
+    df = synthetic_bars(days)
+    rows_json, t_rows = _timed(lambda: json.dumps(serialize_bars(df, "US/Central")).encode())
+    cols_json, t_cols = _timed(lambda: json.dumps(serialize_bars(df, fmt="columnar")).encode())
+    packed, t_bin = _timed(lambda: pack_bars(df))
+    print(f"{days:>5} days / {len(df):>7} bars")
+    for name, payload, secs in (("json rows", rows_json, t_rows), ("json columnar", cols_json, t_cols), ("binary", packed, t_bin)):
+        print(f"    {name:<14} {len(payload) / 1024:>10.1f} KiB  {secs * 1000:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:] or ["5", "60", "250"]:
+        run(int(arg))
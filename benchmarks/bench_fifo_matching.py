@@ -0,0 +1,109 @@
+"""
+Round-trip parsing of synthetic broker fill exports with multi-lot fills
+(process_csv, process_csv_with_execution_legs and the chunked
+iter_round_trip_batches), plus traced peak memory of the whole-file and
+streamed parses. For the smallest size the old per-contract deque pairing
+is timed as a baseline.
+
+Usage: PYTHONPATH=src python benchmarks/bench_fifo_matching.py [fills ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dashboard.services.utils import performance_acquisition as pa
+from dashboard.services.utils.fifo_matching import load_broker_fills
+
+MAX_LOTS = 10
+CHUNK_ROWS = 5_000
+
+
+def synthetic_fills(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    days = pd.bdate_range("2024-01-02", periods=n // 200 + 1)
+    t = pd.DatetimeIndex(np.repeat(days.to_numpy(), 200)[:n]) + pd.to_timedelta(
+        9 * 3600 + np.tile(np.arange(200) * 120, len(days))[:n], unit="s"
+    )
+    # Buy/sell pairs alternate between the symbols; each sell closes the size of an
+    # earlier buy of its symbol, so the export is flat but fills split across lots.
+    n -= n % 4
+    t = t[:n]
+    symbol = np.where(np.arange(n) % 4 < 2, "MESH4", "MNQH4")
+    lots = rng.integers(1, MAX_LOTS + 1, n // 2)
+    qty = np.ravel(np.column_stack([lots, -np.roll(lots, 2)]))
+    return pd.DataFrame(
+        {
+            "Date/Time": t.strftime("%Y%m%d;%H%M%S"),
+            "Symbol": symbol,
+            "Quantity": qty,
+            "Price": np.round(5000 + rng.normal(0, 20, n) * 4) / 4,
+            "TradeDate": t.strftime("%Y%m%d"),
+            "BrokerExecutionCommission": -0.25 * np.abs(qty),
+            "ThirdPartyExecutionCommission": -0.1 * np.abs(qty),
+            "ThirdPartyRegulatoryCommission": -0.02 * np.abs(qty),
+        }
+    )
+
+
+def unit_pairs(path: Path) -> int:
+    """Old matching core: one queue entry per contract, paired one by one."""
+    fills = load_broker_fills(path)
+    pairs = 0
+    for symbol in fills["Symbol"].unique():
+        buys, sells = deque(), deque()
+        for _, row in fills[fills["Symbol"] == symbol].iterrows():
+            qty = int(row["Quantity"])
+            trade = {"Time": row["Date/Time"], "Price": row["Price"], "FeePerUnit": row["TotalFee"] / abs(qty)}
+            (buys if qty > 0 else sells).extend(trade.copy() for _ in range(abs(qty)))
+        while buys and sells:
+            buys.popleft(), sells.popleft()
+            pairs += 1
+    return pairs
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def _peak_mb(fn) -> float:
+    """Traced peak allocation of one (separate, slower) call."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def run(n: int, baseline: bool, workdir: Path) -> None:
+    path = workdir / f"fills_{n}.csv"
+    synthetic_fills(n).to_csv(path, index=False)
+    print(f"{n:>9} fills")
+    streamed = lambda: sum(len(batch) for batch in pa.iter_round_trip_batches(path, CHUNK_ROWS))
+    for name, fn in (
+        ("process_csv", lambda: pa.process_csv(path)),
+        ("with_execution_legs", lambda: pa.process_csv_with_execution_legs(str(path))),
+        ("streamed batches", streamed),
+    ):
+        print(f"    {name:<22} {_timed(fn) * 1000:>10.1f} ms")
+    if baseline:
+        print(f"    {'unit deque pairs (old)':<22} {_timed(lambda: unit_pairs(path)) * 1000:>10.1f} ms")
+    print(f"    {'peak process_csv':<22} {_peak_mb(lambda: pa.process_csv(path)):>10.1f} MB")
+    print(f"    {'peak streamed':<22} {_peak_mb(streamed):>10.1f} MB")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2_000, 20_000, 200_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for idx, size in enumerate(sizes):
+            run(size, baseline=idx == 0, workdir=Path(tmp))
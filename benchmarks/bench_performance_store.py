@@ -0,0 +1,91 @@
+"""
+Merging a small upload into Performance_sum as the history grows: the
+month-partitioned store (warm snapshot, as in the running server, and cold,
+as in a fresh job process) against the old whole-file read/normalize/rewrite.
+Rollup and running-metric syncs are included in the store timings.
+
+Usage: PYTHONPATH=src python benchmarks/bench_performance_store.py [trades ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dashboard.services.data import performance_store
+from dashboard.services.data.performance_repository import performance_repository
+from dashboard.services.utils import performance_acquisition as pa
+from dashboard.services.utils.persistence import atomic_write_csv
+
+TRADES_PER_DAY = 20
+UPLOAD_TRADES = 20
+
+
+def synthetic_round_trips(n: int, start: str, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(start, periods=n // TRADES_PER_DAY + 1)
+    day = np.repeat(days.to_numpy(), TRADES_PER_DAY)[:n]
+    entered = pd.DatetimeIndex(day + np.tile(np.arange(TRADES_PER_DAY) * np.timedelta64(13, "m"), len(days))[:n] + np.timedelta64(14, "h"))
+    return pd.DataFrame(
+        {
+            "Id": np.tile(np.arange(1, TRADES_PER_DAY + 1), len(days))[:n],
+            "ContractName": "MESH5",
+            "EnteredAt": entered.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "ExitedAt": (entered + pd.Timedelta(minutes=5)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "EntryPrice": 6000.0,
+            "ExitPrice": 6001.0,
+            "Fees": 1.24,
+            "PnL": np.round(rng.normal(5, 60, n), 2),
+            "Size": 1,
+            "Type": "Long",
+            "TradeDuration": "0 days 00:05:00",
+        }
+    )
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def whole_file_rewrite(csv_path: Path) -> None:
+    """Old core of generate_aggregated_data: read, normalize and rewrite every stored row."""
+    past = pa._normalize_stored_rows(pd.read_csv(csv_path))
+    atomic_write_csv(pa._sort_combined(past), csv_path)
+
+
+def run(n: int, workdir: Path) -> None:
+    history, _ = pa._prepare_incoming([synthetic_round_trips(n, "2000-01-03", 1)])
+    last_day = pd.Timestamp(history["EnteredAt"].max()).tz_convert("UTC").normalize() + pd.offsets.BDay(1)
+    legacy = workdir / f"legacy_{n}.csv"
+    history.to_csv(legacy, index=False)
+    csv_path = workdir / f"Performance_sum_{n}.csv"
+    pa.PERFORMANCE_CSV = str(csv_path)
+    performance_store.write_months(performance_store.split_months(history), csv_path)
+    print(f"{n:>9} stored trades, {UPLOAD_TRADES} uploaded")
+
+    repository = performance_repository(csv_path)
+    repository.snapshot()
+    pa.generate_aggregated_data([synthetic_round_trips(UPLOAD_TRADES, f"{last_day:%Y-%m-%d}", 2)])  # rollup/state files
+    warm = _timed(lambda: pa.generate_aggregated_data([synthetic_round_trips(UPLOAD_TRADES, f"{last_day + pd.offsets.BDay(2):%Y-%m-%d}", 3)]))
+    repository.invalidate()
+    cold = _timed(lambda: pa.generate_aggregated_data([synthetic_round_trips(UPLOAD_TRADES, f"{last_day + pd.offsets.BDay(4):%Y-%m-%d}", 4)]))
+    print(f"    {'store merge (warm)':<24} {warm * 1000:>10.1f} ms")
+    print(f"    {'store merge (cold)':<24} {cold * 1000:>10.1f} ms")
+    print(f"    {'whole-file rewrite (old)':<24} {_timed(lambda: whole_file_rewrite(legacy)) * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    # Keep the benchmark away from the real portfolio files and audit log.
+    pa.sync_trade_sum_from_performance_rows = lambda *args, **kwargs: None
+    pa.append_audit_event = lambda *args, **kwargs: None
+    sizes = [int(arg) for arg in sys.argv[1:]] or [5_000, 50_000, 200_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            run(size, workdir=Path(tmp))
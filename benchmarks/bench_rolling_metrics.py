@@ -0,0 +1,65 @@
+"""
+Scaling of the rolling analysis metrics (rolling_win_rate, trade_efficiency,
+sharpe_ratio) over synthetic trade logs. For the smallest size the old
+per-window loop is timed as a baseline.
+
+Usage: PYTHONPATH=src python benchmarks/bench_rolling_metrics.py [trades ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.services.analysis import compute
+
+WINDOW = 20
+TRADES_PER_DAY = 40
+
+
+def synthetic_trades(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    days = pd.bdate_range("1980-01-07", periods=n // TRADES_PER_DAY + 1)
+    day = np.repeat(days.to_numpy(), TRADES_PER_DAY)[:n]
+    entered = pd.DatetimeIndex(day + np.tile(np.arange(TRADES_PER_DAY) * np.timedelta64(9, "m"), len(days))[:n] + np.timedelta64(14, "h"))
+    return pd.DataFrame(
+        {
+            "EnteredAt": entered.tz_localize("UTC"),
+            "ExitedAt": (entered + pd.to_timedelta(rng.integers(30, 480, n), unit="s")).tz_localize("UTC"),
+            "PnL(Net)": np.round(rng.normal(5, 60, n), 2),
+        }
+    )
+
+
+def loop_win_rate(df: pd.DataFrame, window: int) -> list:
+    df = df.sort_values("ExitedAt").reset_index(drop=True)
+    win = pd.Series(np.where(df["PnL(Net)"] > 0, 1, -1))
+    return [round((win.iloc[i - window + 1:i + 1] == 1).sum() / window * 100, 2) for i in range(window - 1, len(df))]
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def run(n: int, baseline: bool) -> None:
+    df = synthetic_trades(n)
+    print(f"{n:>9} trades")
+    for name, fn in (
+        ("rolling_win_rate", lambda: compute.rolling_win_rate(df, WINDOW)),
+        ("trade_efficiency", lambda: compute.trade_efficiency(df, WINDOW)),
+        ("sharpe_ratio", lambda: compute.sharpe_ratio(df, WINDOW)),
+    ):
+        print(f"    {name:<22} {_timed(fn) * 1000:>10.1f} ms")
+    if baseline:
+        print(f"    {'loop win rate (old)':<22} {_timed(lambda: loop_win_rate(df, WINDOW)) * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for idx, size in enumerate(sizes):
+        run(size, baseline=idx == 0)
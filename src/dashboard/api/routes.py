@@ -2,9 +2,10 @@
 Lightweight JSON API shim exposing existing analytics for the new frontend.
 
 Routes:
-- GET /api/candles            -> raw 5m OHLCV from CSV
+- GET /api/candles            -> raw 5m OHLCV (format=rows|columnar)
 - GET /api/performance/combined -> combined performance CSV
 - POST /api/analysis/<metric> -> wraps functions in dashboard.analysis.compute
+- POST /api/analysis/batch    -> several metrics over one shared performance load
 """
 
 import json
@@ -15,11 +16,16 @@ from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
 import pandas as pd
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request
 
 from dashboard.services.analysis import compute
 from dashboard.services.analysis.behavioral import behavior_heatmap
+from dashboard.services.analysis.daily_rollup import ROLLUP_METRICS, RollupDays, load_daily_rollup, rollup_is_current, sync_daily_rollup
 from dashboard.services.analysis.plots import get_statistics
+from dashboard.services.analysis.running_metrics import load_running_state, running_summary
+from dashboard.services.analysis.prepared import prepare_performance
+from dashboard.services.analysis.result_cache import MISS, RESULT_CACHE, file_token, result_key
+from dashboard.services.analysis.studies import bar_studies, parse_studies, studies_payload
 from dashboard.config.settings import DATA_SOURCE_DROPDOWN, PERFORMANCE_CSV, SYMBOL_CATALOG, CONTRACT_SPECS_CSV
 from dashboard.config.env import TEMP_PERF_DIR, playback_speeds, timeframe_options
 from dashboard.config.analysis import (
@@ -30,20 +36,32 @@ from dashboard.config.analysis import (
     risk_free_rate,
     rule_compliance_defaults,
 )
-from dashboard.config.app_config import get_app_config
+from dashboard.config.app_config import app_config_path, get_app_config
 from dashboard.config.runtime_config import runtime_config_payload, update_runtime_config
 from dashboard.config.runtime_manifest import runtime_manifest
 from dashboard.services.data.load_data import load_performance, load_future
+from dashboard.services.data.bar_serialization import BAR_BINARY_MIMETYPE, pack_bars, parse_bar_format, serialize_bars
+from dashboard.services.data.day_index import ensure_day_index, last_utc_date
+from dashboard.services.data.resample import parse_timeframe, resampled_bars
+from dashboard.services.data.performance_repository import (
+    PerformanceSnapshot,
+    performance_repository,
+    performance_snapshot,
+)
+from dashboard.services.data.performance_store import ensure_store, performance_exists, write_months
 from dashboard.services.portfolio import equity_series, append_manual
 from dashboard.services.analysis.portfolio_metrics import portfolio_metrics
 from dashboard.services.utils.trade_enrichment import ensure_trade_id
 from dashboard.services.utils.tag_taxonomy import taxonomy_payload
 from dashboard.services.utils.day_plan_taxonomy import day_plan_taxonomy_payload
+from dashboard.services.utils import day_plan as day_plan_store
+from dashboard.services.utils import journal_live as journal_live_store
 from dashboard.services.utils.day_plan import list_day_plan, upsert_day_plan_rows
 from dashboard.services.utils.performance_acquisition import (
-    process_csv_with_execution_legs,
+    preview_upload_file,
     generate_aggregated_data,
 )
+from dashboard.services.utils.parallel_parse import map_files
 from dashboard.services.utils.data_acquisition import (
     acquire_missing_data,
     get_last_date_in_csv,
@@ -62,19 +80,18 @@ from dashboard.services.utils.journal_live import (
     load_journal_live,
     DIRECTION_VALUES,
 )
-from dashboard.services.utils.persistence import advisory_file_lock, atomic_write_csv, append_audit_event
+from dashboard.services.utils.persistence import advisory_file_lock, append_audit_event
 from dashboard.services.utils.datetime_utils import (
     parse_optional_timestamp_utc,
     parse_optional_date_in_timezone,
     ensure_valid_range,
     normalize_series_utc,
-    normalize_series_to_timezone,
-    iso_utc,
 )
 import numpy as np
 
 
 VALID_GRANULARITIES = {"1D", "1W-MON", "1M"}
+MAX_BATCH_METRICS = 32
 VALID_METRICS = {
     "behavioral_heatmap",
     "pnl_growth",
@@ -112,7 +129,7 @@ def _cors_headers(response, allowed_origin: str):
     response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
     response.headers["Access-Control-Allow-Methods"] = "GET,POST,PATCH,DELETE,OPTIONS"
     response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Vary"] = "Origin"
+    response.vary.add("Origin")
     return response
 
 
@@ -123,6 +140,17 @@ def _iso_in_timezone(value: object, tz_name: str) -> str:
     return ts.tz_convert(tz_name).isoformat()
 
 
+def _wants_binary_bars() -> bool:
+    return request.accept_mimetypes.best_match(["application/json", BAR_BINARY_MIMETYPE]) == BAR_BINARY_MIMETYPE
+
+
+def _binary_bars_response(df: pd.DataFrame, meta: Optional[Dict[str, Any]] = None) -> Response:
+    body = pack_bars(df, meta, dumps=current_app.json.dumps)
+    resp = Response(body, mimetype=BAR_BINARY_MIMETYPE)
+    resp.vary.add("Accept")
+    return resp
+
+
 def _json_safe(value: Any) -> Any:
     if isinstance(value, pd.Timestamp):
         if pd.isna(value):
@@ -407,14 +435,25 @@ def _build_matching_suggestions(
     return suggestions
 
 
-def _validate_metric_payload(metric: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+def _validate_metric_options(metric: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     if metric not in VALID_METRICS:
         raise ValueError(f"unknown metric {metric}")
     if "granularity" in payload and payload.get("granularity") is not None:
         granularity = str(payload["granularity"])
         if granularity not in VALID_GRANULARITIES:
             raise ValueError(f"granularity must be one of {sorted(VALID_GRANULARITIES)}")
-    if "window" in payload and payload.get("window") is not None:
+    if metric == "sharpe_ratio" and isinstance(payload.get("window"), list):
+        # Several windows come back as one wide frame (Sharpe_<w>d columns).
+        windows = payload["window"]
+        if not windows:
+            raise ValueError("window must be a positive integer or a non-empty list of them")
+        try:
+            payload["window"] = [int(w) for w in windows]
+        except (TypeError, ValueError):
+            raise ValueError("window must be a positive integer or a non-empty list of them")
+        if min(payload["window"]) < 1:
+            raise ValueError("window must be a positive integer or a non-empty list of them")
+    elif "window" in payload and payload.get("window") is not None:
         try:
             payload["window"] = int(payload["window"])
         except (TypeError, ValueError):
@@ -425,6 +464,10 @@ def _validate_metric_payload(metric: str, payload: Dict[str, Any]) -> Dict[str,
     if params is not None and not isinstance(params, dict):
         raise ValueError("params must be an object")
     payload["params"] = params or {}
+    return payload
+
+
+def _validate_analysis_scope(payload: Dict[str, Any]) -> Dict[str, Any]:
     raw_include_unmatched = payload.get("include_unmatched", None)
     payload["include_unmatched"] = _coerce_bool(raw_include_unmatched, default=False)
     payload["symbol"] = _validate_symbol(payload.get("symbol"), required=False)
@@ -434,6 +477,38 @@ def _validate_metric_payload(metric: str, payload: Dict[str, Any]) -> Dict[str,
     return payload
 
 
+def _validate_metric_payload(metric: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return _validate_analysis_scope(_validate_metric_options(metric, payload))
+
+
+def _validate_batch_payload(payload: Dict[str, Any]) -> tuple[Dict[str, Any], list[tuple[str, str, Dict[str, Any]]]]:
+    items = payload.get("metrics")
+    if not isinstance(items, list) or not items:
+        raise ValueError("metrics must be a non-empty list")
+    if len(items) > MAX_BATCH_METRICS:
+        raise ValueError(f"at most {MAX_BATCH_METRICS} metrics per batch")
+    scope = _validate_analysis_scope({k: v for k, v in payload.items() if k != "metrics"})
+    jobs: list[tuple[str, str, Dict[str, Any]]] = []
+    seen: set[str] = set()
+    for item in items:
+        if isinstance(item, str):
+            item = {"metric": item}
+        if not isinstance(item, dict):
+            raise ValueError("each metrics entry must be a metric name or an object")
+        metric = str(item.get("metric") or "")
+        key = str(item.get("key") or metric)
+        if key in seen:
+            raise ValueError(f"duplicate batch key {key}")
+        seen.add(key)
+        options = {
+            "granularity": item.get("granularity", payload.get("granularity")),
+            "window": item.get("window", payload.get("window")),
+            "params": item.get("params"),
+        }
+        jobs.append((key, metric, {**scope, **_validate_metric_options(metric, options)}))
+    return scope, jobs
+
+
 def _active_match_trade_ids(start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> set[str]:
     matches = load_journal_matches()
     if matches.empty:
@@ -511,6 +586,26 @@ def _apply_live_journal_labels(df: pd.DataFrame, start: Optional[pd.Timestamp],
     return merged
 
 
+def _filter_performance_range(snapshot: PerformanceSnapshot, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> pd.DataFrame:
+    """Rows inside the CME day range, copied out of the shared snapshot so callers may modify them."""
+    columns = snapshot.columns
+    if not (start or end) or ("TradeDay" not in columns and "ExitedAt" not in columns):
+        return snapshot.copy()
+    if "TradeDay" in columns:
+        column, days = "TradeDay", snapshot.trade_day()
+    else:
+        column = "ExitedAt"
+        days = normalize_series_utc(snapshot.view()["ExitedAt"], "ExitedAt").dt.tz_convert(ANALYSIS_TIMEZONE).dt.normalize()
+    mask = pd.Series(True, index=days.index)
+    if start:
+        mask &= days >= start
+    if end:
+        mask &= days <= end
+    df = snapshot.select(mask)
+    df[column] = days[mask]
+    return df
+
+
 def register_api(server):
     allowed_origin = os.environ.get("FRONTEND_ORIGIN", "http://localhost:8050")
     if allowed_origin == "*":
@@ -592,15 +687,12 @@ def register_api(server):
             error = ""
             if exists:
                 try:
-                    row_count = int(len(pd.read_csv(path)))
-                except Exception as exc:
-                    error = str(exc)
-                try:
-                    d = get_last_date_in_csv(path)
+                    index = ensure_day_index(path)
+                    row_count = int(index.get("rows", 0))
+                    d = last_utc_date(index) if index.get("valid") else get_last_date_in_csv(path)
                     last_date = d.isoformat() if d is not None else ""
                 except Exception as exc:
-                    if not error:
-                        error = str(exc)
+                    error = str(exc)
             rows.append(
                 {
                     "symbol": symbol,
@@ -701,6 +793,8 @@ def register_api(server):
             if symbol is None:
                 return jsonify({"error": "symbol is required"}), 400
             start, end = _parse_range(request.args.get("start"), request.args.get("end"), normalize_date=False)
+            bar_format = parse_bar_format(request.args.get("format"))
+            timeframe = parse_timeframe(request.args.get("timeframe"))
         except ValueError as exc:
             return jsonify({"error": str(exc)}), 400
         csv_path = DATA_SOURCE_DROPDOWN.get(symbol)
@@ -708,27 +802,11 @@ def register_api(server):
             return jsonify({"error": f"data not found for {symbol}"}), 404
 
         try:
-            df = pd.read_csv(csv_path)
-            df["Datetime"] = normalize_series_utc(df["Datetime"], "Datetime")
-            if start:
-                df = df[df["Datetime"] >= start]
-            if end:
-                df = df[df["Datetime"] <= end]
+            df = resampled_bars(csv_path, timeframe, start, end, "UTC")
             df = df.sort_values("Datetime")
-            has_volume = "Volume" in df.columns
-            records = []
-            for _, row in df.iterrows():
-                records.append(
-                    {
-                        "time": iso_utc(row["Datetime"]),
-                        "open": float(row["Open"]),
-                        "high": float(row["High"]),
-                        "low": float(row["Low"]),
-                        "close": float(row["Close"]),
-                        "volume": float(row["Volume"]) if has_volume else None,
-                    }
-                )
-            return jsonify(records)
+            if _wants_binary_bars():
+                return _binary_bars_response(df)
+            return jsonify(serialize_bars(df, "UTC", bar_format))
         except (KeyError, ValueError, pd.errors.ParserError, OSError) as exc:
             return jsonify({"error": f"failed to read candles: {exc}"}), 500
 
@@ -736,54 +814,39 @@ def register_api(server):
     def combined_performance():
         if request.method == "OPTIONS":
             return _cors_headers(jsonify({"ok": True}), allowed_origin)
-        if not os.path.exists(PERFORMANCE_CSV):
+        if not performance_exists(PERFORMANCE_CSV):
             return jsonify({"error": "performance data not found"}), 404
         try:
             start, end = _parse_range(request.args.get("start"), request.args.get("end"), normalize_date=True)
         except ValueError as exc:
             return jsonify({"error": str(exc)}), 400
         try:
-            df = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV))
+            df = _filter_performance_range(performance_snapshot(PERFORMANCE_CSV), start, end)
             df = _apply_live_journal_labels(df, start, end)
-            if start or end:
-                if "TradeDay" in df.columns:
-                    df["TradeDay"] = normalize_series_to_timezone(df["TradeDay"], "TradeDay", ANALYSIS_TIMEZONE).dt.normalize()
-                    if start:
-                        df = df[df["TradeDay"] >= start]
-                    if end:
-                        df = df[df["TradeDay"] <= end]
-                elif "ExitedAt" in df.columns:
-                    df["ExitedAt"] = normalize_series_utc(df["ExitedAt"], "ExitedAt").dt.tz_convert(ANALYSIS_TIMEZONE).dt.normalize()
-                    if start:
-                        df = df[df["ExitedAt"] >= start]
-                    if end:
-                        df = df[df["ExitedAt"] <= end]
             records = df.to_dict(orient="records")
             return jsonify(records)
         except (KeyError, ValueError, pd.errors.ParserError, OSError) as exc:
             return jsonify({"error": f"failed to read performance: {exc}"}), 500
 
+    @api.route("/performance/running", methods=["GET", "OPTIONS"])
+    def running_performance():
+        if request.method == "OPTIONS":
+            return _cors_headers(jsonify({"ok": True}), allowed_origin)
+        if not performance_exists(PERFORMANCE_CSV):
+            return jsonify({"error": "performance data not found"}), 404
+        try:
+            return jsonify(running_summary(load_running_state(PERFORMANCE_CSV)))
+        except (KeyError, ValueError, pd.errors.ParserError, OSError) as exc:
+            return jsonify({"error": f"failed to read performance: {exc}"}), 500
+
     def _load_performance_df(payload: Dict[str, Any]) -> pd.DataFrame:
-        if not os.path.exists(PERFORMANCE_CSV):
+        if not performance_exists(PERFORMANCE_CSV):
             raise FileNotFoundError("performance data not found")
-        df = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV))
         symbol = payload.get("symbol")
         start = payload.get("start_date")
         end = payload.get("end_date")
         include_unmatched = bool(payload.get("include_unmatched", False))
-        if start or end:
-            if "TradeDay" in df.columns:
-                df["TradeDay"] = normalize_series_to_timezone(df["TradeDay"], "TradeDay", ANALYSIS_TIMEZONE).dt.normalize()
-                if start:
-                    df = df[df["TradeDay"] >= start]
-                if end:
-                    df = df[df["TradeDay"] <= end]
-            elif "ExitedAt" in df.columns:
-                df["ExitedAt"] = normalize_series_utc(df["ExitedAt"], "ExitedAt").dt.tz_convert(ANALYSIS_TIMEZONE).dt.normalize()
-                if start:
-                    df = df[df["ExitedAt"] >= start]
-                if end:
-                    df = df[df["ExitedAt"] <= end]
+        df = _filter_performance_range(performance_snapshot(PERFORMANCE_CSV), start, end)
         if symbol:
             if "ContractName" in df.columns:
                 df = df[df["ContractName"].astype(str).str.startswith(symbol)]
@@ -799,6 +862,19 @@ def register_api(server):
                 df = df.iloc[0:0].copy()
         return df
 
+    def _load_rollup_days(payload: Dict[str, Any]):
+        """
+        Per-day rollup rows for day-level metrics, or None when the trades must be read
+        (matched-only requests, or a symbol/date range the rollup cannot answer). PnL
+        sums from the rollup can differ from the trade path in the last bits; see
+        ``daily_rollup``.
+        """
+        if not payload.get("include_unmatched"):
+            return None
+        if not performance_exists(PERFORMANCE_CSV):
+            raise FileNotFoundError("performance data not found")
+        return load_daily_rollup(PERFORMANCE_CSV).days(payload.get("symbol"), payload.get("start_date"), payload.get("end_date"))
+
     def _to_records(df: pd.DataFrame) -> list[Dict[str, Any]]:
         return df.to_dict(orient="records")
 
@@ -861,16 +937,36 @@ def register_api(server):
             return {"data": data, "metadata": out.get("metadata", {})}, 200
         return {"error": f"unknown metric {metric}"}, 400
 
+    def _analysis_data_versions() -> Tuple[Any, ...]:
+        return (
+            performance_snapshot(PERFORMANCE_CSV).version,
+            file_token(journal_live_store.JOURNAL_MATCHES_CSV),
+            file_token(journal_live_store.JOURNAL_LIVE_CSV),
+            file_token(app_config_path()),
+        )
+
+    def _metric_cache_key(metric: str, payload: Dict[str, Any], versions: Tuple[Any, ...]) -> str:
+        fields = ("granularity", "window", "params", "symbol", "start_date", "end_date", "include_unmatched")
+        return result_key("analysis", metric, [payload.get(f) for f in fields], versions)
+
     @api.route("/analysis/<metric>", methods=["POST", "OPTIONS"])
     def analysis(metric: str):
         if request.method == "OPTIONS":
             return _cors_headers(jsonify({"ok": True}), allowed_origin)
         try:
             payload = _validate_metric_payload(metric, _require_json_object())
-            df = _load_performance_df(payload)
+            cache_key = _metric_cache_key(metric, payload, _analysis_data_versions())
+            cached = RESULT_CACHE.get(cache_key)
+            if cached is not MISS:
+                return jsonify(cached), 200
+            df = _load_rollup_days(payload) if metric in ROLLUP_METRICS else None
+            if df is None:
+                df = _load_performance_df(payload)
             if df.empty:
                 return jsonify({"error": "performance dataset is empty", "code": "EMPTY_DATASET"}), 400
             body, status = _metric_handler(metric, df, payload)
+            if status == 200:
+                RESULT_CACHE.put(cache_key, body)
             return jsonify(body), status
         except FileNotFoundError as exc:
             return jsonify({"error": str(exc)}), 404
@@ -879,6 +975,50 @@ def register_api(server):
         except (KeyError, TypeError, pd.errors.ParserError, OSError) as exc:
             return jsonify({"error": f"analysis failed: {exc}"}), 500
 
+    @api.route("/analysis/batch", methods=["POST", "OPTIONS"])
+    def analysis_batch():
+        if request.method == "OPTIONS":
+            return _cors_headers(jsonify({"ok": True}), allowed_origin)
+        try:
+            scope, jobs = _validate_batch_payload(_require_json_object())
+            versions = _analysis_data_versions()
+            cache_keys = {key: _metric_cache_key(metric, payload, versions) for key, metric, payload in jobs}
+            cached = {key: RESULT_CACHE.get(cache_key) for key, cache_key in cache_keys.items()}
+            df = None
+            pending = [metric for key, metric, _ in jobs if cached[key] is MISS]
+            if pending:
+                df = _load_rollup_days(scope) if all(metric in ROLLUP_METRICS for metric in pending) else None
+                if df is None:
+                    df = _load_performance_df(scope)
+                if df.empty:
+                    return jsonify({"error": "performance dataset is empty", "code": "EMPTY_DATASET"}), 400
+                if not isinstance(df, RollupDays):
+                    df = prepare_performance(df)
+        except FileNotFoundError as exc:
+            return jsonify({"error": str(exc)}), 404
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except (KeyError, TypeError, pd.errors.ParserError, OSError) as exc:
+            return jsonify({"error": f"analysis failed: {exc}"}), 500
+
+        results: Dict[str, Any] = {}
+        for key, metric, payload in jobs:
+            if cached[key] is not MISS:
+                results[key] = {"ok": True, "metric": metric, "data": cached[key]}
+                continue
+            try:
+                body, status = _metric_handler(metric, df, payload)
+            except ValueError as exc:
+                body, status = {"error": str(exc)}, 400
+            except (KeyError, TypeError) as exc:
+                body, status = {"error": f"analysis failed: {exc}"}, 500
+            if status == 200:
+                RESULT_CACHE.put(cache_keys[key], body)
+                results[key] = {"ok": True, "metric": metric, "data": body}
+            else:
+                results[key] = {"ok": False, "metric": metric, "status": status, **body}
+        return jsonify({"results": results}), 200
+
     @api.route("/insights", methods=["POST", "OPTIONS"])
     def insights():
         if request.method == "OPTIONS":
@@ -895,11 +1035,24 @@ def register_api(server):
             start, end = _parse_range(payload.get("start_date"), payload.get("end_date"), normalize_date=True)
             payload["start_date"] = start
             payload["end_date"] = end
+            params = payload.get("params") or {}
+            # Debug responses carry fresh per-section timings, so they skip the result cache.
+            debug = _coerce_bool(payload.get("debug"), default=False)
+            cache_key = result_key(
+                "insights",
+                [params, payload.get("symbol"), start, end, payload.get("include_unmatched")],
+                _analysis_data_versions(),
+                file_token(day_plan_store.DAY_PLAN_CSV),
+            )
+            cached = MISS if debug else RESULT_CACHE.get(cache_key)
+            if cached is not MISS:
+                return jsonify(cached), 200
             df = _load_performance_df(payload)
             if df.empty:
                 return jsonify({"error": "performance dataset is empty", "code": "EMPTY_DATASET"}), 400
-            params = payload.get("params") or {}
-            out = compute.insights_bundle(df, params=params)
+            out = compute.insights_bundle(df, params=params, day_plan=day_plan_store.load_day_plan(), debug=debug)
+            if not debug:
+                RESULT_CACHE.put(cache_key, out)
             return jsonify(out), 200
         except FileNotFoundError as exc:
             return jsonify({"error": str(exc)}), 404
@@ -918,7 +1071,7 @@ def register_api(server):
             rows = payload.get("rows")
             if not isinstance(rows, list):
                 raise ValueError("rows must be an array")
-            if not os.path.exists(PERFORMANCE_CSV):
+            if not performance_exists(PERFORMANCE_CSV):
                 raise FileNotFoundError("performance data not found")
 
             def _normalize_setups(v: Any) -> str:
@@ -940,7 +1093,12 @@ def register_api(server):
                 return str(v or "").strip()
 
             with advisory_file_lock(PERFORMANCE_CSV):
-                perf_df = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV))
+                rollup_current = rollup_is_current(PERFORMANCE_CSV)
+                ensure_store(PERFORMANCE_CSV)
+                repository = performance_repository(PERFORMANCE_CSV)
+                snapshot = repository.snapshot()
+                previous_token = repository.token()
+                perf_df = snapshot.copy()
                 for col in ["TradeDay", "ContractName", "IntradayIndex", "Phase", "Context", "Setup", "SignalBar", "TradeIntent"]:
                     if col not in perf_df.columns:
                         perf_df[col] = ""
@@ -957,6 +1115,8 @@ def register_api(server):
                 updated = 0
                 skipped = 0
                 changed_keys: list[str] = []
+                changed_days: set[str] = set()
+                changed_months: set[str] = set()
                 strict_mode = bool(get_app_config().get("tagging", {}).get("strict_mode", True))
                 taxonomy = taxonomy_payload()
                 allowed_phase = {str(x.get("value", "")).strip().lower(): str(x.get("value", "")).strip() for x in taxonomy.get("phase", [])}
@@ -1043,11 +1203,20 @@ def register_api(server):
                             perf_df.loc[mask, "TradeIntent"] = trade_intent
                         updated += 1
                         changed_keys.append(eff_key)
+                        changed_days.update(perf_df.loc[mask, "TradeDay"])
+                        changed_months.update(snapshot.months[mask.to_numpy()])
                     else:
                         skipped += 1
 
                 perf_df = perf_df.drop(columns=["__effective_key"], errors="ignore")
-                atomic_write_csv(perf_df, PERFORMANCE_CSV)
+                # Only the month partitions holding a retagged trade are rewritten.
+                if changed_months:
+                    write_months(
+                        {month: perf_df[snapshot.months == month].reset_index(drop=True) for month in changed_months},
+                        PERFORMANCE_CSV,
+                    )
+                    repository.replace_months(previous_token, changed_months)
+                sync_daily_rollup(perf_df, changed_days if rollup_current else None, PERFORMANCE_CSV)
                 append_audit_event(
                     "journal_tags_updated",
                     {
@@ -1057,6 +1226,7 @@ def register_api(server):
                         "inserted": 0,
                         "skipped": skipped,
                         "effective_keys": changed_keys[:200],
+                        "rewritten_months": sorted(changed_months),
                     },
                     actor="api:/journal/tags",
                 )
@@ -1220,10 +1390,12 @@ def register_api(server):
             archive_raw = raw_archive in {"1", "true", "yes", "y", "on"}
 
             saved_paths: list[str] = []
+            previews: list[tuple[str, str]] = []
             parse_logs: list[dict[str, Any]] = []
             unparseable_rows: list[dict[str, Any]] = []
             parsed_frames: list[pd.DataFrame] = []
             leg_frames: list[pd.DataFrame] = []
+            parse_cache_stats = {"hits": 0, "misses": 0}
 
             Path(TEMP_PERF_DIR).mkdir(parents=True, exist_ok=True)
             stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
@@ -1239,90 +1411,26 @@ def register_api(server):
                 target = Path(TEMP_PERF_DIR) / f"preview_{stamp}_{idx}_{safe_name}"
                 f.save(str(target))
                 saved_paths.append(str(target))
-
-                # Parse diagnostics first from raw rows.
-                try:
-                    raw_df = pd.read_csv(target)
-                    required = {"Date/Time", "Symbol", "Quantity"}
-                    missing = sorted(list(required.difference(set(raw_df.columns))))
-                    if missing:
-                        unparseable_rows.append(
-                            {
-                                "file": safe_name,
-                                "row_number": None,
-                                "reason": f"missing required columns: {', '.join(missing)}",
-                                "row": {},
-                            }
-                        )
-                        parse_logs.append({"file": safe_name, "status": "failed", "parsed_rows": 0, "reason": "missing_columns"})
-                        continue
-
-                    qty = pd.to_numeric(raw_df["Quantity"], errors="coerce").fillna(0.0)
-                    raw_df["__qty"] = qty
-                    by_symbol = raw_df.groupby(raw_df["Symbol"].astype(str), observed=True)["__qty"].sum()
-                    bad_symbols = by_symbol[by_symbol != 0]
-                    if not bad_symbols.empty:
-                        for symbol, net_qty in bad_symbols.items():
-                            bad_rows = raw_df[raw_df["Symbol"].astype(str) == str(symbol)].copy()
-                            for ridx, row in bad_rows.iterrows():
-                                unparseable_rows.append(
-                                    {
-                                        "file": safe_name,
-                                        "row_number": int(ridx) + 2,  # CSV header offset
-                                        "reason": f"symbol net quantity is not zero ({net_qty}); incomplete round-trip set",
-                                        "row": {k: (None if pd.isna(v) else str(v)) for k, v in row.to_dict().items() if not str(k).startswith("__")},
-                                    }
-                                )
-                        parse_logs.append(
-                            {
-                                "file": safe_name,
-                                "status": "failed",
-                                "parsed_rows": 0,
-                                "reason": "net_quantity_not_zero",
-                                "bad_symbols": [{"symbol": str(k), "net_qty": float(v)} for k, v in bad_symbols.items()],
-                            }
-                        )
-                        continue
-                except Exception as exc:
-                    unparseable_rows.append(
-                        {
-                            "file": safe_name,
-                            "row_number": None,
-                            "reason": f"failed to read raw csv: {exc}",
-                            "row": {},
-                        }
-                    )
-                    parse_logs.append({"file": safe_name, "status": "failed", "parsed_rows": 0, "reason": "read_error"})
-                    continue
-
-                # Convert raw fills to round-trip trades (preview only).
-                try:
-                    parsed_df, legs_df = process_csv_with_execution_legs(str(target))
-                    if parsed_df.empty:
-                        unparseable_rows.append(
-                            {
-                                "file": safe_name,
-                                "row_number": None,
-                                "reason": "no round-trip trades parsed from file",
-                                "row": {},
-                            }
-                        )
-                        parse_logs.append({"file": safe_name, "status": "failed", "parsed_rows": 0, "reason": "empty_parse"})
-                        continue
-                    parsed_frames.append(parsed_df)
-                    if not legs_df.empty:
-                        leg_frames.append(legs_df)
-                    parse_logs.append({"file": safe_name, "status": "ok", "parsed_rows": int(len(parsed_df))})
-                except Exception as exc:
-                    unparseable_rows.append(
-                        {
-                            "file": safe_name,
-                            "row_number": None,
-                            "reason": f"parse error: {exc}",
-                            "row": {},
-                        }
-                    )
-                    parse_logs.append({"file": safe_name, "status": "failed", "parsed_rows": 0, "reason": "parse_error"})
+                previews.append((safe_name, str(target)))
+
+            # Parse and FIFO-match the saved files concurrently; report them in upload order.
+            for (safe_name, _), (_, preview, exc) in zip(previews, map_files(preview_upload_file, [t for _, t in previews])):
+                if exc is not None:
+                    preview = {
+                        "status": "failed",
+                        "parsed_rows": 0,
+                        "reason": "parse_error",
+                        "unparseable_rows": [{"row_number": None, "reason": f"parse error: {exc}", "row": {}}],
+                        "cache": "miss",
+                    }
+                parse_cache_stats["hits" if preview["cache"] == "hit" else "misses"] += 1
+                unparseable_rows.extend({"file": safe_name, **row} for row in preview["unparseable_rows"])
+                log_keys = ("status", "parsed_rows", "reason", "bad_symbols", "cache")
+                parse_logs.append({"file": safe_name, **{k: preview[k] for k in log_keys if k in preview}})
+                if preview["status"] == "ok":
+                    parsed_frames.append(preview["round_trips"])
+                    if not preview["legs"].empty:
+                        leg_frames.append(preview["legs"])
 
             # cleanup/archive raw uploads from preview stage
             archived_files: list[str] = []
@@ -1385,6 +1493,7 @@ def register_api(server):
                         "archived_files": archived_files,
                         "removed_files": removed_files,
                         "parse_logs": parse_logs,
+                        "parse_cache": parse_cache_stats,
                         "unparseable_rows": unparseable_rows,
                         "parsed_trades": parsed_trades,
                         "execution_pool": execution_pool,
@@ -1417,9 +1526,9 @@ def register_api(server):
                 raise ValueError(f"parsed_trades missing required columns: {', '.join(missing)}")
 
             pre_rows = 0
-            if os.path.exists(PERFORMANCE_CSV):
+            if performance_exists(PERFORMANCE_CSV):
                 try:
-                    pre_rows = int(len(pd.read_csv(PERFORMANCE_CSV)))
+                    pre_rows = int(len(performance_snapshot(PERFORMANCE_CSV)))
                 except Exception:
                     pre_rows = 0
 
@@ -1517,13 +1626,12 @@ def register_api(server):
             if start_ts is None or end_ts is None:
                 raise ValueError("start and end are required")
 
-            if not os.path.exists(PERFORMANCE_CSV):
+            if not performance_exists(PERFORMANCE_CSV):
                 raise FileNotFoundError("performance data not found")
-            perf = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV))
+            perf = performance_snapshot(PERFORMANCE_CSV).copy()
             if perf.empty:
                 parsed_trades: list[dict[str, Any]] = []
             else:
-                perf = perf.copy()
                 perf["TradeDay"] = perf["TradeDay"].astype(str).str.strip()
                 s = start_ts.date().isoformat()
                 e = end_ts.date().isoformat()
@@ -1607,9 +1715,9 @@ def register_api(server):
             }
 
             pre_rows = 0
-            if os.path.exists(PERFORMANCE_CSV):
+            if performance_exists(PERFORMANCE_CSV):
                 try:
-                    pre_rows = int(len(pd.read_csv(PERFORMANCE_CSV)))
+                    pre_rows = int(len(performance_snapshot(PERFORMANCE_CSV)))
                 except Exception:
                     pre_rows = 0
 
@@ -1698,10 +1806,9 @@ def register_api(server):
                     }
 
             tmap: dict[str, dict[str, Any]] = {}
-            if os.path.exists(PERFORMANCE_CSV):
+            if performance_exists(PERFORMANCE_CSV):
                 try:
-                    perf = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV))
-                    for _, r in perf.iterrows():
+                    for r in performance_snapshot(PERFORMANCE_CSV).records():
                         tid = str(r.get("trade_id", "")).strip()
                         if not tid:
                             continue
@@ -1769,9 +1876,9 @@ def register_api(server):
             trade_id = payload.get("trade_id")
             trade_day = payload.get("trade_day")
             perf_rows: list[dict[str, Any]] = []
-            if os.path.exists(PERFORMANCE_CSV):
+            if performance_exists(PERFORMANCE_CSV):
                 try:
-                    perf_rows = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV)).to_dict(orient="records")
+                    perf_rows = performance_snapshot(PERFORMANCE_CSV).records()
                 except Exception:
                     perf_rows = []
             out = reconfirm_match(
@@ -1801,17 +1908,20 @@ def register_api(server):
             start_raw = request.args.get("start")
             end_raw = request.args.get("end")
             _parse_range(start_raw, end_raw, normalize_date=True)
+            bar_format = parse_bar_format(request.args.get("format"))
+            timeframe = parse_timeframe(request.args.get("timeframe"))
+            study_names = parse_studies(request.args.get("studies"))
         except ValueError as exc:
             return jsonify({"error": str(exc)}), 400
 
         csv_path = DATA_SOURCE_DROPDOWN.get(symbol)
-        if not os.path.exists(PERFORMANCE_CSV):
+        if not performance_exists(PERFORMANCE_CSV):
             return jsonify({"error": "performance data not found"}), 404
         try:
             default_start = "1900-01-01"
             default_end = "2100-01-01"
             perf_df = ensure_trade_id(load_performance(symbol, start_raw or default_start, end_raw or default_end, PERFORMANCE_CSV))
-            fut_df = load_future(start_raw or default_start, end_raw or default_end, csv_path)
+            fut_df = load_future(start_raw or default_start, end_raw or default_end, csv_path, timeframe)
 
             # Stats from plots helper
             stats = get_statistics(perf_df.copy()) if not perf_df.empty else {}
@@ -1830,26 +1940,21 @@ def register_api(server):
                 else [],
             }
 
+            binary = _wants_binary_bars()
             # Normalize future bars to ISO
-            future_records = []
-            for _, row in fut_df.iterrows():
-                future_records.append(
-                    {
-                        "time": _iso_in_timezone(row["Datetime"], ANALYSIS_TIMEZONE),
-                        "open": float(row["Open"]),
-                        "high": float(row["High"]),
-                        "low": float(row["Low"]),
-                        "close": float(row["Close"]),
-                        "volume": float(row["Volume"]) if "Volume" in row else None,
-                    }
-                )
+            future_records = None if binary else serialize_bars(fut_df, ANALYSIS_TIMEZONE, bar_format)
 
             perf_payload = perf_df.copy()
             for col in ["EnteredAt", "ExitedAt"]:
                 if col in perf_payload.columns:
                     perf_payload[col] = perf_payload[col].apply(lambda v: _iso_in_timezone(v, ANALYSIS_TIMEZONE))
             perf_records = perf_payload.replace({np.nan: None}).to_dict("records")
-            return jsonify({"future": future_records, "performance": perf_records, "stats": stats_payload})
+            body: Dict[str, Any] = {"performance": perf_records, "stats": stats_payload}
+            if study_names:
+                body["studies"] = studies_payload(bar_studies(csv_path, fut_df, timeframe), study_names, ANALYSIS_TIMEZONE)
+            if binary:
+                return _binary_bars_response(fut_df, body)
+            return jsonify({"future": future_records, **body})
         except (FileNotFoundError, ValueError) as exc:
             return jsonify({"error": str(exc)}), 400
         except (KeyError, TypeError, pd.errors.ParserError, OSError) as exc:
@@ -1868,7 +1973,7 @@ def register_api(server):
             csv_path = DATA_SOURCE_DROPDOWN.get(symbol)
 
             perf_days: set[str] = set()
-            if os.path.exists(PERFORMANCE_CSV):
+            if performance_exists(PERFORMANCE_CSV):
                 perf_df = ensure_trade_id(load_performance(symbol, "1900-01-01", "2100-01-01", PERFORMANCE_CSV))
                 if not perf_df.empty and "TradeDay" in perf_df.columns:
                     for raw in perf_df["TradeDay"].tolist():
@@ -1881,12 +1986,8 @@ def register_api(server):
             fut_days: set[str] = set()
             fut_df = load_future("1900-01-01", "2100-01-01", csv_path)
             if not fut_df.empty and "Datetime" in fut_df.columns:
-                for raw in fut_df["Datetime"].tolist():
-                    ts = pd.to_datetime(raw, errors="coerce")
-                    if pd.notna(ts):
-                        d = ts.date()
-                        if d.weekday() < 5:
-                            fut_days.add(d.isoformat())
+                fut_ts = fut_df["Datetime"]
+                fut_days = set(fut_ts[fut_ts.dt.weekday < 5].dt.strftime("%Y-%m-%d").unique().tolist())
 
             common = perf_days & fut_days
             if common:
@@ -1932,7 +2033,7 @@ def register_api(server):
                 raise ValueError("trading llm prompt export requires a single-day range (start must equal end)")
 
             csv_path = DATA_SOURCE_DROPDOWN.get(symbol)
-            if not os.path.exists(PERFORMANCE_CSV):
+            if not performance_exists(PERFORMANCE_CSV):
                 return jsonify({"error": "performance data not found"}), 404
 
             default_start = "1900-01-01"
@@ -1945,7 +2046,7 @@ def register_api(server):
                 "symbol": symbol,
                 "start": start_raw,
                 "end": end_raw,
-                "timeframe": str(payload.get("timeframe") or "5m"),
+                "timeframe": parse_timeframe(payload.get("timeframe")),
                 "show_trades": bool(payload.get("show_trades", True)),
                 "show_vwap": bool(payload.get("show_vwap", False)),
                 "show_ema": bool(payload.get("show_ema", False)),
@@ -1956,18 +2057,19 @@ def register_api(server):
                 "plan_date": str(payload.get("plan_date") or ""),
             }
 
-            future_records: list[dict[str, Any]] = []
-            for _, row in fut_df.iterrows():
-                future_records.append(
-                    {
-                        "time": _iso_in_timezone(row["Datetime"], ANALYSIS_TIMEZONE),
-                        "open": float(row["Open"]),
-                        "high": float(row["High"]),
-                        "low": float(row["Low"]),
-                        "close": float(row["Close"]),
-                        "volume": float(row["Volume"]) if "Volume" in row else None,
-                    }
-                )
+            future_records: list[dict[str, Any]] = serialize_bars(fut_df, ANALYSIS_TIMEZONE)
+            chart_study_names = [
+                name
+                for name, flag in (("ema20", "show_ema"), ("vwap", "show_vwap"), ("bar_index", "show_bar_count"))
+                if controls[flag]
+            ]
+            chart_studies = None
+            if chart_study_names:
+                chart_df = fut_df if controls["timeframe"] == "5m" else load_future(start_raw, end_raw, csv_path, controls["timeframe"])
+                chart_studies = {
+                    "timeframe": controls["timeframe"],
+                    **studies_payload(bar_studies(csv_path, chart_df, controls["timeframe"]), chart_study_names, ANALYSIS_TIMEZONE),
+                }
 
             perf_payload = perf_df.copy()
             for col in ["EnteredAt", "ExitedAt"]:
@@ -2062,6 +2164,7 @@ def register_api(server):
                 "controls": controls,
                 "price_action_5m_ohlcv": future_records,
                 "trade_stats": stats_payload,
+                "chart_studies": chart_studies,
                 "day_plan_rows": day_plan_rows,
                 "selected_day_plan": selected_day_plan,
                 "filtered_trade_details_with_attached_journals": trade_details,
@@ -2076,6 +2179,14 @@ def register_api(server):
             }
             safe_context = _json_safe(context)
 
+            chart_studies_section = ""
+            if safe_context["chart_studies"] is not None:
+                chart_studies_section = (
+                    f"### Chart Studies ({safe_context['chart_studies']['timeframe']})\n"
+                    "```json\n"
+                    f"{json.dumps(safe_context['chart_studies'], ensure_ascii=False, indent=2)}\n"
+                    "```\n\n"
+                )
             markdown = (
                 "# Trading Details LLM Prompt\n\n"
                 "## Export Justification\n"
@@ -2098,6 +2209,7 @@ def register_api(server):
                 "```json\n"
                 f"{json.dumps(safe_context['price_action_5m_ohlcv'], ensure_ascii=False, indent=2)}\n"
                 "```\n\n"
+                f"{chart_studies_section}"
                 "### Trade Stats\n"
                 "```json\n"
                 f"{json.dumps(safe_context['trade_stats'], ensure_ascii=False, indent=2)}\n"
@@ -69,6 +69,18 @@ DEFAULT_APP_CONFIG: Dict[str, Any] = {
     "tagging": {
         "strict_mode": True,
     },
+    "cache": {
+        "bar_cache_max_mb": 256,
+        "result_cache_max_entries": 256,
+        "result_cache_max_mb": 32,
+    },
+    "performance_import": {
+        "stream_threshold_mb": 32,
+        "stream_chunk_rows": 50000,
+        "parallel_min_mb": 8,
+        "parse_cache_max_mb": 64,
+        "parse_cache_max_age_days": 30,
+    },
 }
 
 
@@ -16,6 +16,7 @@ from dashboard.config.settings import (
     CONTRACT_SPECS_CSV,
     DAY_PLAN_CSV,
 )
+from dashboard.services.data.performance_store import read_manifest, store_dir
 from dashboard.services.portfolio import CASHFLOW_CSV, TRADE_SUM_CSV
 
 
@@ -39,6 +40,20 @@ def _csv_info(path: Path) -> dict[str, Any]:
     return info
 
 
+def _performance_info(csv_path: Path) -> dict[str, Any]:
+    manifest = read_manifest(csv_path)
+    if manifest is None:
+        return _csv_info(csv_path)
+    return {
+        "path": str(store_dir(csv_path)),
+        "exists": True,
+        "rows": int(manifest.get("rows", 0)),
+        "columns": [str(c) for c in manifest.get("columns", [])],
+        "readable": True,
+        "partitions": len(manifest.get("partitions", {})),
+    }
+
+
 def runtime_manifest() -> dict[str, Any]:
     return {
         "app_config": public_app_config(),
@@ -49,7 +64,7 @@ def runtime_manifest() -> dict[str, Any]:
             "metadata_dir": str(METADATA_DIR),
         },
         "sources": {
-            "performance_sum": _csv_info(Path(PERFORMANCE_CSV)),
+            "performance_sum": _performance_info(Path(PERFORMANCE_CSV)),
             "journal_live": _csv_info(Path(JOURNAL_LIVE_CSV)),
             "journal_adjustments": _csv_info(Path(JOURNAL_ADJUSTMENTS_CSV)),
             "journal_matches": _csv_info(Path(JOURNAL_MATCHES_CSV)),
@@ -2,17 +2,15 @@ from __future__ import annotations
 
 import pandas as pd
 import numpy as np
-from dashboard.services.analysis.schema import validate_performance_df
+from dashboard.services.analysis.prepared import prepare_performance
 from dashboard.config.env import TIMEZONE
 
 
 def behavior_heatmap(performance_df: pd.DataFrame) -> pd.DataFrame:
-    df = validate_performance_df(performance_df)
+    df = prepare_performance(performance_df).frame()
     if "EnteredAt" not in df.columns or "PnL(Net)" not in df.columns:
         raise ValueError("EnteredAt and PnL(Net) required")
-    entered = pd.to_datetime(df["EnteredAt"], utc=True, errors="coerce").dt.tz_convert(TIMEZONE)
-    if entered.isna().any():
-        raise ValueError("Invalid datetime values in 'EnteredAt' column")
+    entered = df["EnteredAt"].dt.tz_convert(TIMEZONE)
     df["HourOfDay"] = entered.dt.hour.astype(int)
     df["DayOfWeek"] = entered.dt.day_name()
     weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -2,13 +2,19 @@ import pandas as pd
 from dashboard.config.settings import DEFAULT_GRANULARITY, DEFAULT_ROLLING_WINDOW
 from dashboard.config.analysis import ANALYSIS_TIMEZONE, rule_compliance_defaults
 import numpy as np
-from dashboard.services.analysis.schema import validate_performance_df
+from dashboard.services.analysis.daily_rollup import RollupDays, ladder_breach
+from dashboard.services.analysis.grouping import group_sums, loss_streaks
+from dashboard.services.analysis.prepared import PreparedPerformance, prepare_performance
+from dashboard.services.analysis.sections import run_sections
 from dashboard.services.utils.day_plan import load_day_plan
 import re
+from functools import lru_cache
 
 # Backward-compatible test/extension hook. Leave as None in normal runtime so
 # rule defaults come from the live config loader on each operation.
 RULE_COMPLIANCE_DEFAULTS = None
+# Thread pool size for the independent insights_bundle sections.
+INSIGHTS_WORKERS = 4
 
 
 def _rule_defaults():
@@ -33,17 +39,52 @@ def _to_cme(series: pd.Series, column_name: str) -> pd.Series:
     return ts.dt.tz_convert(ANALYSIS_TIMEZONE)
 
 
+def _working_copy(performance_df):
+    return performance_df.frame() if isinstance(performance_df, PreparedPerformance) else performance_df.copy()
+
+
+def _cme_local(performance_df, column_name):
+    """Naive CME wall time of EnteredAt/ExitedAt, reusing a PreparedPerformance's keys."""
+    if isinstance(performance_df, PreparedPerformance):
+        return performance_df.exited_local if column_name == 'ExitedAt' else performance_df.entered_local
+    return _to_cme(performance_df[column_name], column_name).dt.tz_localize(None)
+
+
+@lru_cache(maxsize=64)
+def _passive_growth(start_date, end_date, granularity, daily_compounding_rate, initial_funding):
+    """Passive compounding curve per period (last business day's value); shared, do not mutate."""
+    # Use business days for trader-centric passive baseline.
+    date_range = pd.bdate_range(start=start_date, end=end_date)
+    passive_df = pd.DataFrame({'Date': date_range})
+    # Day-0 baseline: passive curve starts at 0 growth on the first date.
+    passive_df['Days'] = (passive_df['Date'] - start_date).dt.days
+    passive_df['PassiveGrowth'] = (1 + daily_compounding_rate) ** passive_df['Days'] * initial_funding - initial_funding
+    passive_df['Period'] = passive_df['Date']
+
+    # Aggregate passive growth by granularity (take last value of period)
+    if granularity == '1D':
+        passive_df['Period'] = passive_df['Period'].dt.floor('D')
+    elif granularity == '1W-MON':
+        passive_df['Period'] = passive_df['Period'].dt.to_period('W-MON').dt.start_time
+    elif granularity == '1M':
+        passive_df['Period'] = passive_df['Period'].dt.to_period('M').dt.start_time
+
+    passive_grouped = passive_df.groupby('Period').agg({'PassiveGrowth': 'last'}).reset_index()
+    passive_grouped['CumulativePassive'] = passive_grouped['PassiveGrowth']  # No cumsum, already cumulative
+    return passive_grouped
+
+
 def pnl_growth(performance_df, granularity=DEFAULT_GRANULARITY, daily_compounding_rate=0.001902, initial_funding=10000):
-    performance_df = validate_performance_df(performance_df)
+    from_cube = isinstance(performance_df, RollupDays)
+    prepared = performance_df if from_cube else prepare_performance(performance_df)
     # Initialize empty result if performance_df is empty
-    if performance_df.empty:
+    if prepared.empty:
         return pd.DataFrame(columns=['Period', 'NetPnL', 'CumulativePnL', 'PassiveGrowth', 'CumulativePassive'])
     
-    performance_df = performance_df.copy()
-    # Normalize to CME and then remove tz for period bucketing.
-    performance_df['ExitedAt'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt').dt.tz_localize(None)
-    
-    performance_df = performance_df.sort_values('ExitedAt')
+    if not from_cube:
+        performance_df = prepared.frame()
+        # CME wall time without tz for period bucketing.
+        performance_df['ExitedAt'] = prepared.exited_local
     
     try:
         # Validate granularity
@@ -51,42 +92,27 @@ def pnl_growth(performance_df, granularity=DEFAULT_GRANULARITY, daily_compoundin
         if granularity not in valid_granularities:
             raise ValueError(f"Unsupported granularity: {granularity}. Must be one of: {valid_granularities}")
         
-        # Assign Period based on granularity
-        if granularity == '1D':
-            performance_df['Period'] = performance_df['ExitedAt'].dt.floor('D')
-        elif granularity == '1W-MON':
-            performance_df['Period'] = performance_df['ExitedAt'].dt.to_period('W-MON').dt.start_time
-        elif granularity == '1M':
-            performance_df['Period'] = performance_df['ExitedAt'].dt.to_period('M').dt.start_time
-        
-        # Group by Period and sum PnL
-        grouped = performance_df.groupby('Period')['PnL(Net)'].sum().reset_index()
-        grouped['Period'] = pd.to_datetime(grouped['Period'])
-        grouped = grouped.rename(columns={'PnL(Net)': 'NetPnL'})
+        if from_cube:
+            # Period totals come straight from the period cube.
+            totals = prepared.period_totals(granularity)
+            grouped = pd.DataFrame({'Period': pd.to_datetime(totals['Period']), 'NetPnL': totals['NetPnL'].astype(float)})
+            start_date = pd.Timestamp(totals['FirstDate'].min())
+            end_date = pd.Timestamp(totals['LastDate'].max())
+        else:
+            # Assign Period based on granularity
+            performance_df['Period'] = prepared.period(granularity)
+            performance_df = performance_df.sort_values('ExitedAt')
+
+            # Group by Period and sum PnL
+            grouped = performance_df.groupby('Period')['PnL(Net)'].sum().reset_index()
+            grouped['Period'] = pd.to_datetime(grouped['Period'])
+            grouped = grouped.rename(columns={'PnL(Net)': 'NetPnL'})
+            start_date = pd.Timestamp(performance_df['ExitedAt'].dt.date.min())
+            end_date = pd.Timestamp(performance_df['ExitedAt'].dt.date.max())
         grouped['CumulativePnL'] = grouped['NetPnL'].cumsum()
         
         # Calculate passive compounding growth
-        start_date = pd.Timestamp(performance_df['ExitedAt'].dt.date.min())
-        end_date = pd.Timestamp(performance_df['ExitedAt'].dt.date.max())
-        
-        # Use business days for trader-centric passive baseline.
-        date_range = pd.bdate_range(start=start_date, end=end_date)
-        passive_df = pd.DataFrame({'Date': date_range})
-        # Day-0 baseline: passive curve starts at 0 growth on the first date.
-        passive_df['Days'] = (passive_df['Date'] - start_date).dt.days
-        passive_df['PassiveGrowth'] = (1 + daily_compounding_rate) ** passive_df['Days'] * initial_funding - initial_funding
-        passive_df['Period'] = passive_df['Date']
-        
-        # Aggregate passive growth by granularity (take last value of period)
-        if granularity == '1D':
-            passive_df['Period'] = passive_df['Period'].dt.floor('D')
-        elif granularity == '1W-MON':
-            passive_df['Period'] = passive_df['Period'].dt.to_period('W-MON').dt.start_time
-        elif granularity == '1M':
-            passive_df['Period'] = passive_df['Period'].dt.to_period('M').dt.start_time
-        
-        passive_grouped = passive_df.groupby('Period').agg({'PassiveGrowth': 'last'}).reset_index()
-        passive_grouped['CumulativePassive'] = passive_grouped['PassiveGrowth']  # No cumsum, already cumulative
+        passive_grouped = _passive_growth(start_date, end_date, granularity, daily_compounding_rate, initial_funding)
         
         # Merge with grouped PnL
         grouped = pd.merge(grouped, passive_grouped[['Period', 'PassiveGrowth', 'CumulativePassive']],
@@ -105,14 +131,15 @@ def pnl_growth(performance_df, granularity=DEFAULT_GRANULARITY, daily_compoundin
     
 
 def drawdown(performance_df, granularity=DEFAULT_GRANULARITY):
-    performance_df = validate_performance_df(performance_df)
-    if performance_df.empty:
+    from_cube = isinstance(performance_df, RollupDays)
+    prepared = performance_df if from_cube else prepare_performance(performance_df)
+    if prepared.empty:
         return pd.DataFrame(columns=['Period', 'Drawdown'])
     
-    performance_df = performance_df.copy()
-    # Normalize to CME and then remove tz for period bucketing.
-    performance_df['ExitedAt'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt').dt.tz_localize(None)
-    performance_df = performance_df.sort_values('ExitedAt')
+    if not from_cube:
+        performance_df = prepared.frame()
+        # CME wall time without tz for period bucketing.
+        performance_df['ExitedAt'] = prepared.exited_local
     
     try:
         # Validate granularity
@@ -120,17 +147,17 @@ def drawdown(performance_df, granularity=DEFAULT_GRANULARITY):
         if granularity not in valid_granularities:
             raise ValueError(f"Unsupported granularity: {granularity}. Must be one of {valid_granularities}")
         
-        # Assign Period based on granularity
-        if granularity == '1D':
-            performance_df['Period'] = performance_df['ExitedAt'].dt.floor('D')
-        elif granularity == '1W-MON':
-            performance_df['Period'] = performance_df['ExitedAt'].dt.to_period('W-MON').dt.start_time
-        elif granularity == '1M':
-            performance_df['Period'] = performance_df['ExitedAt'].dt.to_period('M').dt.start_time
-        
-        # Sum PnL(Net) by period
-        grouped = performance_df.groupby('Period')['PnL(Net)'].sum().reset_index()
-        grouped['Period'] = pd.to_datetime(grouped['Period'])
+        if from_cube:
+            totals = prepared.period_totals(granularity)
+            grouped = pd.DataFrame({'Period': pd.to_datetime(totals['Period']), 'PnL(Net)': totals['NetPnL'].astype(float)})
+        else:
+            # Assign Period based on granularity
+            performance_df['Period'] = prepared.period(granularity)
+            performance_df = performance_df.sort_values('ExitedAt')
+
+            # Sum PnL(Net) by period
+            grouped = performance_df.groupby('Period')['PnL(Net)'].sum().reset_index()
+            grouped['Period'] = pd.to_datetime(grouped['Period'])
         
         # Calculate cumulative PnL and drawdown
         grouped['CumulativePnL'] = grouped['PnL(Net)'].cumsum()
@@ -145,11 +172,11 @@ def drawdown(performance_df, granularity=DEFAULT_GRANULARITY):
     
 
 def pnl_distribution(performance_df):
-    performance_df = validate_performance_df(performance_df)
-    if performance_df.empty:
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
         return pd.DataFrame(columns=['PnL(Net)'])
     
-    performance_df = performance_df.copy()
+    performance_df = prepared.frame()
     try:
         if 'PnL(Net)' not in performance_df:
             raise ValueError("PnL(Net) column missing")
@@ -158,16 +185,16 @@ def pnl_distribution(performance_df):
         raise ValueError(f"Failed to compute PnL distribution: {str(e)}")
     
 def behavioral_patterns(performance_df):
-    performance_df = validate_performance_df(performance_df)
-    if performance_df.empty:
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
         return pd.DataFrame(columns=['Hour', 'DayOfWeek', 'TradeCount', 'AvgPnL'])
     
-    performance_df = performance_df.copy()
+    performance_df = prepared.frame()
     try:
         if 'PnL(Net)' not in performance_df or 'Size' not in performance_df or 'EnteredAt' not in performance_df:
             raise ValueError("Required columns missing: EnteredAt, PnL(Net), Size")
 
-        performance_df['EnteredAt'] = _to_cme(performance_df['EnteredAt'], 'EnteredAt')
+        performance_df['EnteredAt'] = prepared.entered
         performance_df['HourOfDay'] = performance_df['EnteredAt'].dt.hour.astype(int)
         performance_df['DayOfWeek'] = performance_df['EnteredAt'].dt.day_name()
         
@@ -210,56 +237,110 @@ def behavioral_patterns(performance_df):
         raise ValueError(f"Failed to compute behavioral patterns: {str(e)}")
 
 
+def _trailing(values, window):
+    """Trailing ``window`` over trade/day-ordered values; row ``i`` covers ``[i - window + 1, i]``."""
+    return pd.Series(np.asarray(values, dtype=float)).rolling(window)
+
+
+def _window_stack(values, window):
+    """
+    Full trailing windows as rows of a strided view (row ``j`` is ``values[j:j + window]``).
+    Reducing along axis 1 computes each window on its own, so results carry none of
+    the running-sum round-off of ``_trailing`` means and stds.
+    """
+    return np.lib.stride_tricks.sliding_window_view(np.asarray(values, dtype=float), window)
+
+
 def rolling_win_rate(performance_df, window=DEFAULT_ROLLING_WINDOW):
-    performance_df = validate_performance_df(performance_df)
+    prepared = prepare_performance(performance_df)
     window = _coerce_window(window)
-    if performance_df.empty:
+    if prepared.empty:
         return pd.DataFrame(columns=['TradeIndex', 'WinRate'])
     
-    performance_df = performance_df.copy()
+    performance_df = prepared.frame()
     try:
         if 'PnL(Net)' not in performance_df or 'ExitedAt' not in performance_df:
             raise ValueError("Required columns missing: PnL(Net), ExitedAt")
         
         # Derive WinOrLoss from PnL(Net)
-        performance_df['WinOrLoss'] = np.where(performance_df['PnL(Net)'] > 0, 1, -1)
+        performance_df['WinOrLoss'] = np.where(prepared.is_win, 1, -1)
         
         # Sort by ExitedAt to ensure trade order
-        performance_df['ExitedAt'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt')
+        performance_df['ExitedAt'] = prepared.exited
         performance_df = performance_df.sort_values('ExitedAt').reset_index(drop=True)
+        if len(performance_df) < window:
+            return pd.DataFrame(columns=['TradeIndex', 'WinRate'])
         
-        # Calculate rolling win rate per trade
-        win_rate_data = []
-        for i in range(window - 1, len(performance_df)):
-            window_data = performance_df['WinOrLoss'].iloc[i - window + 1:i + 1]
-            total_wins = (window_data == 1).sum()
-            total_trades = len(window_data)
-            win_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
-            win_rate_data.append({
-                'TradeIndex': i,
-                'WinRate': round(win_rate, 2)
-            })
-        
-        return pd.DataFrame(win_rate_data)
+        # Wins per trailing window (exact: sums of 0/1)
+        wins = _trailing(performance_df['WinOrLoss'] == 1, window).sum().to_numpy()[window - 1:]
+        return pd.DataFrame({
+            'TradeIndex': np.arange(window - 1, len(performance_df)),
+            'WinRate': np.round(wins / window * 100, 2),
+        })
     except Exception as e:
         raise ValueError(f"Failed to compute rolling win rate: {str(e)}")
 
+def _day_pnl(prepared):
+    """Net PnL per CME trade day (naive midnight index, ascending), read from rollup days or summed from trades."""
+    if isinstance(prepared, RollupDays):
+        return pd.Series(prepared.rows['NetPnL'].to_numpy(dtype=float), index=prepared.trade_day.to_numpy())
+    daily = pd.Series(prepared.df['PnL(Net)'].to_numpy(dtype=float), index=prepared.trade_day.to_numpy())
+    return daily.groupby(level=0).sum()
+
+
+def _multi_window_sharpe(prepared, windows, risk_free_rate, initial_capital):
+    """
+    Rolling Sharpe for several windows over business-day gap-filled daily returns
+    (weekdays without trades count as flat days), one ``Sharpe_<w>d`` column per
+    window. Rows start once the longest window is full. All windows are column
+    slices of one stack of trailing returns, so each is the per-window formula.
+    """
+    windows = list(dict.fromkeys(_coerce_window(w) for w in windows))
+    if not windows:
+        raise ValueError("window must be a positive integer")
+    columns = ['Date'] + [f'Sharpe_{w}d' for w in windows]
+    if prepared.empty:
+        return pd.DataFrame(columns=columns)
+    try:
+        daily = _day_pnl(prepared)
+        # Weekend CME days with trades are kept next to the business-day calendar.
+        days = pd.bdate_range(daily.index.min(), daily.index.max()).union(daily.index)
+        pnl = daily.reindex(days, fill_value=0.0)
+        prev_equity = (initial_capital + pnl.cumsum()).shift(1).fillna(initial_capital)
+        returns = (pnl / prev_equity.replace(0, np.nan)).replace([np.inf, -np.inf], np.nan).fillna(0).to_numpy(dtype=float)
+        longest = max(windows)
+        if len(returns) < longest:
+            return pd.DataFrame(columns=columns)
+
+        trading_days_per_year = 252
+        # Row j holds returns[j:j + longest], the window ending on day j + longest - 1.
+        stack = _window_stack(returns, longest)
+        out = {'Date': days[longest - 1:]}
+        for w in windows:
+            trailing = stack[:, longest - w:]
+            mean_return = trailing.mean(axis=1)
+            std_dev = trailing.std(axis=1, ddof=1) if w > 1 else np.zeros(len(trailing))
+            annualized_std = np.where(std_dev > 0, std_dev * np.sqrt(trading_days_per_year), 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sharpe = np.where(annualized_std > 0, (mean_return * trading_days_per_year - risk_free_rate) / annualized_std, 0.0)
+            out[f'Sharpe_{w}d'] = np.round(sharpe, 2)
+        return pd.DataFrame(out)[columns]
+    except Exception as e:
+        raise ValueError(f"Failed to compute Sharpe ratio: {str(e)}")
+
+
 def sharpe_ratio(performance_df, window=DEFAULT_ROLLING_WINDOW, risk_free_rate=0.02, initial_capital=10000):
-    performance_df = validate_performance_df(performance_df)
+    prepared = performance_df if isinstance(performance_df, RollupDays) else prepare_performance(performance_df)
+    if isinstance(window, (list, tuple)):
+        return _multi_window_sharpe(prepared, window, risk_free_rate, initial_capital)
     window = _coerce_window(window)
-    if performance_df.empty:
+    if prepared.empty:
         return pd.DataFrame(columns=['Date', 'SharpeRatio'])
     
-    performance_df = performance_df.copy()
     try:
-        if 'PnL(Net)' not in performance_df or 'ExitedAt' not in performance_df:
-            raise ValueError("Required columns missing: PnL(Net), ExitedAt")
-        
         # Aggregate PnL by TradeDay
-        performance_df['TradeDay'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt').dt.tz_localize(None).dt.date
-        daily_pnl = performance_df.groupby('TradeDay')['PnL(Net)'].sum().reset_index()
-        daily_pnl['TradeDay'] = pd.to_datetime(daily_pnl['TradeDay'])
-        daily_pnl = daily_pnl.sort_values('TradeDay')
+        daily = _day_pnl(prepared)
+        daily_pnl = pd.DataFrame({'TradeDay': daily.index, 'PnL(Net)': daily.to_numpy()})
         
         # Calculate capital-based daily returns.
         daily_pnl['CumPnL'] = daily_pnl['PnL(Net)'].cumsum()
@@ -268,155 +349,73 @@ def sharpe_ratio(performance_df, window=DEFAULT_ROLLING_WINDOW, risk_free_rate=0
         daily_pnl['Returns'] = (
             daily_pnl['PnL(Net)'] / daily_pnl['PrevEquity'].replace(0, np.nan)
         ).replace([np.inf, -np.inf], np.nan).fillna(0)
+        if len(daily_pnl) < window:
+            return pd.DataFrame(columns=['Date', 'SharpeRatio'])
         
         # Calculate rolling Sharpe Ratio
         trading_days_per_year = 252
-        dates = daily_pnl['TradeDay'].values
-        sharpe_data = []
+        returns = daily_pnl['Returns'].to_numpy(dtype=float)
+        trailing = _window_stack(returns, window)
+        mean_return = trailing.mean(axis=1)
+        std_dev = trailing.std(axis=1, ddof=1) if window > 1 else np.zeros(len(mean_return))
+        annualized_return = mean_return * trading_days_per_year
+        annualized_std = np.where(std_dev > 0, std_dev * np.sqrt(trading_days_per_year), 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(annualized_std > 0, (annualized_return - risk_free_rate) / annualized_std, 0.0)
         
-        for i in range(window - 1, len(daily_pnl)):
-            start_idx = i - window + 1
-            end_idx = i + 1
-            if start_idx >= 0:
-                window_returns = daily_pnl.iloc[start_idx:end_idx]['Returns'].values
-                mean_return = np.mean(window_returns)
-                std_dev = np.std(window_returns, ddof=1) if len(window_returns) > 1 else 0
-                annualized_return = mean_return * trading_days_per_year
-                annualized_std = std_dev * np.sqrt(trading_days_per_year) if std_dev > 0 else 0
-                sharpe = (annualized_return - risk_free_rate) / annualized_std if annualized_std > 0 else 0
-                sharpe_data.append({
-                    'Date': dates[i],
-                    'SharpeRatio': round(sharpe, 2)
-                })
-        
-        return pd.DataFrame(sharpe_data)
+        return pd.DataFrame({
+            'Date': daily_pnl['TradeDay'].to_numpy()[window - 1:],
+            'SharpeRatio': np.round(sharpe, 2),
+        })
     except Exception as e:
         raise ValueError(f"Failed to compute Sharpe ratio: {str(e)}")
 
-# # 日内交易专属参数
-# TRADING_DAYS = 252
-# DEFAULT_WINDOWS = [7, 14, 30]  # 你最爱的三个窗口
-
-# def sharpe_intraday_es(performance_df, 
-#                        initial_capital=100000, 
-#                        risk_free_rate=0.0483,  # 2025.11.06 SOFR = 4.83%，美股期货标配
-#                        windows=DEFAULT_WINDOWS):
-#     """
-#     专为 ES/NQ 日内交易设计，一行代码出 7/14/30 天滚动Sharpe
-#     performance_df 只需要两列：'PnL(Net)' 和 'ExitedAt'（任意时区时间）
-#     """
-#     if performance_df.empty:
-#         return pd.DataFrame()
-    
-#     df = performance_df.copy()
-#     df['date'] = pd.to_datetime(df['ExitedAt']).dt.date
-    
-#     # 1. 按天聚合（日内多笔自动合并）
-#     daily = df.groupby('date')['PnL(Net)'].sum().reset_index()
-#     daily['date'] = pd.to_datetime(daily['date'])
-#     daily = daily.sort_values('date')
-    
-#     # 2. 资金曲线（日内交易最准做法）
-#     capital = initial_capital
-#     capital_series = [capital]
-#     for pnl in daily['PnL(Net)']:
-#         capital += pnl
-#         capital_series.append(capital)
-    
-#     daily['capital'] = capital_series[1:]           # 当天结束时的资金
-#     daily['prev_capital'] = capital_series[:-1]     # 开盘资金
-#     daily['return'] = daily['PnL(Net)'] / daily['prev_capital']
-    
-#     # 3. 补全无交易日（防止周末跳空，√252 更准）
-#     full_dates = pd.date_range(daily['date'].min(), daily['date'].max(), freq='B')
-#     daily = daily.set_index('date').reindex(full_dates).fillna({'PnL(Net)': 0, 'return': 0})
-#     daily = daily.reset_index().rename(columns={'index': 'date'})
-#     daily['capital'] = initial_capital + daily['PnL(Net)'].cumsum()
-#     daily['prev_capital'] = daily['capital'].shift(1).fillna(initial_capital)
-#     daily['return'] = daily['PnL(Net)'] / daily['prev_capital']
-    
-#     # 4. 多窗口滚动Sharpe（向量化，飞快）
-#     returns = daily['return'].values
-#     dates = daily['date'].values
-#     rf_daily = risk_free_rate / TRADING_DAYS
-    
-#     result_list = []
-#     for window in windows:
-#         sharpe_values = np.full(len(returns), np.nan)
-        
-#         for i in range(window - 1, len(returns)):
-#             window_ret = returns[i - window + 1: i + 1]
-#             excess_mean = np.mean(window_ret) - rf_daily
-#             std_daily = np.std(window_ret, ddof=1)
-            
-#             if std_daily > 1e-8:  # 避免除0
-#                 sharpe = excess_mean * TRADING_DAYS / (std_daily * np.sqrt(TRADING_DAYS))
-#             else:
-#                 sharpe = np.inf if excess_mean > 0 else -np.inf
-                
-#             sharpe_values[i] = round(sharpe, 3)
-        
-#         temp_df = pd.DataFrame({
-#             'Date': dates,
-#             f'Sharpe_{window}d': sharpe_values
-#         })
-#         result_list.append(temp_df)
-    
-#     # 5. 合并所有窗口
-#     result = result_list[0]
-#     for df in result_list[1:]:
-#         result = result.merge(df[['Date', df.columns[1]]], on='Date', how='outer')
-    
-#     return result[result['Date'] >= daily['date'].iloc[window-1]]  # 去掉前window-1行无效值
-
-
 def trade_efficiency(performance_df, window=DEFAULT_ROLLING_WINDOW):
-    performance_df = validate_performance_df(performance_df)
+    prepared = prepare_performance(performance_df)
     window = _coerce_window(window)
-    if performance_df.empty:
+    if prepared.empty:
         return pd.DataFrame(columns=['TradeIndex', 'Efficiency'])
     
-    performance_df = performance_df.copy()
+    performance_df = prepared.frame()
     try:
         if 'PnL(Net)' not in performance_df or 'EnteredAt' not in performance_df or 'ExitedAt' not in performance_df:
             raise ValueError("Required columns missing: PnL(Net), EnteredAt, ExitedAt")
         
         # Calculate trade duration in hours
-        performance_df['EnteredAt'] = _to_cme(performance_df['EnteredAt'], 'EnteredAt')
-        performance_df['ExitedAt'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt')
-        performance_df['Duration'] = (performance_df['ExitedAt'] - performance_df['EnteredAt']).dt.total_seconds() / 3600  # Hours
+        performance_df['ExitedAt'] = prepared.exited
+        performance_df['Duration'] = prepared.duration_hours
         performance_df['Efficiency'] = performance_df['PnL(Net)'] / performance_df['Duration'].replace(0, np.nan)
         
         # Sort by ExitedAt to ensure trade order
         performance_df = performance_df.sort_values('ExitedAt').reset_index(drop=True)
+        if len(performance_df) < window:
+            return pd.DataFrame(columns=['TradeIndex', 'Efficiency'])
         
-        # Calculate rolling average efficiency per trade
-        efficiency_data = []
-        for i in range(window - 1, len(performance_df)):
-            window_data = performance_df['Efficiency'].iloc[i - window + 1:i + 1]
-            rolling_avg = np.mean(window_data)
-            efficiency_data.append({
-                'TradeIndex': i,
-                'Efficiency': round(rolling_avg, 2)
-            })
-        
-        result = pd.DataFrame(efficiency_data)
+        # Rolling average efficiency per trade; zero-duration trades (NaN) are skipped
+        efficiency = performance_df['Efficiency'].to_numpy(dtype=float)
+        valid = ~np.isnan(efficiency)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rolling_avg = _window_stack(np.where(valid, efficiency, 0.0), window).sum(axis=1) / _window_stack(valid, window).sum(axis=1)
+        result = pd.DataFrame({
+            'TradeIndex': np.arange(window - 1, len(performance_df)),
+            'Efficiency': np.round(rolling_avg, 2),
+        })
         result['Efficiency'] = result['Efficiency'].fillna(0)
         return result
     except Exception as e:
         raise ValueError(f"Failed to compute trade efficiency: {str(e)}")
 
 def hourly_performance(performance_df):
-    performance_df = validate_performance_df(performance_df)
-    if performance_df.empty:
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
         return pd.DataFrame(columns=['HourOfDay', 'HourlyPnL', 'TradeCount', 'TotalPnL'])
     
-    performance_df = performance_df.copy()
+    performance_df = prepared.frame()
     try:
         if 'PnL(Net)' not in performance_df or 'EnteredAt' not in performance_df:
             raise ValueError("Required columns missing: PnL(Net), EnteredAt")
 
-        performance_df['EnteredAt'] = _to_cme(performance_df['EnteredAt'], 'EnteredAt')
+        performance_df['EnteredAt'] = prepared.entered
         performance_df['HourOfDay'] = performance_df['EnteredAt'].dt.hour.astype(int)
 
         # Statistical view across selected lifecycle: aggregate by hour-of-day only.
@@ -446,12 +445,15 @@ def performance_envelope(performance_df, granularity=DEFAULT_GRANULARITY):
     if performance_df.empty:
         return theoretical_data, pd.DataFrame(columns=['WinningRate', 'AvgWinToAvgLoss', 'PeriodStart', 'PeriodEnd', 'AboveTheoretical'])
 
-    performance_df = performance_df.copy()
-    # Use CME-local trade day derived from ExitedAt to avoid stale/mismatched source columns.
-    performance_df['TradeDay'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt').dt.tz_localize(None)
-    performance_df['WinOrLoss'] = performance_df['WinOrLoss'].astype(int, errors='ignore')
-    performance_df['Size'] = performance_df['Size'].astype(int, errors='ignore')
-    performance_df = performance_df.sort_values('TradeDay')
+    from_cube = isinstance(performance_df, RollupDays)
+    if not from_cube:
+        exited_local = _cme_local(performance_df, 'ExitedAt')
+        performance_df = _working_copy(performance_df)
+        # Use CME-local trade day derived from ExitedAt to avoid stale/mismatched source columns.
+        performance_df['TradeDay'] = exited_local
+        performance_df['WinOrLoss'] = performance_df['WinOrLoss'].astype(int, errors='ignore')
+        performance_df['Size'] = performance_df['Size'].astype(int, errors='ignore')
+        performance_df = performance_df.sort_values('TradeDay')
 
     try:
         # Validate granularity
@@ -459,49 +461,62 @@ def performance_envelope(performance_df, granularity=DEFAULT_GRANULARITY):
         if granularity not in valid_granularities:
             raise ValueError(f"Unsupported granularity: {granularity}. Must be one of {valid_granularities}")
 
-        # Assign Period based on granularity
-        if granularity == '1D':
-            performance_df['Period'] = performance_df['TradeDay'].dt.date
-        elif granularity == '1W-MON':
-            performance_df['Period'] = performance_df['TradeDay'].dt.to_period('W-MON')
-        elif granularity == '1M':
-            performance_df['Period'] = performance_df['TradeDay'].dt.to_period('M')
-
-        # Group by Period to calculate metrics
-        grouped = performance_df.groupby('Period').agg({
-            'Size': 'sum',
-            'WinOrLoss': lambda x: performance_df.loc[x.index, 'Size'][x == 1].sum(),
-            'TradeDay': ['min', 'max']
-        }).reset_index()
-
-        grouped.columns = ['Period', 'TradeSizeSum', 'WinSizeSum', 'PeriodStart', 'PeriodEnd']
-        grouped['WinningRate'] = grouped['WinSizeSum'] / grouped['TradeSizeSum'] * 100
-
-        # Calculate Avg Win and Avg Loss for each period
-        avg_metrics = []
-        for period in grouped['Period']:
-            period_trades = performance_df[performance_df['Period'] == period]
-            wins = period_trades[period_trades['WinOrLoss'] == 1]
-            losses = period_trades[period_trades['WinOrLoss'] == -1]
-
-            if not wins.empty:
-                total_pnl_wins = wins['PnL(Net)'].sum()
-                total_size_wins = wins['Size'].sum()
-                avg_win = total_pnl_wins / total_size_wins if total_size_wins > 0 else 0
-            else:
-                avg_win = 0
-
-            if not losses.empty:
-                total_pnl_losses = losses['PnL(Net)'].sum()
-                total_size_losses = losses['Size'].sum()
-                avg_loss = abs(total_pnl_losses / total_size_losses) if total_size_losses > 0 else 1e-10
-            else:
-                avg_loss = 1e-10
-
-            avg_win_to_avg_loss = avg_win / avg_loss if avg_loss != 0 else 0
-            avg_metrics.append(avg_win_to_avg_loss)
-
-        grouped['AvgWinToAvgLoss'] = avg_metrics
+        if from_cube:
+            # Per-period WinOrLoss counts and sums come straight from the period cube.
+            totals = performance_df.period_totals(granularity)
+            grouped = pd.DataFrame({
+                'TradeSizeSum': totals['Size'].astype(float),
+                'PeriodStart': totals['FirstDate'],
+                'PeriodEnd': totals['LastDate'],
+            })
+            n_periods = len(grouped)
+            win_count = totals['OutcomeWins'].to_numpy()
+            loss_count = totals['OutcomeLosses'].to_numpy()
+            win_size = totals['OutcomeWinSize'].to_numpy(dtype=float)
+            loss_size = totals['OutcomeLossSize'].to_numpy(dtype=float)
+            win_pnl = totals['OutcomeWinPnL'].to_numpy(dtype=float)
+            loss_pnl = totals['OutcomeLossPnL'].to_numpy(dtype=float)
+        else:
+            # Assign Period based on granularity
+            if granularity == '1D':
+                performance_df['Period'] = performance_df['TradeDay'].dt.date
+            elif granularity == '1W-MON':
+                performance_df['Period'] = performance_df['TradeDay'].dt.to_period('W-MON')
+            elif granularity == '1M':
+                performance_df['Period'] = performance_df['TradeDay'].dt.to_period('M')
+
+            # Group by Period to calculate metrics
+            period_groups = performance_df.groupby('Period')
+            grouped = period_groups.agg(
+                TradeSizeSum=('Size', 'sum'),
+                PeriodStart=('TradeDay', 'min'),
+                PeriodEnd=('TradeDay', 'max'),
+            ).reset_index()
+            codes = period_groups.ngroup().to_numpy()
+            n_periods = len(grouped)
+            is_win = (performance_df['WinOrLoss'] == 1).to_numpy()
+            is_loss = (performance_df['WinOrLoss'] == -1).to_numpy()
+            size = performance_df['Size'].to_numpy(dtype=float)
+            pnl = performance_df['PnL(Net)'].to_numpy(dtype=float)
+
+            # Win/loss PnL and size per period
+            win_codes = np.where(is_win, codes, -1)
+            loss_codes = np.where(is_loss, codes, -1)
+            win_count = np.bincount(codes[is_win], minlength=n_periods)
+            loss_count = np.bincount(codes[is_loss], minlength=n_periods)
+            win_size = group_sums(size, win_codes, n_periods)
+            loss_size = group_sums(size, loss_codes, n_periods)
+            win_pnl = group_sums(pnl, win_codes, n_periods)
+            loss_pnl = group_sums(pnl, loss_codes, n_periods)
+
+        grouped['WinningRate'] = win_size / grouped['TradeSizeSum'].to_numpy() * 100
+
+        # Avg Win and Avg Loss for each period
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_win = np.where((win_count > 0) & (win_size > 0), win_pnl / win_size, 0.0)
+            avg_loss = np.where((loss_count > 0) & (loss_size > 0), np.abs(loss_pnl / loss_size), 1e-10)
+            avg_win_to_avg_loss = np.where(avg_loss != 0, avg_win / avg_loss, 0.0)
+        grouped['AvgWinToAvgLoss'] = avg_win_to_avg_loss
         grouped['AvgWinToAvgLoss'] = grouped['AvgWinToAvgLoss'].clip(upper=20)
 
         # Create actual_data
@@ -527,6 +542,18 @@ def performance_envelope(performance_df, granularity=DEFAULT_GRANULARITY):
     except Exception as e:
         raise ValueError(f"Failed to compute Performance Envelope for {granularity}: {str(e)}")
     
+def _join_reasons(flagged):
+    """``", "``-joined labels of the ``(mask, label)`` pairs that hold per row; ``""`` when none do."""
+    out = None
+    for mask, label in flagged:
+        label_col = np.where(mask, label, "").astype(object)
+        if out is None:
+            out = label_col
+        else:
+            out = np.where(mask & (out != ""), out + ", " + label_col, np.where(mask, label_col, out))
+    return out
+
+
 def overtrading_detection(
     performance_df,
     cap_loss_per_trade=200,
@@ -555,7 +582,8 @@ def overtrading_detection(
     if performance_df.empty:
         return pd.DataFrame(columns=daily_columns), pd.DataFrame(columns=trade_columns)
     
-    performance_df = performance_df.copy()
+    source_df = performance_df
+    performance_df = _working_copy(performance_df)
     try:
         # Validate required columns
         required_cols = ['PnL(Net)', 'ExitedAt', 'EnteredAt', 'Size']
@@ -563,9 +591,12 @@ def overtrading_detection(
             raise ValueError(f"Required columns missing: {', '.join(set(required_cols) - set(performance_df.columns))}")
         
         # Normalize all time references to CME local time.
-        performance_df['ExitedAt'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt').dt.tz_localize(None)
-        performance_df['EnteredAt'] = _to_cme(performance_df['EnteredAt'], 'EnteredAt').dt.tz_localize(None)
-        performance_df['TradeDay'] = performance_df['ExitedAt'].dt.floor("D")
+        performance_df['ExitedAt'] = _cme_local(source_df, 'ExitedAt')
+        performance_df['EnteredAt'] = _cme_local(source_df, 'EnteredAt')
+        if isinstance(source_df, PreparedPerformance):
+            performance_df['TradeDay'] = source_df.trade_day
+        else:
+            performance_df['TradeDay'] = performance_df['ExitedAt'].dt.floor("D")
         start_t = pd.to_datetime(rth_start, format="%H:%M").time()
         end_t = pd.to_datetime(rth_end, format="%H:%M").time()
         performance_df['Session'] = np.where(
@@ -605,10 +636,8 @@ def overtrading_detection(
         trade_df['Duration'] = (trade_df['ExitedAt'] - trade_df['EnteredAt']).dt.total_seconds() / 60
         
         # Identify large loss trades and explicit overtrading breaches.
-        trade_df['IsLoss'] = trade_df['R_multiple'] <= -1
-        trade_df['IsPostLoss'] = False
-        trade_df['IsConsecutiveLossBreach'] = False
-        trade_df['BreachReason'] = ""
+        is_loss = (trade_df['R_multiple'] <= -1).to_numpy()
+        trade_df['IsLoss'] = is_loss
         trade_df['Session'] = np.where(
             trade_df['EnteredAt'].dt.time.between(start_t, end_t),
             'RTH',
@@ -616,31 +645,28 @@ def overtrading_detection(
         )
 
         # Consecutive loss breach: mark trades once streak exceeds max.
-        streak = 0
-        for idx in trade_df.index:
-            if bool(trade_df.loc[idx, 'IsLoss']):
-                streak += 1
-            else:
-                streak = 0
-            if streak > int(max_consecutive_losses):
-                trade_df.loc[idx, 'IsConsecutiveLossBreach'] = True
+        trade_df['IsConsecutiveLossBreach'] = loss_streaks(is_loss) > int(max_consecutive_losses)
 
         # Post-big-loss window: any immediate re-entry within configured trade-count window.
-        for idx in trade_df[trade_df['IsLoss']].index:
-            end_idx = min(idx + cap_trades_after_big_loss + 1, len(trade_df))
-            trade_df.loc[idx + 1:end_idx - 1, 'IsPostLoss'] = True
+        if is_loss.any():
+            positions = np.arange(len(trade_df))
+            last_loss = np.maximum.accumulate(np.where(is_loss, positions, -1))
+            prev_loss = np.concatenate(([-1], last_loss[:-1]))
+            trade_df['IsPostLoss'] = (prev_loss >= 0) & (positions - prev_loss <= cap_trades_after_big_loss)
+        else:
+            trade_df['IsPostLoss'] = False
 
         # Explainable tags/reasons (no hidden heuristic scoring).
-        trade_df['TradeTag'] = 'LightBlue'
-        for idx in trade_df.index:
-            reasons = []
-            if bool(trade_df.loc[idx, 'IsConsecutiveLossBreach']):
-                reasons.append('consecutive_losses')
-            if bool(trade_df.loc[idx, 'IsPostLoss']):
-                reasons.append('reentry_after_big_loss')
-            if reasons:
-                trade_df.loc[idx, 'BreachReason'] = ", ".join(reasons)
-                trade_df.loc[idx, 'TradeTag'] = 'DarkRed' if len(reasons) > 1 else 'LightCoral'
+        streak_breach = trade_df['IsConsecutiveLossBreach'].to_numpy()
+        post_loss = trade_df['IsPostLoss'].to_numpy()
+        trade_df['BreachReason'] = _join_reasons(
+            [(streak_breach, 'consecutive_losses'), (post_loss, 'reentry_after_big_loss')]
+        )
+        trade_df['TradeTag'] = np.select(
+            [streak_breach & post_loss, streak_breach | post_loss],
+            ['DarkRed', 'LightCoral'],
+            default='LightBlue',
+        ).astype(object)
 
         # Select relevant columns
         trade_df = trade_df[
@@ -667,6 +693,45 @@ def overtrading_detection(
     
 
 
+def _kelly_day_sums(source_df, performance_df):
+    """Per CME day of raw trades: TradeDay/TotalTrades frame, win and loss counts, win and loss PnL sums."""
+    if 'PnL(Net)' not in performance_df:
+        raise ValueError("Required columns missing: PnL(Net)")
+    # Use CME-local day from ExitedAt when available; fallback to TradeDay.
+    if isinstance(source_df, PreparedPerformance):
+        performance_df['TradeDay'] = source_df.trade_day
+    elif 'ExitedAt' in performance_df:
+        performance_df['TradeDay'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt').dt.tz_localize(None).dt.floor("D")
+    elif 'TradeDay' in performance_df:
+        performance_df['TradeDay'] = pd.to_datetime(performance_df['TradeDay']).dt.tz_localize(None)
+    else:
+        raise ValueError("Required columns missing: ExitedAt or TradeDay")
+
+    # Ensure PnL(Net) is numeric, converting non-numeric to NaN
+    performance_df['PnL(Net)'] = pd.to_numeric(performance_df['PnL(Net)'], errors='coerce')
+
+    # Check for NaN values in PnL(Net)
+    if performance_df['PnL(Net)'].isna().any():
+        performance_df = performance_df.dropna(subset=['PnL(Net)'])
+
+    # Define a trade as a win if PnL(Net) > 0
+    pnl = performance_df['PnL(Net)'].to_numpy(dtype=float)
+    is_win = pnl > 0
+    is_loss = pnl < 0
+
+    # Aggregate daily metrics (only for days with trades)
+    day_groups = performance_df.groupby('TradeDay')
+    daily_metrics = day_groups.size().rename('TotalTrades').reset_index()
+    codes = day_groups.ngroup().fillna(-1).astype(int).to_numpy()  # -1: no TradeDay
+    n_days = len(daily_metrics)
+    day_codes = np.where(codes >= 0, codes, n_days)
+    win_count = np.bincount(day_codes[is_win], minlength=n_days + 1)[:n_days]
+    loss_count = np.bincount(day_codes[is_loss], minlength=n_days + 1)[:n_days]
+    win_pnl = group_sums(pnl, np.where(is_win, codes, -1), n_days)
+    loss_pnl = group_sums(pnl, np.where(is_loss, codes, -1), n_days)
+    return daily_metrics, win_count, loss_count, win_pnl, loss_pnl
+
+
 def kelly_criterion(performance_df):
     if performance_df.empty:
         return {
@@ -674,47 +739,25 @@ def kelly_criterion(performance_df):
             "metadata": {'Kelly Criterion': {'category': 'Overall'}}
         }
     
-    performance_df = performance_df.copy()
+    source_df = performance_df
     try:
-        if 'PnL(Net)' not in performance_df:
-            raise ValueError("Required columns missing: PnL(Net)")
-        # Use CME-local day from ExitedAt when available; fallback to TradeDay.
-        if 'ExitedAt' in performance_df:
-            performance_df['TradeDay'] = _to_cme(performance_df['ExitedAt'], 'ExitedAt').dt.tz_localize(None).dt.floor("D")
-        elif 'TradeDay' in performance_df:
-            performance_df['TradeDay'] = pd.to_datetime(performance_df['TradeDay']).dt.tz_localize(None)
+        if isinstance(source_df, RollupDays):
+            # Already one row per CME day with its win/loss counts and sums.
+            days = source_df.rows
+            daily_metrics = pd.DataFrame({'TradeDay': source_df.trade_day, 'TotalTrades': days['Trades']})
+            win_count = days['Wins'].to_numpy()
+            loss_count = days['Losses'].to_numpy()
+            win_pnl = days['WinPnL'].to_numpy(dtype=float)
+            loss_pnl = days['LossPnL'].to_numpy(dtype=float)
         else:
-            raise ValueError("Required columns missing: ExitedAt or TradeDay")
-        
-        # Ensure PnL(Net) is numeric, converting non-numeric to NaN
-        performance_df['PnL(Net)'] = pd.to_numeric(performance_df['PnL(Net)'], errors='coerce')
-        
-        # Check for NaN values in PnL(Net)
-        if performance_df['PnL(Net)'].isna().any():
-            performance_df = performance_df.dropna(subset=['PnL(Net)'])
-        
-        # Define a trade as a win if PnL(Net) > 0
-        performance_df['IsWin'] = performance_df['PnL(Net)'] > 0
-        
-        # Aggregate daily metrics (only for days with trades)
-        daily_metrics = performance_df.groupby('TradeDay').agg({
-            'IsWin': 'sum',
-            'PnL(Net)': list
-        }).reset_index()
-        daily_metrics['TotalTrades'] = daily_metrics['PnL(Net)'].apply(len)
-        
-        # Filter out days with no trades
-        daily_metrics = daily_metrics[daily_metrics['TotalTrades'] > 0].copy()
-        
+            daily_metrics, win_count, loss_count, win_pnl, loss_pnl = _kelly_day_sums(source_df, _working_copy(source_df))
+        daily_metrics['IsWin'] = win_count
 
         # Calculate metrics for each day
         daily_metrics['WinRate'] = daily_metrics['IsWin'] / daily_metrics['TotalTrades'].replace(0, np.nan)
-        daily_metrics['AvgWin'] = daily_metrics['PnL(Net)'].apply(
-            lambda x: np.mean([val for val in x if val > 0]) if any(val > 0 for val in x) else np.nan
-        )
-        daily_metrics['AvgLoss'] = -daily_metrics['PnL(Net)'].apply(
-            lambda x: np.mean([val for val in x if val < 0]) if any(val < 0 for val in x) else np.nan
-        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            daily_metrics['AvgWin'] = np.where(win_count > 0, win_pnl / win_count, np.nan)
+            daily_metrics['AvgLoss'] = -np.where(loss_count > 0, loss_pnl / loss_count, np.nan)
         
         # Calculate RewardToRisk only where both AvgWin and AvgLoss are valid
         mask = (daily_metrics['AvgWin'].notna()) & (daily_metrics['AvgLoss'].notna()) & (daily_metrics['AvgLoss'] != 0)
@@ -809,7 +852,7 @@ def _setup_label_quality(df: pd.DataFrame) -> dict[str, object]:
 
 
 def setup_journal(performance_df, min_trades=3):
-    df = validate_performance_df(performance_df).copy()
+    df = prepare_performance(performance_df).frame()
     if df.empty:
         return pd.DataFrame(columns=["Setup", "Trades", "WinRate", "NetPnL", "AvgPnL", "Expectancy"])
     setup_labels = _setup_series(df)
@@ -867,56 +910,62 @@ def rule_compliance_score(
         else max_trades_after_big_loss
     )
 
-    df = validate_performance_df(performance_df).copy()
-    if df.empty:
+    prepared = performance_df if isinstance(performance_df, RollupDays) else prepare_performance(performance_df)
+    if prepared.empty:
         return {
             "summary": {"OverallScore": 100, "RuleBreaches": 0, "DaysAnalyzed": 0},
             "daily": pd.DataFrame(columns=["TradeDay", "Trades", "DailyPnL", "BreachCount", "Score", "Breaches"]),
         }
-    df["ExitedAt"] = _to_cme(df["ExitedAt"], "ExitedAt")
-    df["TradeDay"] = df["ExitedAt"].dt.strftime("%Y-%m-%d")
-    df = df.sort_values("ExitedAt")
-    rows = []
-    for day, g in df.groupby("TradeDay", observed=True):
-        trades = int(len(g))
-        daily_pnl = float(g["PnL(Net)"].sum())
-        pnl_sign = (g["PnL(Net)"] < 0).astype(int).tolist()
-        consec = 0
-        max_consec = 0
-        for v in pnl_sign:
-            consec = consec + 1 if v == 1 else 0
-            max_consec = max(max_consec, consec)
-        breaches = []
-        if trades > int(max_trades_per_day):
-            breaches.append(f"trades>{int(max_trades_per_day)}")
-        if max_consec > int(max_consecutive_losses):
-            breaches.append(f"consecutive_losses>{int(max_consecutive_losses)}")
-        if daily_pnl < -abs(float(max_daily_loss)):
-            breaches.append(f"daily_loss>{abs(float(max_daily_loss)):.0f}")
-
-        post_loss_breach = False
-        pnl_values = g["PnL(Net)"].tolist()
-        for idx, pnl in enumerate(pnl_values):
-            if pnl <= -abs(float(big_loss_threshold)):
-                remaining = len(pnl_values) - idx - 1
-                if remaining > int(max_trades_after_big_loss):
-                    post_loss_breach = True
-                    break
-        if post_loss_breach:
-            breaches.append(f"trades_after_big_loss>{int(max_trades_after_big_loss)}")
-
-        rule_count = 4
-        score = round(max(0, 100 - (len(breaches) / rule_count * 100)), 2)
-        rows.append(
-            {
-                "TradeDay": day,
-                "Trades": trades,
-                "DailyPnL": round(daily_pnl, 2),
-                "BreachCount": len(breaches),
-                "Score": score,
-                "Breaches": ", ".join(breaches) if breaches else "none",
-            }
+    if isinstance(prepared, RollupDays):
+        days = prepared.rows
+        day_keys = prepared.trade_day_str.to_numpy()
+        trades = days["Trades"].to_numpy()
+        daily_pnl = days["NetPnL"].tolist()
+        max_consec = days["MaxConsecLosses"].to_numpy()
+        post_loss_breach = np.array(
+            [ladder_breach(ladder, big_loss_threshold, max_trades_after_big_loss) for ladder in days["LossLadder"]],
+            dtype=bool,
         )
+    else:
+        df = prepared.frame()
+        df["ExitedAt"] = prepared.exited
+        df["TradeDay"] = prepared.trade_day_str
+        df = df.sort_values("ExitedAt", kind="stable")
+        # Exits are sorted, so each CME trade day is one contiguous, ascending run of rows.
+        exit_days = df["TradeDay"].to_numpy()
+        pnl = df["PnL(Net)"].to_numpy(dtype=float)
+        first_row = np.r_[True, exit_days[1:] != exit_days[:-1]]
+        starts = np.flatnonzero(first_row)
+        ends = np.r_[starts[1:], len(df)]
+        day_keys = exit_days[starts]
+        trades = ends - starts
+        daily_pnl = group_sums(pnl, np.cumsum(first_row) - 1, len(starts)).tolist()
+
+        max_consec = np.maximum.reduceat(loss_streaks(pnl < 0, first_row), starts)
+        # A big loss followed by more than max_trades_after_big_loss trades the same day.
+        remaining = np.repeat(ends, trades) - np.arange(len(df)) - 1
+        late_reentry = (pnl <= -abs(float(big_loss_threshold))) & (remaining > int(max_trades_after_big_loss))
+        post_loss_breach = np.logical_or.reduceat(late_reentry, starts)
+
+    checks = [
+        (trades > int(max_trades_per_day), f"trades>{int(max_trades_per_day)}"),
+        (max_consec > int(max_consecutive_losses), f"consecutive_losses>{int(max_consecutive_losses)}"),
+        (np.array(daily_pnl) < -abs(float(max_daily_loss)), f"daily_loss>{abs(float(max_daily_loss)):.0f}"),
+        (post_loss_breach, f"trades_after_big_loss>{int(max_trades_after_big_loss)}"),
+    ]
+    breach_count = np.sum([mask for mask, _ in checks], axis=0)
+    breaches = _join_reasons(checks)
+
+    rule_count = len(checks)
+    score = [round(max(0, 100 - (count / rule_count * 100)), 2) for count in breach_count.tolist()]
+    rows = {
+        "TradeDay": day_keys,
+        "Trades": trades,
+        "DailyPnL": [round(v, 2) for v in daily_pnl],
+        "BreachCount": breach_count,
+        "Score": score,
+        "Breaches": np.where(breaches == "", "none", breaches).astype(object),
+    }
     daily = pd.DataFrame(rows).sort_values("TradeDay")
     summary = {
         "OverallScore": round(float(daily["Score"].mean()), 2) if not daily.empty else 100,
@@ -927,13 +976,13 @@ def rule_compliance_score(
 
 
 def execution_quality_layer(performance_df, min_trades=3):
-    df = validate_performance_df(performance_df).copy()
-    if df.empty:
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
         return {"by_entry_hour": [], "by_hold_bucket": []}
 
-    df = df.copy()
-    df["EnteredAt"] = _to_cme(df["EnteredAt"], "EnteredAt")
-    df["ExitedAt"] = _to_cme(df["ExitedAt"], "ExitedAt")
+    df = prepared.frame()
+    df["EnteredAt"] = prepared.entered
+    df["ExitedAt"] = prepared.exited
     df["DurationMin"] = (df["ExitedAt"] - df["EnteredAt"]).dt.total_seconds().div(60).clip(lower=0)
     df["EntryHour"] = df["EnteredAt"].dt.hour
     df["HoldBucket"] = pd.cut(
@@ -1159,14 +1208,16 @@ def playbook_builder(
 
 
 def monthly_review_report(performance_df, month=None, min_trades=3, applied_config=None, analysis_scope=None):
-    df = validate_performance_df(performance_df).copy()
-    if df.empty:
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
         return {"summary": {}, "focus_points": []}
 
-    df["ExitedAt"] = _to_cme(df["ExitedAt"], "ExitedAt")
-    df["Month"] = df["ExitedAt"].dt.tz_localize(None).dt.to_period("M").astype(str)
+    df = prepared.frame()
+    df["ExitedAt"] = prepared.exited
+    df["Month"] = prepared.month
     target_month = month or df["Month"].max()
-    mdf = df[df["Month"] == target_month].copy()
+    in_month = df["Month"] == target_month
+    mdf = df[in_month].copy()
     if mdf.empty:
         return {"summary": {"Month": target_month, "Trades": 0}, "focus_points": []}
 
@@ -1179,7 +1230,7 @@ def monthly_review_report(performance_df, month=None, min_trades=3, applied_conf
     wins = mdf[mdf["PnL(Net)"] > 0]["PnL(Net)"]
     losses = mdf[mdf["PnL(Net)"] < 0]["PnL(Net)"]
 
-    setup_summary = setup_journal(mdf, min_trades=min_trades)
+    setup_summary = setup_journal(prepared.subset(in_month), min_trades=min_trades)
     top_setup = setup_summary.iloc[0]["Setup"] if not setup_summary.empty else "n/a"
     worst_setup = setup_summary.sort_values("Expectancy").iloc[0]["Setup"] if not setup_summary.empty else "n/a"
 
@@ -1231,16 +1282,16 @@ def monthly_review_report(performance_df, month=None, min_trades=3, applied_conf
     }
 
 
-def day_plan_review(performance_df, month=None):
-    df = validate_performance_df(performance_df).copy()
-    if df.empty:
+def day_plan_review(performance_df, month=None, day_plan=None):
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
         return {"summary": {}, "daily": []}
 
-    df["ExitedAt"] = _to_cme(df["ExitedAt"], "ExitedAt")
-    df["TradeDay"] = df["ExitedAt"].dt.strftime("%Y-%m-%d")
+    df = prepared.frame()
+    df["ExitedAt"] = prepared.exited
+    df["TradeDay"] = prepared.trade_day_str
     if month:
-        period = df["ExitedAt"].dt.tz_localize(None).dt.to_period("M").astype(str)
-        df = df[period == str(month)].copy()
+        df = df[prepared.month == str(month)].copy()
     daily = (
         df.groupby("TradeDay", observed=True)
         .agg(
@@ -1252,7 +1303,7 @@ def day_plan_review(performance_df, month=None):
         .rename(columns={"TradeDay": "Date"})
     )
 
-    plan = load_day_plan()
+    plan = load_day_plan() if day_plan is None else day_plan.copy()
     if month and not plan.empty:
         p = pd.to_datetime(plan["Date"], errors="coerce").dt.to_period("M").astype(str)
         plan = plan[p == str(month)].copy()
@@ -1338,18 +1389,17 @@ def day_plan_review(performance_df, month=None):
 
 
 def _filter_by_month(performance_df, month=None):
-    df = validate_performance_df(performance_df).copy()
-    if df.empty or not month:
-        return df
-    period = _to_cme(df["ExitedAt"], "ExitedAt").dt.tz_localize(None).dt.to_period("M").astype(str)
-    return df[period == str(month)].copy()
+    prepared = prepare_performance(performance_df)
+    if prepared.empty or not month:
+        return prepared
+    return prepared.subset(prepared.month == str(month))
 
 
 def _filter_by_tags(performance_df, params=None):
     params = params or {}
-    df = validate_performance_df(performance_df).copy()
-    if df.empty:
-        return df
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
+        return prepared
 
     def _selection_set(value):
         vals: list[str] = []
@@ -1369,27 +1419,30 @@ def _filter_by_tags(performance_df, params=None):
     signal_sel = _selection_set(params.get("signal_bar"))
     intent_sel = _selection_set(params.get("trade_intent"))
 
-    if phase_sel and "Phase" in df.columns:
-        df = df[df["Phase"].fillna("").astype(str).str.strip().str.lower().isin(phase_sel)].copy()
-        if df.empty:
-            return df
-    if context_sel and "Context" in df.columns:
-        df = df[df["Context"].fillna("").astype(str).str.strip().str.lower().isin(context_sel)].copy()
-        if df.empty:
-            return df
-    if signal_sel and "SignalBar" in df.columns:
-        df = df[df["SignalBar"].fillna("").astype(str).str.strip().str.lower().isin(signal_sel)].copy()
-        if df.empty:
-            return df
-    if setup_sel and "Setup" in df.columns:
-        parts = df["Setup"].fillna("").astype(str).apply(_split_setup_labels)
+    def _labels(column):
+        return prepared.df[column].fillna("").astype(str).str.strip().str.lower()
+
+    if phase_sel and "Phase" in prepared.columns:
+        prepared = prepared.subset(_labels("Phase").isin(phase_sel))
+        if prepared.empty:
+            return prepared
+    if context_sel and "Context" in prepared.columns:
+        prepared = prepared.subset(_labels("Context").isin(context_sel))
+        if prepared.empty:
+            return prepared
+    if signal_sel and "SignalBar" in prepared.columns:
+        prepared = prepared.subset(_labels("SignalBar").isin(signal_sel))
+        if prepared.empty:
+            return prepared
+    if setup_sel and "Setup" in prepared.columns:
+        parts = prepared.df["Setup"].fillna("").astype(str).apply(_split_setup_labels)
         mask = parts.apply(lambda vals: any(str(v).strip().lower() in setup_sel for v in vals))
-        df = df[mask].copy()
-        if df.empty:
-            return df
-    if intent_sel and "TradeIntent" in df.columns:
-        df = df[df["TradeIntent"].fillna("").astype(str).str.strip().str.lower().isin(intent_sel)].copy()
-    return df
+        prepared = prepared.subset(mask)
+        if prepared.empty:
+            return prepared
+    if intent_sel and "TradeIntent" in prepared.columns:
+        prepared = prepared.subset(_labels("TradeIntent").isin(intent_sel))
+    return prepared
 
 
 def _normalized_selection(params, key: str) -> list[str]:
@@ -1439,13 +1492,18 @@ def _build_applied_config(params, defaults):
     }
 
 
-def insights_bundle(performance_df, params=None):
+def insights_bundle(performance_df, params=None, day_plan=None, debug=False):
+    """
+    Insights sections for the scoped trades. Independent sections run concurrently
+    (see ``sections.run_sections``); ``day_plan`` defaults to day_plan.csv. With
+    ``debug`` the per-section timings are returned under ``debug.timings_ms``.
+    """
     params = params or {}
     rules = _rule_defaults()
     applied_config = _build_applied_config(params, rules)
     min_trades = int(applied_config["min_trades"])
 
-    base_df = validate_performance_df(performance_df).copy()
+    base_df = prepare_performance(performance_df)
     month_df = _filter_by_month(base_df, month=applied_config.get("month"))
     scoped_df = _filter_by_tags(month_df, params=applied_config.get("filters"))
     analysis_scope = {
@@ -1454,43 +1512,61 @@ def insights_bundle(performance_df, params=None):
         "after_tag_filters": int(len(scoped_df)),
     }
 
-    setup = setup_journal(scoped_df, min_trades=min_trades)
-    setup_quality = _setup_label_quality(scoped_df)
-    compliance = rule_compliance_score(
-        scoped_df,
-        max_trades_per_day=int(applied_config["rule_thresholds"]["max_trades_per_day"]),
-        max_consecutive_losses=int(applied_config["rule_thresholds"]["max_consecutive_losses"]),
-        max_daily_loss=float(applied_config["rule_thresholds"]["max_daily_loss"]),
-        big_loss_threshold=float(applied_config["rule_thresholds"]["big_loss_threshold"]),
-        max_trades_after_big_loss=int(applied_config["rule_thresholds"]["max_trades_after_big_loss"]),
-    )
-    execution_quality = execution_quality_layer(scoped_df, min_trades=min_trades)
-    playbook = playbook_builder(
-        scoped_df,
-        compliance_daily=compliance["daily"],
-        execution_quality=execution_quality,
-        rules=applied_config["rule_thresholds"],
-        min_trades=max(min_trades, 5),
-    )
-    monthly = monthly_review_report(
-        scoped_df,
-        month=applied_config.get("month"),
-        min_trades=min_trades,
-        applied_config=applied_config,
-        analysis_scope=analysis_scope,
-    )
-    plan_review = day_plan_review(scoped_df, month=applied_config.get("month"))
-    llm_prompt_markdown = _build_llm_prompt_markdown(
-        setup=setup,
-        setup_quality=setup_quality,
-        compliance=compliance,
-        execution_quality=execution_quality,
-        playbook=playbook,
-        monthly=monthly,
-        day_plan=plan_review,
-        applied_config=applied_config,
-        analysis_scope=analysis_scope,
+    thresholds = applied_config["rule_thresholds"]
+    month = applied_config.get("month")
+    if day_plan is None:
+        day_plan = load_day_plan()
+    # Derive the shared CME keys up front so concurrent sections only read them.
+    if not scoped_df.empty:
+        for key in ("exited", "trade_day_str", "month", "is_win", "duration_hours"):
+            getattr(scoped_df, key)
+
+    sections = {
+        "setup": (lambda: setup_journal(scoped_df, min_trades=min_trades), ()),
+        "setup_quality": (lambda: _setup_label_quality(scoped_df.df), ()),
+        "compliance": (
+            lambda: rule_compliance_score(
+                scoped_df,
+                max_trades_per_day=int(thresholds["max_trades_per_day"]),
+                max_consecutive_losses=int(thresholds["max_consecutive_losses"]),
+                max_daily_loss=float(thresholds["max_daily_loss"]),
+                big_loss_threshold=float(thresholds["big_loss_threshold"]),
+                max_trades_after_big_loss=int(thresholds["max_trades_after_big_loss"]),
+            ),
+            (),
+        ),
+        "execution_quality": (lambda: execution_quality_layer(scoped_df, min_trades=min_trades), ()),
+        "playbook": (
+            lambda compliance, execution_quality: playbook_builder(
+                scoped_df,
+                compliance_daily=compliance["daily"],
+                execution_quality=execution_quality,
+                rules=thresholds,
+                min_trades=max(min_trades, 5),
+            ),
+            ("compliance", "execution_quality"),
+        ),
+        "monthly": (
+            lambda: monthly_review_report(
+                scoped_df,
+                month=month,
+                min_trades=min_trades,
+                applied_config=applied_config,
+                analysis_scope=analysis_scope,
+            ),
+            (),
+        ),
+        "day_plan": (lambda: day_plan_review(scoped_df, month=month, day_plan=day_plan), ()),
+    }
+    sections["llm_prompt"] = (
+        lambda **done: _build_llm_prompt_markdown(applied_config=applied_config, analysis_scope=analysis_scope, **done),
+        tuple(sections),
     )
+    results, timings = run_sections(sections, max_workers=INSIGHTS_WORKERS)
+    setup, compliance = results["setup"], results["compliance"]
+    setup_quality, execution_quality = results["setup_quality"], results["execution_quality"]
+    playbook, monthly, plan_review = results["playbook"], results["monthly"], results["day_plan"]
+    llm_prompt_markdown = results["llm_prompt"]
     return {
         "applied_config": applied_config,
         "analysis_scope": analysis_scope,
@@ -1505,6 +1581,7 @@ def insights_bundle(performance_df, params=None):
         "day_plan_review": plan_review,
         "monthly_report": monthly,
         "llm_prompt_markdown": llm_prompt_markdown,
+        **({"debug": {"timings_ms": timings}} if debug else {}),
     }
 
 
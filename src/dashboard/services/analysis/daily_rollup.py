@@ -0,0 +1,392 @@
+"""
+Per-day trade aggregates materialized in the performance directory.
+
+``daily_rollup.csv`` holds one row per CME exit day and (Symbol, Setup) level:
+``("*", "*")`` for the whole account, ``(root, "*")`` per contract root,
+``("*", setup)`` and ``(root, setup)``. Merges refresh only the days they touch
+(the way trade_sum is kept) and record the size/mtime of the performance store
+manifest (``source_path``: the legacy CSV before migration) in
+``daily_rollup.json``; a rollup that no longer matches the store is rebuilt in
+memory from the performance snapshot rather than trusted.
+
+The day-level metrics (pnl_growth, drawdown, sharpe_ratio, kelly_criterion,
+rule_compliance_score) accept ``DailyRollup.days(...)`` in place of trades. The
+period metrics (pnl_growth, drawdown, performance_envelope) read the per-period
+totals in ``period_cube.csv``, kept in step with the rollup (see ``period_cube``).
+
+Routes take this path only for ``include_unmatched`` requests whose symbol and
+date range cover whole rollup days (``days`` returns None otherwise), so the same
+metric can come from either path. Counts and streaks match the trade path
+exactly. PnL sums cannot: day sums are added in exit order and period totals
+add day sums, not trades, so they can differ from the trade path in the last
+bits (within a relative 1e-9, tested in test_daily_rollup). A daily loss limit
+or cent rounding landing exactly on such a sum could then differ too.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.settings import PERFORMANCE_CSV
+from dashboard.services.analysis.grouping import group_sums, loss_streaks
+from dashboard.services.analysis.period_cube import CUBE_COLUMNS, build_period_cube, period_totals, refresh_period_cube
+from dashboard.services.analysis.prepared import GRANULARITIES, PreparedPerformance, prepare_performance
+from dashboard.services.data.performance_repository import performance_snapshot
+from dashboard.services.data.performance_store import source_path
+from dashboard.services.utils.persistence import atomic_write_csv, atomic_write_json
+from dashboard.services.utils.trade_enrichment import symbol_root
+
+ROLLUP_FORMAT_VERSION = 2
+ALL = "*"
+KEY_COLUMNS = ["Date", "Symbol", "Setup"]
+ROLLUP_COLUMNS = KEY_COLUMNS + [
+    "Trades", "Wins", "Losses", "NetPnL", "GrossPnL", "Fees", "Size", "WinPnL", "LossPnL",
+    "OutcomeWins", "OutcomeLosses", "OutcomeWinSize", "OutcomeLossSize", "OutcomeWinPnL", "OutcomeLossPnL",
+    "MaxConsecLosses", "LossLadder", "FirstExit", "LastExit", "FirstTradeDay", "LastTradeDay",
+]
+ROLLUP_METRICS = frozenset({"pnl_growth", "drawdown", "sharpe_ratio", "kelly_criterion", "rule_compliance_score", "performance_envelope"})
+_TEXT_COLUMNS = ["Date", "Symbol", "Setup", "LossLadder", "FirstExit", "LastExit", "FirstTradeDay", "LastTradeDay"]
+_CUBE_TEXT_COLUMNS = ["Granularity", "Symbol", "Period", "FirstDate", "LastDate", "FirstTradeDay", "LastTradeDay"]
+
+_LOADED_LOCK = threading.Lock()
+_LOADED: Dict[str, Tuple[int, "DailyRollup"]] = {}
+
+
+def rollup_path(csv_path: str | Path | None = None) -> Path:
+    return Path(csv_path or PERFORMANCE_CSV).with_name("daily_rollup.csv")
+
+
+def cube_path(csv_path: str | Path | None = None) -> Path:
+    return Path(csv_path or PERFORMANCE_CSV).with_name("period_cube.csv")
+
+
+def _manifest_path(csv_path: str | Path | None = None) -> Path:
+    return Path(csv_path or PERFORMANCE_CSV).with_name("daily_rollup.json")
+
+
+def _source_stat(csv_path: str | Path) -> Dict[str, int]:
+    st = os.stat(source_path(csv_path))
+    return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[column].fillna("").astype(str).str.strip()
+
+
+def _numeric(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[column], errors="coerce").fillna(0.0).astype(float)
+
+
+def _outcomes(df: pd.DataFrame) -> pd.Series:
+    """WinOrLoss (1 / -1 / 0) as performance_envelope counts it; the PnL sign when the column is missing."""
+    if "WinOrLoss" in df.columns:
+        return pd.to_numeric(df["WinOrLoss"], errors="coerce")
+    return np.sign(df["PnL(Net)"].astype(float))
+
+
+def _symbol_keys(df: pd.DataFrame) -> pd.Series:
+    names = df["ContractName"].fillna("").astype(str) if "ContractName" in df.columns else pd.Series("", index=df.index)
+    # Routes select a symbol with ContractName.startswith(symbol); keep the root only
+    # where it is a literal prefix of the name so that filter stays equivalent.
+    roots = {name: symbol_root(name) for name in names.unique()}
+    return names.map({name: root if root and name.startswith(root) else name for name, root in roots.items()})
+
+
+def _entry_days(prepared: PreparedPerformance) -> pd.Series:
+    """Entry trade day (YYYY-MM-DD), the key routes filter start/end dates on."""
+    if "TradeDay" in prepared.df.columns and prepared.df["TradeDay"].notna().all():
+        return prepared.df["TradeDay"]
+    return prepared.entered_local.dt.strftime("%Y-%m-%d")
+
+
+def _loss_ladders(pnl: np.ndarray, codes: np.ndarray, first_row: np.ndarray, after: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Per group, each new running minimum <= 0 as ``"pnl:trades_after"`` joined by ``|``.
+    A day breaks "no more than N trades after a loss <= -T" for any T and N exactly
+    when one of these records does (see ``ladder_breach``).
+    """
+    prev_min = pd.Series(pnl).groupby(codes).cummin().shift(1).to_numpy()
+    record = (pnl <= 0) & (first_row | (pnl < prev_min))
+    if not record.any():
+        return np.full(n_groups, "", dtype=object)
+    tokens = [f"{value!r}:{count}" for value, count in zip(pnl[record].tolist(), after[record].tolist())]
+    record_codes = codes[record]
+    bounds = np.flatnonzero(np.r_[True, record_codes[1:] != record_codes[:-1], True])
+    out = np.full(n_groups, "", dtype=object)
+    for a, b in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        out[record_codes[a]] = "|".join(tokens[a:b])
+    return out
+
+
+def ladder_breach(ladder: str, big_loss_threshold: float, max_trades_after_big_loss: int) -> bool:
+    for token in str(ladder or "").split("|"):
+        if not token:
+            continue
+        value, after = token.rsplit(":", 1)
+        if float(value) <= -abs(float(big_loss_threshold)) and int(after) > int(max_trades_after_big_loss):
+            return True
+    return False
+
+
+def _aggregate(trades: pd.DataFrame, by_symbol: bool, by_setup: bool) -> pd.DataFrame:
+    level = trades.assign(
+        Symbol=trades["Symbol"] if by_symbol else ALL,
+        Setup=trades["Setup"] if by_setup else ALL,
+    )
+    groups = level.groupby(KEY_COLUMNS, sort=True)
+    codes = groups.ngroup().to_numpy()
+    out = groups.size().rename("Trades").reset_index()
+    n_groups = len(out)
+    pnl = level["PnL"].to_numpy(dtype=float)
+    is_win = pnl > 0
+    is_loss = pnl < 0
+    out["Wins"] = np.bincount(codes[is_win], minlength=n_groups)
+    out["Losses"] = np.bincount(codes[is_loss], minlength=n_groups)
+    out["NetPnL"] = group_sums(pnl, codes, n_groups)
+    out["Fees"] = group_sums(level["Fees"], codes, n_groups)
+    out["GrossPnL"] = out["NetPnL"] + out["Fees"]
+    out["Size"] = group_sums(level["Size"], codes, n_groups)
+    out["WinPnL"] = group_sums(pnl, np.where(is_win, codes, -1), n_groups)
+    out["LossPnL"] = group_sums(pnl, np.where(is_loss, codes, -1), n_groups)
+    outcome = level["Outcome"].to_numpy(dtype=float)
+    size = level["Size"].to_numpy(dtype=float)
+    for label, count, value in (("Win", "Wins", 1), ("Loss", "Losses", -1)):
+        hit = outcome == value
+        out[f"Outcome{count}"] = np.bincount(codes[hit], minlength=n_groups)
+        out[f"Outcome{label}Size"] = group_sums(size, np.where(hit, codes, -1), n_groups)
+        out[f"Outcome{label}PnL"] = group_sums(pnl, np.where(hit, codes, -1), n_groups)
+
+    # Each group's rows, contiguous and still in exit order.
+    order = np.argsort(codes, kind="stable")
+    grouped_codes = codes[order]
+    first_row = np.r_[True, grouped_codes[1:] != grouped_codes[:-1]]
+    starts = np.flatnonzero(first_row)
+    ends = np.r_[starts[1:], len(order)]
+    after = np.repeat(ends, ends - starts) - np.arange(len(order)) - 1
+    out["MaxConsecLosses"] = np.maximum.reduceat(loss_streaks(is_loss[order], first_row), starts)
+    out["LossLadder"] = _loss_ladders(pnl[order], grouped_codes, first_row, after, n_groups)
+    exited = level["ExitedAt"].to_numpy()[order]
+    out["FirstExit"] = np.char.add(np.datetime_as_string(exited[starts], unit="s"), "Z")
+    out["LastExit"] = np.char.add(np.datetime_as_string(exited[ends - 1], unit="s"), "Z")
+    entry_day = level["EntryDay"].to_numpy(dtype="datetime64[D]")[order]
+    out["FirstTradeDay"] = np.datetime_as_string(np.minimum.reduceat(entry_day, starts))
+    out["LastTradeDay"] = np.datetime_as_string(np.maximum.reduceat(entry_day, starts))
+    return out
+
+
+def build_daily_rollup(performance_df) -> pd.DataFrame:
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    df = prepared.df
+    trades = pd.DataFrame(
+        {
+            "Date": prepared.trade_day_str,
+            "Symbol": _symbol_keys(df),
+            "Setup": _text(df, "Setup"),
+            "EntryDay": _entry_days(prepared),
+            "ExitedAt": df["ExitedAt"].dt.tz_convert(None),
+            "PnL": df["PnL(Net)"],
+            "Fees": _numeric(df, "Fees"),
+            "Size": _numeric(df, "Size"),
+            "Outcome": _outcomes(df),
+        }
+    ).sort_values("ExitedAt", kind="stable")
+    levels = [_aggregate(trades, by_symbol, by_setup) for by_symbol in (False, True) for by_setup in (False, True)]
+    out = pd.concat(levels, ignore_index=True)
+    return out.sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)[ROLLUP_COLUMNS]
+
+
+def read_daily_rollup(csv_path: str | Path | None = None) -> Optional[pd.DataFrame]:
+    try:
+        df = pd.read_csv(rollup_path(csv_path), dtype={col: str for col in _TEXT_COLUMNS}, keep_default_na=False)
+    except (OSError, pd.errors.EmptyDataError, pd.errors.ParserError):
+        return None
+    if list(df.columns) != ROLLUP_COLUMNS:
+        return None
+    return df
+
+
+def read_period_cube(csv_path: str | Path | None = None) -> Optional[pd.DataFrame]:
+    try:
+        df = pd.read_csv(cube_path(csv_path), dtype={col: str for col in _CUBE_TEXT_COLUMNS}, keep_default_na=False)
+    except (OSError, pd.errors.EmptyDataError, pd.errors.ParserError):
+        return None
+    if list(df.columns) != CUBE_COLUMNS:
+        return None
+    return df
+
+
+def rollup_is_current(csv_path: str | Path | None = None) -> bool:
+    """True when the persisted rollup was written for the current Performance_sum data."""
+    path = csv_path or PERFORMANCE_CSV
+    try:
+        with open(_manifest_path(path), "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        source = _source_stat(path)
+    except (OSError, ValueError):
+        return False
+    return (
+        isinstance(manifest, dict)
+        and manifest.get("format") == ROLLUP_FORMAT_VERSION
+        and manifest.get("source") == source
+        and rollup_path(path).exists()
+        and cube_path(path).exists()
+    )
+
+
+def _refresh_days(existing: pd.DataFrame, performance_df, affected_days: Iterable[str]) -> Tuple[pd.DataFrame, Set[str]]:
+    """Rollup with the exit days touched by ``affected_days`` rebuilt, and those exit days."""
+    prepared = prepare_performance(performance_df)
+    affected = sorted({str(day) for day in affected_days})
+    if not affected:
+        return existing, set()
+    # Exit days holding a trade entered on an affected day, now or before this merge.
+    touched = set(prepared.trade_day_str[_entry_days(prepared).isin(affected)])
+    for day in affected:
+        spans = (existing["FirstTradeDay"] <= day) & (existing["LastTradeDay"] >= day)
+        touched.update(existing.loc[spans, "Date"])
+    fresh = build_daily_rollup(prepared.subset(prepared.trade_day_str.isin(touched)))
+    kept = existing[~existing["Date"].isin(touched)]
+    out = pd.concat([kept, fresh], ignore_index=True) if not kept.empty else fresh
+    return out.sort_values(KEY_COLUMNS, kind="stable").reset_index(drop=True)[ROLLUP_COLUMNS], touched
+
+
+def sync_daily_rollup(performance_df, affected_days: Optional[Iterable[str]] = None, csv_path: str | Path | None = None) -> pd.DataFrame:
+    """
+    Persist the rollup for ``performance_df`` right after it was written to ``csv_path``
+    (callers hold the performance lock). ``affected_days`` are entry TradeDays; only the
+    exit days holding their trades, and the periods containing them, are recomputed.
+    Pass None to rebuild everything, e.g. when the previous rollup was not current.
+    """
+    path = csv_path or PERFORMANCE_CSV
+    existing = read_daily_rollup(path) if affected_days is not None else None
+    cube = read_period_cube(path) if existing is not None else None
+    if existing is None or cube is None:
+        rollup = build_daily_rollup(performance_df)
+        cube = build_period_cube(rollup)
+    else:
+        rollup, touched = _refresh_days(existing, performance_df, affected_days)
+        cube = refresh_period_cube(cube, rollup, touched)
+    atomic_write_csv(rollup, rollup_path(path))
+    atomic_write_csv(cube, cube_path(path))
+    atomic_write_json({"format": ROLLUP_FORMAT_VERSION, "source": _source_stat(path)}, _manifest_path(path))
+    return rollup
+
+
+def load_daily_rollup(csv_path: str | Path | None = None) -> "DailyRollup":
+    """Rollup for the current performance snapshot (cached per snapshot version)."""
+    path = str(csv_path or PERFORMANCE_CSV)
+    snapshot = performance_snapshot(path)
+    with _LOADED_LOCK:
+        cached = _LOADED.get(path)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1]
+    frame = cube = None
+    if rollup_is_current(path):
+        frame, cube = read_daily_rollup(path), read_period_cube(path)
+    if frame is None:
+        frame, cube = build_daily_rollup(snapshot.prepared()), None
+    rollup = DailyRollup(frame, cube)
+    with _LOADED_LOCK:
+        _LOADED[path] = (snapshot.version, rollup)
+    return rollup
+
+
+class DailyRollup:
+    def __init__(self, frame: pd.DataFrame, cube: Optional[pd.DataFrame] = None):
+        self.frame = frame
+        self._cube = cube
+
+    @property
+    def cube(self) -> pd.DataFrame:
+        """Period cube for ``frame``; built on first use when it was not read from disk."""
+        if self._cube is None:
+            self._cube = build_period_cube(self.frame)
+        return self._cube
+
+    def days(self, symbol: Optional[str] = None, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> Optional["RollupDays"]:
+        """
+        Day rows covering exactly the trades a route would select (ContractName prefix,
+        entry TradeDay range), or None when the rollup cannot answer and trades must be read.
+        """
+        rows = self.frame[self.frame["Setup"] == ALL]
+        if symbol:
+            roots = rows.loc[rows["Symbol"] != ALL, "Symbol"].unique().tolist()
+            matched = [root for root in roots if root.startswith(symbol)]
+            # A shorter root could still have contracts starting with the symbol; several
+            # matching roots cannot have their streaks merged.
+            if len(matched) > 1 or any(symbol.startswith(root) and root != symbol for root in roots):
+                return None
+            rows = rows[rows["Symbol"].isin(matched)]
+            scope = matched[0] if matched else None
+        else:
+            rows = rows[rows["Symbol"] == ALL]
+            scope = ALL
+        whole_scope = True
+        if start is not None or end is not None:
+            first_day = start.strftime("%Y-%m-%d") if start is not None else ""
+            last_day = end.strftime("%Y-%m-%d") if end is not None else "9999-12-31"
+            inside = (rows["FirstTradeDay"] >= first_day) & (rows["LastTradeDay"] <= last_day)
+            outside = (rows["LastTradeDay"] < first_day) | (rows["FirstTradeDay"] > last_day)
+            if not (inside | outside).all():
+                return None
+            whole_scope = bool(inside.all())
+            rows = rows[inside]
+        # The cube's periods hold every day of the scope; a date range that drops days
+        # has its periods summed from the remaining rows instead.
+        cube = self.cube[self.cube["Symbol"] == scope] if whole_scope and scope is not None else None
+        return RollupDays(rows, cube)
+
+
+class RollupDays:
+    """
+    Rollup day rows (one per CME exit day, ``Date`` ascending) for the trades a route
+    selected. Metrics in ``ROLLUP_METRICS`` check for it and read the day columns and
+    period totals; it is not a trade frame and cannot be prepared as one.
+    """
+
+    def __init__(self, rows: pd.DataFrame, cube: Optional[pd.DataFrame] = None):
+        self.rows = rows.reset_index(drop=True)
+        self._cube = cube
+        self._totals: Dict[str, pd.DataFrame] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def empty(self) -> bool:
+        return self.rows.empty
+
+    @property
+    def trade_day_str(self) -> pd.Series:
+        return self.rows["Date"]
+
+    @cached_property
+    def trade_day(self) -> pd.Series:
+        """CME exit day (midnight, naive), as ``PreparedPerformance.trade_day``."""
+        return pd.to_datetime(self.rows["Date"], format="%Y-%m-%d")
+
+    def period_totals(self, granularity: str) -> pd.DataFrame:
+        """Cube rows (see ``period_cube.CUBE_COLUMNS``) of these days for ``granularity``, in period order."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}. Must be one of {list(GRANULARITIES)}")
+        if granularity not in self._totals:
+            if self._cube is not None:
+                totals = self._cube[self._cube["Granularity"] == granularity]
+            else:
+                totals = period_totals(self.rows, granularity)
+            self._totals[granularity] = totals.reset_index(drop=True)
+        return self._totals[granularity]
@@ -0,0 +1,33 @@
+"""
+Numeric kernels shared by the per-day/per-period analysis aggregates.
+
+They work on plain arrays in trade (exit) order so that the metrics in
+``compute`` and the persisted daily rollup reduce the same rows the same way.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def group_sums(values, codes, n_groups):
+    """
+    Per-group sum of ``values`` (NaN skipped) for ``codes`` in ``[0, n_groups)``; rows coded -1
+    are left out. Rounding can differ from per-group ``Series.sum`` in the last bits.
+    """
+    values = np.asarray(values, dtype=float)
+    codes = np.asarray(codes)
+    keep = (codes >= 0) & ~np.isnan(values)
+    return np.bincount(codes[keep], weights=values[keep], minlength=n_groups)
+
+
+def loss_streaks(is_loss, segment_start=None):
+    """Length of the losing run ending at each trade (0 on non-losses); runs restart at ``segment_start``."""
+    is_loss = np.asarray(is_loss, dtype=bool)
+    positions = np.arange(len(is_loss))
+    # Position just before the current run: the last non-loss, or the row before a segment start.
+    base = np.where(is_loss, -1, positions)
+    if segment_start is not None:
+        base = np.maximum(base, np.where(segment_start, positions - 1, -1))
+    base = np.maximum.accumulate(base)
+    return np.where(is_loss, positions - base, 0)
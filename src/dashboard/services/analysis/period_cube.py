@@ -0,0 +1,75 @@
+"""
+Per-period totals for every analysis granularity, derived from the daily rollup.
+
+The cube holds one row per (Granularity, Symbol, Period) with the day rollup's
+additive columns summed over the period's CME exit days. It is persisted next
+to the rollup as ``period_cube.csv`` and refreshed for the periods containing
+the days a merge touched, so pnl_growth, drawdown and performance_envelope read
+a slice instead of rebucketing trades, and switching granularity is a lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import pandas as pd
+
+from dashboard.services.analysis.prepared import GRANULARITIES
+
+SUM_COLUMNS = [
+    "Trades", "NetPnL", "Size", "Wins", "WinPnL",
+    "OutcomeWins", "OutcomeLosses", "OutcomeWinSize", "OutcomeLossSize", "OutcomeWinPnL", "OutcomeLossPnL",
+]
+CUBE_COLUMNS = ["Granularity", "Symbol", "Period"] + SUM_COLUMNS + ["FirstDate", "LastDate", "FirstTradeDay", "LastTradeDay"]
+
+
+def period_start(dates: pd.Series, granularity: str) -> pd.Series:
+    """Start (YYYY-MM-DD) of the 1D / 1W-MON / 1M period holding each YYYY-MM-DD day."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}. Must be one of {list(GRANULARITIES)}")
+    if granularity == "1D":
+        return dates
+    days = pd.to_datetime(dates, format="%Y-%m-%d")
+    freq = "W-MON" if granularity == "1W-MON" else "M"
+    return days.dt.to_period(freq).dt.start_time.dt.strftime("%Y-%m-%d")
+
+
+def period_totals(day_rows: pd.DataFrame, granularity: str) -> pd.DataFrame:
+    """Sum rollup day rows (Date, Symbol and the SUM_COLUMNS) into periods, in Symbol/Period order."""
+    if day_rows.empty:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    rows = day_rows.sort_values("Date", kind="stable").assign(Period=lambda d: period_start(d["Date"], granularity))
+    groups = rows.groupby(["Symbol", "Period"], sort=True)
+    out = groups[SUM_COLUMNS].sum()
+    out["FirstDate"] = groups["Date"].min()
+    out["LastDate"] = groups["Date"].max()
+    out["FirstTradeDay"] = groups["FirstTradeDay"].min()
+    out["LastTradeDay"] = groups["LastTradeDay"].max()
+    return out.reset_index().assign(Granularity=granularity)[CUBE_COLUMNS]
+
+
+def _symbol_days(rollup: pd.DataFrame) -> pd.DataFrame:
+    return rollup[rollup["Setup"] == "*"]
+
+
+def build_period_cube(rollup: pd.DataFrame) -> pd.DataFrame:
+    days = _symbol_days(rollup)
+    parts = [period_totals(days, granularity) for granularity in GRANULARITIES]
+    return pd.concat(parts, ignore_index=True)[CUBE_COLUMNS]
+
+
+def refresh_period_cube(cube: pd.DataFrame, rollup: pd.DataFrame, touched_days: Iterable[str]) -> pd.DataFrame:
+    """Recompute the periods holding ``touched_days`` from ``rollup`` (already refreshed)."""
+    touched = pd.Series(sorted({str(day) for day in touched_days}), dtype=object)
+    if touched.empty:
+        return cube
+    days = _symbol_days(rollup)
+    parts = []
+    for granularity in GRANULARITIES:
+        periods = set(period_start(touched, granularity))
+        in_cube = cube["Granularity"] == granularity
+        parts.append(cube[in_cube & ~cube["Period"].isin(periods)])
+        parts.append(period_totals(days[period_start(days["Date"], granularity).isin(periods)], granularity))
+    out = pd.concat([part for part in parts if not part.empty], ignore_index=True)
+    order = out["Granularity"].map({g: i for i, g in enumerate(GRANULARITIES)})
+    return out.assign(_order=order).sort_values(["_order", "Symbol", "Period"], kind="stable").drop(columns="_order").reset_index(drop=True)
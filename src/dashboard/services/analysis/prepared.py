@@ -0,0 +1,121 @@
+"""
+Validated performance frame plus the CME-local keys the analysis metrics share.
+
+Every metric in ``compute`` used to validate its input, convert Entered/Exited
+to the analysis timezone and derive trade-day/period keys on its own. A page
+computes a dozen of them over the same trades, so ``PreparedPerformance`` does
+that work once: derived series are computed on first use and reused by every
+metric (and every ``subset``) that receives the object. Metric functions still
+accept raw DataFrames and prepare them on the fly.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.analysis import ANALYSIS_TIMEZONE
+from dashboard.services.analysis.schema import validate_performance_df
+
+GRANULARITIES = ("1D", "1W-MON", "1M")
+
+
+class PreparedPerformance:
+    def __init__(self, performance_df: pd.DataFrame):
+        self.df = validate_performance_df(performance_df)
+        self._periods: Dict[str, pd.Series] = {}
+
+    @classmethod
+    def from_validated(cls, df: pd.DataFrame) -> "PreparedPerformance":
+        """Wrap a frame that already went through ``validate_performance_df`` (e.g. spliced from two that did)."""
+        out = cls.__new__(cls)
+        out.df = df
+        out._periods = {}
+        return out
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.df.columns
+
+    def __contains__(self, column: object) -> bool:
+        return column in self.df
+
+    def frame(self) -> pd.DataFrame:
+        """Shallow copy of the validated frame; add or replace columns freely, never write into them."""
+        return self.df.copy(deep=False)
+
+    @cached_property
+    def entered(self) -> pd.Series:
+        return self.df["EnteredAt"].dt.tz_convert(ANALYSIS_TIMEZONE)
+
+    @cached_property
+    def exited(self) -> pd.Series:
+        return self.df["ExitedAt"].dt.tz_convert(ANALYSIS_TIMEZONE)
+
+    @cached_property
+    def entered_local(self) -> pd.Series:
+        return self.entered.dt.tz_localize(None)
+
+    @cached_property
+    def exited_local(self) -> pd.Series:
+        return self.exited.dt.tz_localize(None)
+
+    @cached_property
+    def trade_day(self) -> pd.Series:
+        """CME trade day (midnight, naive) of the exit."""
+        return self.exited_local.dt.floor("D")
+
+    @cached_property
+    def trade_day_str(self) -> pd.Series:
+        return self.trade_day.dt.strftime("%Y-%m-%d")
+
+    @cached_property
+    def month(self) -> pd.Series:
+        return self.exited_local.dt.to_period("M").astype(str)
+
+    @cached_property
+    def is_win(self) -> pd.Series:
+        return self.df["PnL(Net)"] > 0
+
+    @cached_property
+    def duration_hours(self) -> pd.Series:
+        return (self.exited - self.entered).dt.total_seconds() / 3600
+
+    def period(self, granularity: str) -> pd.Series:
+        """Start of the 1D / 1W-MON / 1M period containing each exit (naive CME time)."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}. Must be one of {list(GRANULARITIES)}")
+        if granularity not in self._periods:
+            if granularity == "1D":
+                self._periods[granularity] = self.trade_day
+            else:
+                freq = "W-MON" if granularity == "1W-MON" else "M"
+                self._periods[granularity] = self.exited_local.dt.to_period(freq).dt.start_time
+        return self._periods[granularity]
+
+    def subset(self, mask) -> "PreparedPerformance":
+        """Rows where ``mask`` holds, keeping every key derived so far."""
+        mask = np.asarray(mask, dtype=bool)
+        out = PreparedPerformance.__new__(PreparedPerformance)
+        out.df = self.df[mask]
+        out._periods = {name: keys[mask] for name, keys in self._periods.items()}
+        for name, value in vars(self).items():
+            if isinstance(value, pd.Series):
+                vars(out)[name] = value[mask]
+        return out
+
+
+def prepare_performance(performance_df) -> PreparedPerformance:
+    if isinstance(performance_df, PreparedPerformance):
+        return performance_df
+    return PreparedPerformance(performance_df)
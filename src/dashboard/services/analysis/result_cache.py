@@ -0,0 +1,109 @@
+"""
+Bounded cache of analysis/insights response bodies.
+
+A result is a pure function of the request (metric, options, symbol, range,
+include_unmatched) and of the data it was computed from. Callers key entries on
+both: the request fields plus the performance repository version and
+(mtime_ns, size, inode) tokens of the journal/match CSVs and app config (which
+holds the rule thresholds). Any write to those files changes the key, so stale
+results are never served; they simply age out of the LRU. The cache is bounded
+by entry count and by the approximate JSON size of the stored bodies
+(``cache.result_cache_max_entries`` / ``cache.result_cache_max_mb``).
+Cached bodies are shared: callers must not mutate them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from dashboard.config.app_config import get_app_config
+
+MISS = object()
+
+
+def file_token(path: str | Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (int(st.st_mtime_ns), int(st.st_size), int(st.st_ino))
+
+
+def result_key(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return hit[0]
+
+    def put(self, key: str, value: Any) -> None:
+        size = len(json.dumps(value, default=str))
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes or self.max_entries < 1:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _build_cache() -> ResultCache:
+    cfg = get_app_config().get("cache", {})
+    try:
+        entries = int(cfg.get("result_cache_max_entries", 256))
+        mb = float(cfg.get("result_cache_max_mb", 32))
+    except (TypeError, ValueError):
+        entries, mb = 256, 32.0
+    return ResultCache(max(0, entries), max(0, int(mb * 1024 * 1024)))
+
+
+RESULT_CACHE = _build_cache()
+
+
+def clear_result_cache() -> None:
+    RESULT_CACHE.clear()
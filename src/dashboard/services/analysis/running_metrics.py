@@ -0,0 +1,199 @@
+"""
+Account-level running metrics advanced trade by trade in exit order.
+
+``running_metrics.json`` (in the performance directory, beside the
+Performance_sum store) keeps the state after the last trade: cumulative PnL,
+running peak and drawdown, win/loss streaks, the last ``window`` trade PnLs and
+Welford mean/variance of trade PnL. A merge that only appends trades after the
+last exit folds just those trades into the state; anything else (a trade
+inserted in the past, a corrected PnL, a removed row) changes the digest of the
+already-folded prefix and triggers a full rebuild. Folding is sequential, so an
+advanced state equals a rebuilt one exactly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.settings import DEFAULT_ROLLING_WINDOW, PERFORMANCE_CSV
+from dashboard.services.analysis.prepared import prepare_performance
+from dashboard.services.data.performance_repository import performance_snapshot
+from dashboard.services.utils.persistence import atomic_write_json
+
+STATE_FORMAT_VERSION = 1
+
+_LOADED_LOCK = threading.Lock()
+_LOADED: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
+def state_path(csv_path: str | Path | None = None) -> Path:
+    return Path(csv_path or PERFORMANCE_CSV).with_name("running_metrics.json")
+
+
+def empty_state(window: int = DEFAULT_ROLLING_WINDOW) -> Dict[str, Any]:
+    return {
+        "format": STATE_FORMAT_VERSION,
+        "window": int(window),
+        "trades": 0,
+        "digest": hashlib.sha256().hexdigest(),
+        "last_exit": None,
+        "cumulative_pnl": 0.0,
+        "peak_pnl": 0.0,
+        "drawdown": 0.0,
+        "max_drawdown": 0.0,
+        "wins": 0,
+        "losses": 0,
+        "streak": 0,
+        "max_win_streak": 0,
+        "max_loss_streak": 0,
+        "recent_pnl": [],
+        "pnl_mean": 0.0,
+        "pnl_m2": 0.0,
+    }
+
+
+def _timeline(performance_df) -> Tuple[np.ndarray, pd.Series, np.ndarray]:
+    """Trades in exit order: per-row hashes, exit times and PnL."""
+    prepared = prepare_performance(performance_df)
+    if prepared.empty:
+        return np.array([], dtype=np.uint64), pd.Series(dtype=object), np.array([], dtype=float)
+    df = prepared.df
+    exited = df["ExitedAt"].dt.tz_convert(None).to_numpy()
+    order = np.argsort(exited, kind="stable")
+    trade_id = df["trade_id"].astype(str) if "trade_id" in df.columns else pd.Series("", index=df.index)
+    keys = pd.DataFrame(
+        {
+            "trade_id": trade_id.to_numpy()[order],
+            "exited": exited[order].astype("datetime64[ns]").view("int64"),
+            "pnl": df["PnL(Net)"].to_numpy(dtype=float)[order],
+        }
+    )
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return hashes, df["ExitedAt"].iloc[order], keys["pnl"].to_numpy()
+
+
+def _digest(hashes: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(hashes).tobytes()).hexdigest()
+
+
+def advance(state: Dict[str, Any], pnl_values) -> Dict[str, Any]:
+    """Fold trade PnLs (in exit order) into a copy of ``state``; wins are PnL > 0, as in the Streak column."""
+    out = dict(state)
+    recent = list(state["recent_pnl"])
+    window = int(state["window"])
+    cumulative, peak, max_drawdown = out["cumulative_pnl"], out["peak_pnl"], out["max_drawdown"]
+    streak, count, mean, m2 = out["streak"], out["trades"], out["pnl_mean"], out["pnl_m2"]
+    for pnl in map(float, pnl_values):
+        cumulative += pnl
+        peak = max(peak, cumulative)
+        max_drawdown = min(max_drawdown, cumulative - peak)
+        if pnl > 0:
+            out["wins"] += 1
+            streak = streak + 1 if streak > 0 else 1
+            out["max_win_streak"] = max(out["max_win_streak"], streak)
+        else:
+            out["losses"] += 1
+            streak = streak - 1 if streak < 0 else -1
+            out["max_loss_streak"] = max(out["max_loss_streak"], -streak)
+        count += 1
+        delta = pnl - mean
+        mean += delta / count
+        m2 += delta * (pnl - mean)
+        recent.append(pnl)
+    out.update(
+        cumulative_pnl=cumulative,
+        peak_pnl=peak,
+        drawdown=cumulative - peak,
+        max_drawdown=max_drawdown,
+        streak=streak,
+        recent_pnl=recent[-window:] if window > 0 else [],
+        trades=count,
+        pnl_mean=mean,
+        pnl_m2=m2,
+    )
+    return out
+
+
+def update_running_state(performance_df, state: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    State covering every trade in ``performance_df``, and whether ``state`` could be advanced
+    (True) or had to be rebuilt because its trades are no longer an exit-order prefix.
+    """
+    hashes, exits, pnl = _timeline(performance_df)
+    valid = (
+        isinstance(state, dict)
+        and state.get("format") == STATE_FORMAT_VERSION
+        and 0 <= int(state.get("trades", -1)) <= len(hashes)
+    )
+    incremental = bool(valid and state["digest"] == _digest(hashes[: int(state["trades"])]))
+    if incremental:
+        start = int(state["trades"])
+    else:
+        state = empty_state(int(state.get("window", DEFAULT_ROLLING_WINDOW)) if isinstance(state, dict) else DEFAULT_ROLLING_WINDOW)
+        start = 0
+    out = advance(state, pnl[start:])
+    out["digest"] = _digest(hashes)
+    out["last_exit"] = exits.iloc[-1].isoformat() if len(exits) else None
+    return out, incremental
+
+
+def read_running_state(csv_path: str | Path | None = None) -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_path(csv_path), "r", encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def sync_running_state(performance_df, csv_path: str | Path | None = None) -> Tuple[Dict[str, Any], bool]:
+    """Advance the persisted state to ``performance_df`` (callers hold the performance lock)."""
+    state, incremental = update_running_state(performance_df, read_running_state(csv_path))
+    atomic_write_json(state, state_path(csv_path))
+    return state, incremental
+
+
+def running_summary(state: Dict[str, Any]) -> Dict[str, Any]:
+    recent = state["recent_pnl"]
+    count = int(state["trades"])
+    std = math.sqrt(state["pnl_m2"] / (count - 1)) if count > 1 else 0.0
+    return {
+        "trades": int(state["trades"]),
+        "last_exit": state["last_exit"],
+        "cumulative_pnl": round(state["cumulative_pnl"], 2),
+        "peak_pnl": round(state["peak_pnl"], 2),
+        "drawdown": round(state["drawdown"], 2),
+        "max_drawdown": round(state["max_drawdown"], 2),
+        "win_rate": round(state["wins"] / count * 100, 2) if count else 0.0,
+        "streak": int(state["streak"]),
+        "max_win_streak": int(state["max_win_streak"]),
+        "max_loss_streak": int(state["max_loss_streak"]),
+        "window": int(state["window"]),
+        "rolling_win_rate": round(sum(pnl > 0 for pnl in recent) / len(recent) * 100, 2) if recent else 0.0,
+        "rolling_mean_pnl": round(sum(recent) / len(recent), 2) if recent else 0.0,
+        "mean_pnl": round(state["pnl_mean"], 2),
+        "std_pnl": round(std, 2),
+        "trade_sharpe": round(state["pnl_mean"] / std, 4) if std > 0 else 0.0,
+    }
+
+
+def load_running_state(csv_path: str | Path | None = None) -> Dict[str, Any]:
+    """State for the current performance snapshot (cached per snapshot version); the file is only read."""
+    path = str(csv_path or PERFORMANCE_CSV)
+    snapshot = performance_snapshot(path)
+    with _LOADED_LOCK:
+        cached = _LOADED.get(path)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1]
+    state, _ = update_running_state(snapshot.prepared(), read_running_state(path))
+    with _LOADED_LOCK:
+        _LOADED[path] = (snapshot.version, state)
+    return state
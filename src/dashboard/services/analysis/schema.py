@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import pandas as pd
 
+_UTC_NS = pd.DatetimeTZDtype("ns", "UTC")
+
 
 def validate_performance_df(df: pd.DataFrame) -> pd.DataFrame:
     required = ["EnteredAt", "ExitedAt", "PnL(Net)"]
@@ -9,16 +11,20 @@ def validate_performance_df(df: pd.DataFrame) -> pd.DataFrame:
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
     df = df.copy()
-    df["EnteredAt"] = pd.to_datetime(df["EnteredAt"], errors="coerce", utc=True).astype("datetime64[ns, UTC]")
-    df["ExitedAt"] = pd.to_datetime(df["ExitedAt"], errors="coerce", utc=True).astype("datetime64[ns, UTC]")
+    # Frames that already went through here (e.g. a batch request validating once
+    # up front) keep their normalized dtypes; skip re-parsing those columns.
+    for col in ("EnteredAt", "ExitedAt"):
+        if df[col].dtype != _UTC_NS:
+            df[col] = pd.to_datetime(df[col], errors="coerce", utc=True).astype(_UTC_NS)
     if df["EnteredAt"].isna().any() or df["ExitedAt"].isna().any():
         raise ValueError("Invalid datetimes in EnteredAt/ExitedAt")
     pnl_raw = df["PnL(Net)"]
-    pnl_num = pd.to_numeric(pnl_raw, errors="coerce")
-    invalid_numeric = pnl_num.isna() & pnl_raw.notna() & (pnl_raw.astype(str).str.strip() != "")
-    if invalid_numeric.any():
-        raise ValueError("Invalid numeric values in PnL(Net)")
-    df["PnL(Net)"] = pnl_num.fillna(0.0).astype(float)
+    if pnl_raw.dtype != "float64" or pnl_raw.isna().any():
+        pnl_num = pd.to_numeric(pnl_raw, errors="coerce")
+        invalid_numeric = pnl_num.isna() & pnl_raw.notna() & (pnl_raw.astype(str).str.strip() != "")
+        if invalid_numeric.any():
+            raise ValueError("Invalid numeric values in PnL(Net)")
+        df["PnL(Net)"] = pnl_num.fillna(0.0).astype(float)
     # Optional fields normalization
     if "TradeDay" in df.columns:
         df["TradeDay"] = pd.to_datetime(df["TradeDay"], errors="coerce", utc=True).dt.strftime("%Y-%m-%d")
@@ -0,0 +1,59 @@
+"""
+Small dependency-aware runner for report sections.
+
+A section is a callable taking the results of the sections it depends on (as
+keyword arguments named after them). Sections whose dependencies are done run
+concurrently on a thread pool; pandas releases the GIL for much of the heavy
+lifting, and the sections only read the shared prepared frame.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+Section = Tuple[Callable[..., Any], Iterable[str]]
+
+
+def run_sections(sections: Dict[str, Section], max_workers: int = 4) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Evaluate ``{name: (fn, depends_on)}`` and return ``(results, timings_ms)``.
+    The first section error is re-raised once running sections have finished.
+    """
+    deps = {name: tuple(depends_on) for name, (_, depends_on) in sections.items()}
+    for name, needs in deps.items():
+        unknown = [dep for dep in needs if dep not in sections]
+        if unknown:
+            raise ValueError(f"section {name} depends on unknown section(s): {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+
+    def _timed(name: str) -> Any:
+        fn = sections[name][0]
+        started = time.perf_counter()
+        try:
+            return fn(**{dep: results[dep] for dep in deps[name]})
+        finally:
+            timings[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    pending = dict(deps)
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as pool:
+        running = {}
+        while pending or running:
+            ready = [name for name, needs in pending.items() if all(dep in results for dep in needs)]
+            for name in ready:
+                del pending[name]
+                running[pool.submit(_timed, name)] = name
+            if not running:
+                raise ValueError(f"circular section dependencies: {', '.join(sorted(pending))}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    wait(running)
+                    raise error
+                results[name] = future.result()
+    return results, timings
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.settings import TIMEZONE
+from dashboard.services.data.bar_cache import BAR_CACHE
+from dashboard.services.data.bar_serialization import iso_times
+
+EMA_PERIOD = 20
+STUDY_NAMES = ("ema20", "vwap", "bar_index")
+
+
+def parse_studies(raw: Optional[str]) -> List[str]:
+    names = [part.strip().lower() for part in str(raw or "").split(",") if part.strip()]
+    if names == ["all"]:
+        return list(STUDY_NAMES)
+    unknown = [name for name in names if name not in STUDY_NAMES]
+    if unknown:
+        raise ValueError(f"studies must be a comma list of {', '.join(STUDY_NAMES)}")
+    return [name for name in STUDY_NAMES if name in names]
+
+
+def _session_keys(ts: pd.Series) -> pd.Series:
+    return ts.dt.tz_convert(TIMEZONE).dt.tz_localize(None).dt.normalize()
+
+
+def compute_studies(bars: pd.DataFrame, period: int = EMA_PERIOD) -> pd.DataFrame:
+    """
+    EMA, VWAP and bar index per trading day, as the trading chart draws them for
+    one day: EMA seeded with the day's first close (hidden until ``period`` bars),
+    VWAP over the typical price with zero/missing volume counted as 1, 1-based index.
+    """
+    ts = pd.to_datetime(bars["Datetime"], utc=True)
+    session = _session_keys(ts).to_numpy()
+    close = pd.Series(bars["Close"].to_numpy(dtype="float64"))
+    bar_index = close.groupby(session, sort=False).cumcount().to_numpy() + 1
+
+    ema = close.groupby(session, sort=False).ewm(alpha=2 / (period + 1), adjust=False).mean()
+    ema = ema.reset_index(level=0, drop=True).sort_index().to_numpy()
+    ema = np.where(bar_index >= period, ema, np.nan)
+
+    volume = bars["Volume"].to_numpy(dtype="float64") if "Volume" in bars.columns else np.zeros(len(bars))
+    volume = np.where(np.isnan(volume) | (volume == 0), 1.0, volume)
+    typical = (bars["High"].to_numpy(dtype="float64") + bars["Low"].to_numpy(dtype="float64") + close.to_numpy()) / 3
+    cum_pv = pd.Series(typical * volume).groupby(session, sort=False).cumsum().to_numpy()
+    cum_vol = pd.Series(volume).groupby(session, sort=False).cumsum().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(cum_vol > 0, cum_pv / cum_vol, np.nan)
+
+    return pd.DataFrame({"Datetime": bars["Datetime"].reset_index(drop=True), "ema20": ema, "vwap": vwap, "bar_index": bar_index})
+
+
+def bar_studies(csv_path: str | Path, bars: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """``compute_studies`` over whole trading days of ``bars`` read from ``csv_path``, cached per day."""
+    if bars.empty:
+        return compute_studies(bars)
+    base_key = BAR_CACHE.key_for(csv_path)
+    days = _session_keys(pd.to_datetime(bars["Datetime"], utc=True))
+    frames = []
+    for day, day_bars in bars.groupby(days.to_numpy(), sort=False):
+        tag = ("studies", timeframe, pd.Timestamp(day).date().isoformat(), len(day_bars))
+        frames.append(BAR_CACHE.fetch(base_key + tag, lambda: compute_studies(day_bars)))
+    return pd.concat(frames, ignore_index=True)
+
+
+def studies_payload(studies: pd.DataFrame, names: List[str], tz_name: str) -> Dict[str, Any]:
+    """Columnar ``{time, <study>: [...]}`` aligned with the bars; warm-up values are null."""
+    out: Dict[str, Any] = {"time": iso_times(studies["Datetime"], tz_name)}
+    for name in names:
+        values = studies[name]
+        if name == "bar_index":
+            out[name] = values.astype(int).tolist()
+        else:
+            out[name] = [None if np.isnan(v) else v for v in values.astype(float).tolist()]
+    return out
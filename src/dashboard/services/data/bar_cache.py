@@ -0,0 +1,118 @@
+"""
+Process-wide LRU of parsed bar frames.
+
+Entries are keyed by ``(path, mtime_ns, size)`` of the file they were parsed
+from, optionally followed by a tag for frames derived from that file (e.g. a
+resampled day), so a rewritten file simply misses and its older entries are
+dropped.
+The cache is bounded by an approximate byte budget (``cache.bar_cache_max_mb``
+in app config, overridable via ``BAR_CACHE_MAX_MB``). Cached frames are shared:
+callers must treat them as read-only and copy before mutating.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+from dashboard.config.app_config import get_app_config
+
+CacheKey = Tuple[Any, ...]
+
+
+def _resolve_budget_bytes() -> int:
+    cfg_default = get_app_config().get("cache", {}).get("bar_cache_max_mb", 256)
+    raw = os.environ.get("BAR_CACHE_MAX_MB", str(cfg_default))
+    try:
+        mb = float(raw)
+    except (TypeError, ValueError):
+        mb = 256.0
+    return max(0, int(mb * 1024 * 1024))
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class BarCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(path: str | Path) -> CacheKey:
+        st = os.stat(path)
+        return (str(Path(path).resolve()), int(st.st_mtime_ns), int(st.st_size))
+
+    def get(
+        self,
+        path: str | Path,
+        loader: Callable[[str | Path], pd.DataFrame],
+        tag: Tuple[Any, ...] = (),
+    ) -> pd.DataFrame:
+        return self.fetch(self.key_for(path) + tuple(tag), lambda: loader(path))
+
+    def fetch(self, key: CacheKey, factory: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Return the frame cached under ``key`` (from ``key_for`` plus any tag), building it on a miss."""
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return hit[0]
+            self.misses += 1
+        frame = factory()
+        self.put(key, frame)
+        return frame
+
+    def put(self, key: CacheKey, frame: pd.DataFrame) -> None:
+        size = _frame_bytes(frame)
+        with self._lock:
+            for stale in [k for k in self._entries if k[0] == key[0] and k[1:3] != key[1:3]]:
+                self._bytes -= self._entries.pop(stale)[1]
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (frame, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+BAR_CACHE = BarCache(_resolve_budget_bytes())
+
+
+def cached_frame(path: str | Path, loader: Callable[[str | Path], pd.DataFrame]) -> pd.DataFrame:
+    return BAR_CACHE.get(path, loader)
+
+
+def clear_bar_cache() -> None:
+    BAR_CACHE.clear()
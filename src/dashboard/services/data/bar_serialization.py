@@ -0,0 +1,143 @@
+"""
+Vectorized serialization of OHLCV frames for the API.
+
+Two shapes are produced from a frame with a tz-aware ``Datetime`` column:
+
+- ``rows`` (default): ``[{time, open, high, low, close, volume}, ...]`` with
+  ``time`` as an ISO-8601 string in the requested timezone, byte-for-byte what
+  ``Timestamp.isoformat()`` gives.
+- ``columnar``: ``{time: [...], open: [...], ...}`` parallel arrays with
+  ``time`` as UTC epoch milliseconds.
+
+``pack_bars`` encodes the columnar shape as a binary body
+(``BAR_BINARY_MIMETYPE``)::
+
+    b"FTAB" | uint16 version | uint16 reserved | uint32 header_len
+    | header JSON (utf-8, space-padded to an 8-byte boundary)
+    | one little-endian buffer of ``rows`` items per column, in header order
+
+The header is ``{"rows": n, "columns": [{"name", "dtype"}], "meta": {...}}``;
+``time`` is ``<i8`` epoch milliseconds, prices and volume are ``<f8``.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BAR_FORMATS = {"rows", "columnar"}
+BAR_BINARY_MIMETYPE = "application/vnd.fta.bars"
+BAR_BINARY_MAGIC = b"FTAB"
+BAR_BINARY_VERSION = 1
+_PREFIX = struct.Struct("<4sHHI")
+_PRICE_FIELDS = (("open", "Open"), ("high", "High"), ("low", "Low"), ("close", "Close"))
+
+
+def parse_bar_format(raw: Optional[str]) -> str:
+    fmt = str(raw or "rows").strip().lower()
+    if fmt not in BAR_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(sorted(BAR_FORMATS))}")
+    return fmt
+
+
+def _format_offset(seconds: int) -> str:
+    sign = "+" if seconds >= 0 else "-"
+    minutes = abs(int(seconds)) // 60
+    return f"{sign}{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def iso_times(ts: pd.Series, tz_name: str) -> List[str]:
+    """``[t.tz_convert(tz_name).isoformat() for t in ts]`` without the Python loop."""
+    if ts.empty:
+        return []
+    utc = pd.to_datetime(ts, utc=True)
+    if utc.isna().any():
+        return ["" if pd.isna(t) else t.tz_convert(tz_name).isoformat() for t in utc]
+    utc_ns = utc.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    if (utc_ns.view("int64") % 1_000_000_000).any():
+        return [t.tz_convert(tz_name).isoformat() for t in utc]
+    wall = utc.dt.tz_convert(tz_name).dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    offsets = (wall - utc_ns).astype("timedelta64[s]").astype("int64")
+    suffix_by_offset = {int(o): _format_offset(int(o)) for o in np.unique(offsets)}
+    suffixes = np.array([suffix_by_offset[int(o)] for o in offsets]) if len(suffix_by_offset) > 1 else np.full(len(offsets), next(iter(suffix_by_offset.values())))
+    return np.char.add(np.datetime_as_string(wall, unit="s"), suffixes).tolist()
+
+
+def epoch_millis(ts: pd.Series) -> List[int]:
+    utc = pd.to_datetime(ts, utc=True)
+    return (utc.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").view("int64") // 1_000_000).tolist()
+
+
+def _float_list(series: pd.Series) -> List[float]:
+    return series.astype(float).tolist()
+
+
+def serialize_bars(df: pd.DataFrame, tz_name: str = "UTC", fmt: str = "rows") -> Any:
+    has_volume = "Volume" in df.columns
+    if fmt == "columnar":
+        out: Dict[str, Any] = {"time": epoch_millis(df["Datetime"])}
+        for key, col in _PRICE_FIELDS:
+            out[key] = _float_list(df[col])
+        out["volume"] = _float_list(df["Volume"]) if has_volume else None
+        return out
+
+    times = iso_times(df["Datetime"], tz_name)
+    columns = [_float_list(df[col]) for _, col in _PRICE_FIELDS]
+    volumes = _float_list(df["Volume"]) if has_volume else [None] * len(times)
+    return [
+        {"time": t, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for t, o, h, l, c, v in zip(times, *columns, volumes)
+    ]
+
+
+def _bar_columns(df: pd.DataFrame) -> List[Tuple[str, np.ndarray]]:
+    utc = pd.to_datetime(df["Datetime"], utc=True)
+    cols: List[Tuple[str, np.ndarray]] = [
+        ("time", utc.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").view("int64") // 1_000_000)
+    ]
+    for key, col in _PRICE_FIELDS:
+        cols.append((key, df[col].to_numpy(dtype="float64")))
+    if "Volume" in df.columns:
+        cols.append(("volume", df["Volume"].to_numpy(dtype="float64")))
+    return cols
+
+
+def pack_bars(
+    df: pd.DataFrame,
+    meta: Optional[Dict[str, Any]] = None,
+    dumps: Callable[[Any], str] = json.dumps,
+) -> bytes:
+    columns = _bar_columns(df)
+    header = {
+        "rows": int(len(df)),
+        "columns": [{"name": name, "dtype": "<i8" if values.dtype.kind == "i" else "<f8"} for name, values in columns],
+        "meta": meta or {},
+    }
+    header_bytes = dumps(header).encode("utf-8")
+    pad = (-(_PREFIX.size + len(header_bytes))) % 8
+    header_bytes += b" " * pad
+    parts = [_PREFIX.pack(BAR_BINARY_MAGIC, BAR_BINARY_VERSION, 0, len(header_bytes)), header_bytes]
+    for _, values in columns:
+        parts.append(values.astype(values.dtype.newbyteorder("<"), copy=False).tobytes())
+    return b"".join(parts)
+
+
+def unpack_bars(payload: bytes) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Inverse of ``pack_bars``: ``({column: array}, meta)``."""
+    magic, version, _, header_len = _PREFIX.unpack_from(payload, 0)
+    if magic != BAR_BINARY_MAGIC or version != BAR_BINARY_VERSION:
+        raise ValueError("not a packed bar payload")
+    offset = _PREFIX.size
+    header = json.loads(payload[offset:offset + header_len].decode("utf-8"))
+    offset += header_len
+    rows = int(header["rows"])
+    arrays: Dict[str, np.ndarray] = {}
+    for col in header["columns"]:
+        dtype = np.dtype(col["dtype"])
+        arrays[col["name"]] = np.frombuffer(payload, dtype=dtype, count=rows, offset=offset)
+        offset += rows * dtype.itemsize
+    return arrays, header.get("meta", {})
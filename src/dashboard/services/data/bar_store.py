@@ -0,0 +1,329 @@
+"""
+Columnar, month-partitioned mirror of the per-symbol 5m future CSVs.
+
+The CSV under ``data/future`` stays the source of truth. Next to it we keep
+``.bars/<stem>/`` holding one ``YYYY-MM.npz`` per trading-timezone month
+(one array per column, Datetime as UTC epoch nanoseconds) plus a
+``manifest.json`` recording the CSV size/mtime the partitions were built
+from. Readers only open partitions overlapping the requested range (through
+the shared bar cache), so a single-session read does not grow with the
+length of the history.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.settings import TIMEZONE
+from dashboard.services.data.bar_cache import cached_frame
+from dashboard.services.data.day_index import ensure_day_index, read_day_range, sidecar_dir
+from dashboard.services.utils.datetime_utils import normalize_series_utc
+from dashboard.services.utils.persistence import advisory_file_lock
+
+log = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DATETIME_PATTERN = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}[-+]\d{2}:\d{2}"
+
+
+def store_dir(csv_path: str | Path) -> Path:
+    return sidecar_dir(csv_path)
+
+
+def _source_stat(csv_path: str | Path) -> Dict[str, int]:
+    st = os.stat(csv_path)
+    return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+
+def read_source_csv(csv_path: str | Path) -> pd.DataFrame:
+    """Parse a future CSV the way load_future always has (strict Datetime format, UTC)."""
+    try:
+        df = pd.read_csv(csv_path)
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"future data file not found: {csv_path}") from exc
+    except pd.errors.EmptyDataError as exc:
+        raise ValueError("future data file is empty") from exc
+    except pd.errors.ParserError as exc:
+        raise ValueError(f"failed to parse future data: {exc}") from exc
+    return parse_future_frame(df)
+
+
+def parse_future_frame(df: pd.DataFrame) -> pd.DataFrame:
+    try:
+        if "Datetime" not in df.columns:
+            raise ValueError("Datetime column missing")
+        datetime_raw = df["Datetime"].astype(str)
+        valid = datetime_raw.str.match(DATETIME_PATTERN)
+        if not valid.all():
+            raise ValueError(f"Invalid datetime format in CSV at rows: {df[~valid].index.tolist()}")
+        df["Datetime"] = normalize_series_utc(df["Datetime"], "Datetime")
+        return df
+    except (TypeError, ValueError, KeyError) as exc:
+        raise ValueError(f"Failed to load future data: {exc}") from exc
+
+
+def _month_keys(utc_ns: np.ndarray) -> np.ndarray:
+    local = pd.DatetimeIndex(utc_ns.astype("datetime64[ns]")).tz_localize("UTC").tz_convert(TIMEZONE)
+    return (local.year * 100 + local.month).to_numpy()
+
+
+def _column_array(series: pd.Series) -> np.ndarray:
+    if series.dtype == object:
+        return series.astype(str).to_numpy(dtype=str)
+    return series.to_numpy()
+
+
+def _write_partition(target: Path, arrays: Dict[str, np.ndarray]) -> None:
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **arrays)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _write_manifest(root: Path, manifest: Dict[str, Any]) -> None:
+    target = root / MANIFEST_NAME
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(root))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, sort_keys=True)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def load_manifest(csv_path: str | Path) -> Optional[Dict[str, Any]]:
+    path = store_dir(csv_path) / MANIFEST_NAME
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("format") != STORE_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _frame_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    arrays: Dict[str, np.ndarray] = {}
+    for col in df.columns:
+        if col == "Datetime":
+            arrays[col] = df[col].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").view("int64")
+        else:
+            arrays[col] = _column_array(df[col])
+    return arrays
+
+
+def _write_months(root: Path, columns: list[str], arrays: Dict[str, np.ndarray], manifest: Dict[str, Any]) -> None:
+    ts = arrays["Datetime"]
+    if ts.size == 0:
+        return
+    months = _month_keys(ts)
+    partitions = manifest.setdefault("partitions", {})
+    for month in np.unique(months):
+        mask = months == month
+        key = f"{int(month) // 100:04d}-{int(month) % 100:02d}"
+        part = {col: arrays[col][mask] for col in columns}
+        _write_partition(root / f"{key}.npz", part)
+        part_ts = part["Datetime"]
+        partitions[key] = {
+            "file": f"{key}.npz",
+            "rows": int(part_ts.size),
+            "first_ns": int(part_ts.min()),
+            "last_ns": int(part_ts.max()),
+        }
+
+
+def rebuild_bar_store(csv_path: str | Path) -> Dict[str, Any]:
+    """Re-derive every partition from the CSV. Caller should hold the store lock."""
+    stat = _source_stat(csv_path)
+    df = read_source_csv(csv_path)
+    root = store_dir(csv_path)
+    root.mkdir(parents=True, exist_ok=True)
+    for stale in root.glob("*.npz"):
+        stale.unlink()
+    columns = [str(c) for c in df.columns]
+    manifest: Dict[str, Any] = {
+        "format": STORE_FORMAT_VERSION,
+        "columns": columns,
+        "partitions": {},
+        "source": stat,
+    }
+    _write_months(root, columns, _frame_arrays(df), manifest)
+    _write_manifest(root, manifest)
+    return manifest
+
+
+def _is_fresh(manifest: Optional[Dict[str, Any]], stat: Dict[str, int]) -> bool:
+    return manifest is not None and manifest.get("source") == stat
+
+
+def ensure_bar_store(csv_path: str | Path) -> Dict[str, Any]:
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"future data file not found: {csv_path}")
+    manifest = load_manifest(csv_path)
+    if _is_fresh(manifest, _source_stat(csv_path)):
+        return manifest  # type: ignore[return-value]
+    with advisory_file_lock(store_dir(csv_path)):
+        manifest = load_manifest(csv_path)
+        if _is_fresh(manifest, _source_stat(csv_path)):
+            return manifest  # type: ignore[return-value]
+        log.info("Rebuilding bar store for %s", csv_path)
+        return rebuild_bar_store(csv_path)
+
+
+def append_bars(csv_path: str | Path, bars: pd.DataFrame, previous_stat: Optional[Dict[str, int]] = None) -> None:
+    """
+    Fold rows that were just appended to the CSV into the affected month partitions.
+
+    ``bars`` carries a Datetime column plus the CSV columns. ``previous_stat`` is the
+    CSV size/mtime before the append; if the store was not built from exactly that
+    file the partitions are rebuilt from the CSV instead.
+    """
+    root = store_dir(csv_path)
+    with advisory_file_lock(root):
+        manifest = load_manifest(csv_path)
+        columns = [str(c) for c in bars.columns]
+        if previous_stat is None or not _is_fresh(manifest, previous_stat) or manifest.get("columns") != columns:
+            rebuild_bar_store(csv_path)
+            return
+        frame = bars.copy()
+        frame["Datetime"] = normalize_series_utc(frame["Datetime"], "Datetime")
+        new_arrays = _frame_arrays(frame)
+        touched = {f"{int(m) // 100:04d}-{int(m) % 100:02d}" for m in np.unique(_month_keys(new_arrays["Datetime"]))}
+        existing = [_load_partition(root, manifest["partitions"][key]) for key in sorted(touched) if key in manifest["partitions"]]
+        merged = {col: np.concatenate([part[col] for part in existing] + [new_arrays[col]]) for col in columns}
+        _write_months(root, columns, merged, manifest)
+        manifest["source"] = _source_stat(csv_path)
+        _write_manifest(root, manifest)
+
+
+def _load_partition(root: Path, info: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    with np.load(root / info["file"], allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _arrays_to_frame(arrays: Dict[str, np.ndarray], columns: list[str]) -> pd.DataFrame:
+    data: Dict[str, Any] = {}
+    for col in columns:
+        values = arrays[col]
+        if col == "Datetime":
+            data[col] = pd.DatetimeIndex(values.astype("datetime64[ns]")).tz_localize("UTC").tz_convert(TIMEZONE)
+        elif values.dtype.kind == "U":
+            data[col] = values.astype(object)
+        else:
+            data[col] = values
+    return pd.DataFrame(data, columns=columns)
+
+
+def _partition_frame(path: str | Path) -> pd.DataFrame:
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    return _arrays_to_frame(arrays, list(arrays))
+
+
+def _csv_frame(path: str | Path) -> pd.DataFrame:
+    df = read_source_csv(path)
+    df["Datetime"] = df["Datetime"].dt.tz_convert(TIMEZONE)
+    return df
+
+
+def _local_day(ns: Optional[int]) -> Optional[str]:
+    if ns is None:
+        return None
+    return pd.Timestamp(ns, tz="UTC").tz_convert(TIMEZONE).strftime("%Y-%m-%d")
+
+
+def _day_range_frame(csv_path: str | Path, start_ns: Optional[int], end_ns: Optional[int]) -> pd.DataFrame:
+    """Slice the requested trading days out of the CSV via the day index, else parse it all."""
+    try:
+        raw = read_day_range(csv_path, _local_day(start_ns), _local_day(end_ns), ensure_day_index(csv_path, persist=False))
+    except (OSError, ValueError, pd.errors.ParserError) as exc:
+        log.warning("Day index unusable for %s: %s", csv_path, exc)
+        raw = None
+    if raw is None:
+        return cached_frame(csv_path, _csv_frame)
+    df = parse_future_frame(raw)
+    df["Datetime"] = df["Datetime"].dt.tz_convert(TIMEZONE)
+    return df
+
+
+def _overlapping(partitions: Dict[str, Any], start_ns: Optional[int], end_ns: Optional[int]) -> Iterable[Dict[str, Any]]:
+    for key in sorted(partitions):
+        info = partitions[key]
+        if start_ns is not None and info["last_ns"] < start_ns:
+            continue
+        if end_ns is not None and info["first_ns"] > end_ns:
+            continue
+        yield info
+
+
+def _to_utc_ns(ts: Optional[pd.Timestamp]) -> Optional[int]:
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.tz_convert("UTC").value)
+
+
+def read_bars(
+    csv_path: str | Path,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    tz_name: str = TIMEZONE,
+) -> pd.DataFrame:
+    """
+    Return bars with ``start <= Datetime <= end`` (both optional, inclusive) in CSV
+    column order, Datetime converted to ``tz_name``. Partition frames come from the
+    shared bar cache; the CSV is parsed directly when the store cannot be written.
+    """
+    start_ns = _to_utc_ns(start)
+    end_ns = _to_utc_ns(end)
+    try:
+        manifest = ensure_bar_store(csv_path)
+    except OSError as exc:
+        if isinstance(exc, FileNotFoundError) and not os.path.exists(csv_path):
+            raise
+        log.warning("Bar store unavailable for %s, reading CSV directly: %s", csv_path, exc)
+        frames = [_day_range_frame(csv_path, start_ns, end_ns)]
+        columns = list(frames[0].columns)
+    else:
+        root = store_dir(csv_path)
+        columns = manifest["columns"]
+        frames = [cached_frame(root / info["file"], _partition_frame) for info in _overlapping(manifest.get("partitions", {}), start_ns, end_ns)]
+
+    if not frames:
+        empty = {col: np.array([], dtype="int64" if col == "Datetime" else "float64") for col in columns}
+        df = _arrays_to_frame(empty, columns)
+    elif len(frames) == 1:
+        df = frames[0]
+    else:
+        df = pd.concat(frames, ignore_index=True)
+    ts = df["Datetime"]
+    mask = np.ones(len(df), dtype=bool)
+    if start_ns is not None:
+        mask &= (ts >= pd.Timestamp(start_ns, tz="UTC")).to_numpy()
+    if end_ns is not None:
+        mask &= (ts <= pd.Timestamp(end_ns, tz="UTC")).to_numpy()
+    out = df[mask].reset_index(drop=True)
+    if tz_name != TIMEZONE:
+        out["Datetime"] = out["Datetime"].dt.tz_convert(tz_name)
+    return out
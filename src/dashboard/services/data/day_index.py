@@ -0,0 +1,207 @@
+"""
+Byte-offset day index for the per-symbol future CSVs.
+
+``.bars/<stem>/day_index.json`` maps each trading day (in TIMEZONE) to the byte
+offset of its first row and its row count, plus the total row count and the
+latest timestamp. It lets callers slice a day range out of the CSV, or report
+row counts and the last date, without parsing the file. The index records the
+CSV size/mtime it describes; an appended CSV is indexed incrementally from the
+previous end, anything else is re-indexed from scratch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from dashboard.config.settings import TIMEZONE
+from dashboard.services.utils.persistence import advisory_file_lock
+
+INDEX_FORMAT_VERSION = 1
+INDEX_NAME = "day_index.json"
+_TAIL_BYTES = 64
+
+
+def sidecar_dir(csv_path: str | Path) -> Path:
+    p = Path(csv_path)
+    return p.parent / ".bars" / p.stem
+
+
+def index_path(csv_path: str | Path) -> Path:
+    return sidecar_dir(csv_path) / INDEX_NAME
+
+
+def _tail_digest(fh, end: int) -> str:
+    start = max(0, end - _TAIL_BYTES)
+    fh.seek(start)
+    return hashlib.sha1(fh.read(end - start), usedforsecurity=False).hexdigest()
+
+
+def _scan_lines(fh, pos: int) -> tuple[List[int], List[str], int]:
+    fh.seek(pos)
+    offsets: List[int] = []
+    stamps: List[str] = []
+    for line in fh:
+        if line.strip():
+            offsets.append(pos)
+            stamps.append(line.split(b",", 1)[0].decode("utf-8", errors="replace").strip().strip('"'))
+        pos += len(line)
+    return offsets, stamps, pos
+
+
+def _fold_lines(index: Dict[str, Any], offsets: List[int], stamps: List[str]) -> None:
+    if not offsets:
+        return
+    ts = pd.to_datetime(pd.Series(stamps), utc=True, errors="coerce")
+    if ts.isna().any():
+        index["valid"] = False
+        return
+    days = ts.dt.tz_convert(TIMEZONE).dt.strftime("%Y-%m-%d").tolist()
+    entries = index["days"]
+    seen = {entry[0] for entry in entries}
+    for offset, day in zip(offsets, days):
+        if entries and entries[-1][0] == day:
+            entries[-1][2] += 1
+            continue
+        if day in seen or (entries and day < entries[-1][0]):
+            index["ordered"] = False
+        seen.add(day)
+        entries.append([day, offset, 1])
+    index["rows"] += len(offsets)
+    last_ns = int(ts.max().value)
+    index["max_utc_ns"] = max(index.get("max_utc_ns") or last_ns, last_ns)
+
+
+def build_day_index(csv_path: str | Path, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Index ``csv_path``; reuses ``previous`` when the file only grew since it was built."""
+    st = os.stat(csv_path)
+    with open(csv_path, "rb") as fh:
+        header = fh.readline()
+        if previous is not None and previous.get("size", 0) <= st.st_size and previous.get("header") == header.decode("utf-8", errors="replace"):
+            if _tail_digest(fh, int(previous["size"])) == previous.get("tail"):
+                index = dict(previous)
+                index["days"] = [list(entry) for entry in previous["days"]]
+                offsets, stamps, end = _scan_lines(fh, int(previous["size"]))
+                _fold_lines(index, offsets, stamps)
+                index.update({"size": end, "mtime_ns": int(st.st_mtime_ns), "tail": _tail_digest(fh, end)})
+                return index
+        first_field = header.split(b",", 1)[0].decode("utf-8", errors="replace").strip().strip('"')
+        index = {
+            "format": INDEX_FORMAT_VERSION,
+            "header": header.decode("utf-8", errors="replace"),
+            "days": [],
+            "rows": 0,
+            "max_utc_ns": None,
+            "ordered": True,
+            "valid": first_field == "Datetime",
+        }
+        if index["valid"]:
+            offsets, stamps, end = _scan_lines(fh, len(header))
+            _fold_lines(index, offsets, stamps)
+        else:
+            end = int(st.st_size)
+        index.update({"size": end, "mtime_ns": int(st.st_mtime_ns), "tail": _tail_digest(fh, end)})
+        return index
+
+
+def load_day_index(csv_path: str | Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(index_path(csv_path), "r", encoding="utf-8") as fh:
+            index = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("format") != INDEX_FORMAT_VERSION:
+        return None
+    return index
+
+
+def _write_index(csv_path: str | Path, index: Dict[str, Any]) -> None:
+    target = index_path(csv_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(index, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _is_current(index: Optional[Dict[str, Any]], csv_path: str | Path) -> bool:
+    if index is None:
+        return False
+    st = os.stat(csv_path)
+    return index.get("size") == st.st_size and index.get("mtime_ns") == st.st_mtime_ns
+
+
+def ensure_day_index(csv_path: str | Path, *, persist: bool = True) -> Dict[str, Any]:
+    """Return an index matching the CSV on disk, extending or rebuilding it as needed."""
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"future data file not found: {csv_path}")
+    index = load_day_index(csv_path)
+    if _is_current(index, csv_path):
+        return index  # type: ignore[return-value]
+    if not persist:
+        return build_day_index(csv_path, index)
+    with advisory_file_lock(index_path(csv_path)):
+        index = load_day_index(csv_path)
+        if _is_current(index, csv_path):
+            return index  # type: ignore[return-value]
+        index = build_day_index(csv_path, index)
+        _write_index(csv_path, index)
+        return index
+
+
+def rebuild_day_index(csv_path: str | Path) -> Dict[str, Any]:
+    with advisory_file_lock(index_path(csv_path)):
+        index = build_day_index(csv_path)
+        _write_index(csv_path, index)
+        return index
+
+
+def last_utc_date(index: Dict[str, Any]):
+    raw = index.get("max_utc_ns")
+    if raw is None:
+        return None
+    return pd.Timestamp(int(raw), tz="UTC").date()
+
+
+def read_day_range(
+    csv_path: str | Path,
+    start_day: Optional[str],
+    end_day: Optional[str],
+    index: Optional[Dict[str, Any]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Raw CSV rows (unparsed, as ``pd.read_csv`` would return them) for trading days in
+    ``[start_day, end_day]`` (``YYYY-MM-DD``, either may be None). Returns None when
+    the index cannot serve the request, e.g. the file is not day-ordered.
+    """
+    index = index or ensure_day_index(csv_path)
+    if not index.get("valid") or not index.get("ordered"):
+        return None
+    entries = index["days"]
+    selected = [
+        i for i, entry in enumerate(entries)
+        if (start_day is None or entry[0] >= start_day) and (end_day is None or entry[0] <= end_day)
+    ]
+    header = index["header"].encode("utf-8")
+    if not selected:
+        return pd.read_csv(io.BytesIO(header))
+    begin = entries[selected[0]][1]
+    last = selected[-1]
+    stop = entries[last + 1][1] if last + 1 < len(entries) else index["size"]
+    with open(csv_path, "rb") as fh:
+        fh.seek(begin)
+        chunk = fh.read(stop - begin)
+    return pd.read_csv(io.BytesIO(header + chunk))
@@ -0,0 +1,183 @@
+"""
+Shared, versioned in-memory copy of Performance_sum.
+
+One repository per CSV path holds the parsed, trade_id-stamped frame and the
+TradeDay column normalized to the analysis timezone. It reloads only when the
+(mtime_ns, size, inode) of the store manifest (or the legacy single CSV)
+changes or after ``invalidate_performance_cache``. A writer that replaced some
+month partitions calls ``replace_months`` instead, which re-reads only those
+months and splices them into the cached frame. Every reload bumps a
+process-wide, monotonically increasing version that downstream caches can key
+on.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.analysis import ANALYSIS_TIMEZONE
+from dashboard.config.settings import PERFORMANCE_CSV
+from dashboard.services.analysis.prepared import PreparedPerformance, prepare_performance
+from dashboard.services.data.performance_store import read_performance, read_store, source_path
+from dashboard.services.utils.datetime_utils import normalize_series_to_timezone
+from dashboard.services.utils.trade_enrichment import ensure_trade_id
+
+_VERSION_COUNTER = itertools.count(1)
+_REGISTRY_LOCK = threading.Lock()
+_REPOSITORIES: Dict[str, "PerformanceRepository"] = {}
+
+
+class PerformanceSnapshot:
+    """Immutable view of one load of the performance CSV."""
+
+    def __init__(self, path: str, version: int, frame: pd.DataFrame, months: Optional[np.ndarray] = None):
+        self.path = path
+        self.version = version
+        self._frame = frame
+        # Partition month of each row; None while the data still lives in a single CSV.
+        self.months = months
+        self._trade_day: Dict[str, pd.Series] = {}
+        self._prepared: Optional[PreparedPerformance] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._frame.columns
+
+    def view(self) -> pd.DataFrame:
+        """
+        Shallow copy for building masks and reading columns. Its cells are the cached
+        frame's (copy-on-write is off), so never return it to a caller; hand out
+        ``copy``, ``select`` or ``records`` instead.
+        """
+        return self._frame.copy(deep=False)
+
+    def copy(self) -> pd.DataFrame:
+        return self._frame.copy()
+
+    def select(self, mask) -> pd.DataFrame:
+        """Deep copy of the rows where ``mask`` holds, keeping their index labels."""
+        return self._frame.take(np.flatnonzero(np.asarray(mask, dtype=bool)))
+
+    def records(self) -> list:
+        """Rows as new dicts, e.g. for the journal match checks."""
+        return self._frame.to_dict(orient="records")
+
+    def prepared(self) -> PreparedPerformance:
+        """The frame validated for the analysis metrics (once per snapshot)."""
+        with self._lock:
+            if self._prepared is None:
+                self._prepared = prepare_performance(self._frame)
+            return self._prepared
+
+    def trade_day(self, tz_name: str = ANALYSIS_TIMEZONE) -> pd.Series:
+        """TradeDay normalized to midnight in ``tz_name`` (cached per snapshot)."""
+        with self._lock:
+            cached = self._trade_day.get(tz_name)
+            if cached is None:
+                cached = normalize_series_to_timezone(self._frame["TradeDay"], "TradeDay", tz_name).dt.normalize()
+                self._trade_day[tz_name] = cached
+            return cached
+
+
+def _file_token(path: str) -> Tuple[int, int, int]:
+    st = os.stat(source_path(path))
+    return (int(st.st_mtime_ns), int(st.st_size), int(st.st_ino))
+
+
+class PerformanceRepository:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._snapshot: Optional[PerformanceSnapshot] = None
+        self._token: Optional[Tuple[int, int, int]] = None
+
+    def snapshot(self) -> PerformanceSnapshot:
+        try:
+            token = _file_token(self.path)
+        except FileNotFoundError as exc:
+            raise FileNotFoundError("performance data not found") from exc
+        with self._lock:
+            if self._snapshot is not None and self._token == token:
+                return self._snapshot
+            frame, months = read_performance(self.path)
+            self._snapshot = PerformanceSnapshot(self.path, next(_VERSION_COUNTER), ensure_trade_id(frame), months)
+            self._token = token
+            return self._snapshot
+
+    def token(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            return _file_token(self.path)
+        except FileNotFoundError:
+            return None
+
+    def replace_months(self, previous_token: Optional[Tuple[int, int, int]], months) -> PerformanceSnapshot:
+        """
+        Snapshot after a write that replaced ``months``. When the cached snapshot was taken
+        at ``previous_token`` only those partitions are read; otherwise everything reloads.
+        """
+        months = {str(month) for month in months}
+        with self._lock:
+            cached = self._snapshot
+            if cached is None or cached.months is None or previous_token is None or self._token != previous_token:
+                self.invalidate()
+                return self.snapshot()
+            token = _file_token(self.path)
+            fresh, fresh_months = read_store(self.path, months)
+            keep = ~np.isin(cached.months, list(months))
+            frame = pd.concat([cached._frame[keep], fresh], ignore_index=True) if len(fresh) else cached._frame[keep]
+            labels = np.concatenate([cached.months[keep], fresh_months])
+            order = np.argsort(labels, kind="stable")
+            frame = ensure_trade_id(frame.iloc[order].reset_index(drop=True))
+            snapshot = PerformanceSnapshot(self.path, next(_VERSION_COUNTER), frame, labels[order])
+            if cached._prepared is not None:
+                # Validate only the re-read months; the rest of the prepared frame carries over.
+                try:
+                    validated = pd.concat([cached._prepared.df[keep], prepare_performance(fresh).df], ignore_index=True)
+                    snapshot._prepared = PreparedPerformance.from_validated(validated.iloc[order].reset_index(drop=True))
+                except ValueError:
+                    pass
+            self._snapshot = snapshot
+            self._token = token
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._token = None
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+
+def _key(path: str | Path) -> str:
+    return str(Path(path).resolve())
+
+
+def performance_repository(path: str | Path | None = None) -> PerformanceRepository:
+    key = _key(path or PERFORMANCE_CSV)
+    with _REGISTRY_LOCK:
+        repo = _REPOSITORIES.get(key)
+        if repo is None:
+            repo = PerformanceRepository(key)
+            _REPOSITORIES[key] = repo
+        return repo
+
+
+def performance_snapshot(path: str | Path | None = None) -> PerformanceSnapshot:
+    return performance_repository(path).snapshot()
+
+
+def invalidate_performance_cache(path: str | Path | None = None) -> None:
+    performance_repository(path).invalidate()
@@ -0,0 +1,237 @@
+"""
+Month-partitioned storage for Performance_sum.
+
+Once created, ``<stem>_store/`` next to ``PERFORMANCE_CSV`` is the source of
+truth for the performance dataset; the path of the CSV stays the logical name
+(locks, rollups and caches still key on it). The store holds:
+
+- one CSV per trading-timezone month of EnteredAt, named
+  ``YYYY-MM.<generation>.csv`` and never rewritten in place;
+- ``trade_index.tsv``, an append-only ``trade_id<TAB>month`` log (last entry
+  wins) used to find the partition of a trade without reading the others;
+- ``manifest.json`` listing the live partition files and the valid length of
+  the index. It is replaced atomically and is the commit point of a write.
+
+A write only re-creates the months it touches, appends index entries for new
+or moved trades and swaps the manifest. Readers take one manifest and read
+the files it names, so they never see a half-applied upsert; files from
+older generations are removed after the following write. The first write
+migrates a legacy single-file CSV (renamed to ``*.migrated``).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.settings import PERFORMANCE_CSV, TIMEZONE
+from dashboard.services.utils.persistence import atomic_write_csv, atomic_write_json
+from dashboard.services.utils.trade_enrichment import ensure_trade_id
+
+log = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+INDEX_NAME = "trade_index.tsv"
+UNDATED_MONTH = "undated"
+_PARTITION_FILE = re.compile(r"^(\d{4}-\d{2}|undated)\.\d+\.csv$")
+_READ_ATTEMPTS = 3
+
+_INDEX_LOCK = threading.Lock()
+_INDEX_CACHE: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
+
+
+def store_dir(csv_path: str | Path | None = None) -> Path:
+    path = Path(csv_path or PERFORMANCE_CSV)
+    return path.with_name(f"{path.stem}_store")
+
+
+def manifest_path(csv_path: str | Path | None = None) -> Path:
+    return store_dir(csv_path) / MANIFEST_NAME
+
+
+def read_manifest(csv_path: str | Path | None = None) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path(csv_path), "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("format") != STORE_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def source_path(csv_path: str | Path | None = None) -> Path:
+    """The file whose stat identifies the current dataset: the manifest, or the legacy CSV."""
+    manifest = manifest_path(csv_path)
+    return manifest if manifest.exists() else Path(csv_path or PERFORMANCE_CSV)
+
+
+def performance_exists(csv_path: str | Path | None = None) -> bool:
+    return source_path(csv_path).exists()
+
+
+def partition_months(df: pd.DataFrame) -> np.ndarray:
+    """``YYYY-MM`` of each row's EnteredAt in the trading timezone (the YearMonth column's month)."""
+    if df.empty:
+        return np.array([], dtype=object)
+    if "EnteredAt" not in df.columns:
+        return np.full(len(df), UNDATED_MONTH, dtype=object)
+    entered = pd.to_datetime(df["EnteredAt"], utc=True, errors="coerce").dt.tz_convert(TIMEZONE)
+    return entered.dt.strftime("%Y-%m").fillna(UNDATED_MONTH).to_numpy(dtype=object)
+
+
+def _read_partitions(root: Path, manifest: Dict[str, Any], months: Optional[Iterable[str]]) -> Tuple[pd.DataFrame, np.ndarray]:
+    partitions = manifest.get("partitions", {})
+    keys = sorted(partitions) if months is None else sorted(set(months).intersection(partitions))
+    frames = [pd.read_csv(root / partitions[key]["file"]) for key in keys]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=manifest.get("columns", [])), np.array([], dtype=object)
+    labels = np.concatenate([np.full(len(frame), key, dtype=object) for key, frame in zip(keys, frames)])
+    return pd.concat(frames, ignore_index=True), labels
+
+
+def read_store(csv_path: str | Path | None = None, months: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Rows of ``months`` (default: all) in month order, and the partition month of each row.
+    Retries when a concurrent write removed a file between reading the manifest and the partitions.
+    """
+    root = store_dir(csv_path)
+    for attempt in range(_READ_ATTEMPTS):
+        manifest = read_manifest(csv_path)
+        if manifest is None:
+            raise FileNotFoundError("performance data not found")
+        try:
+            return _read_partitions(root, manifest, months)
+        except FileNotFoundError:
+            if attempt == _READ_ATTEMPTS - 1:
+                raise
+    raise FileNotFoundError("performance data not found")
+
+
+def read_performance(csv_path: str | Path | None = None) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+    """The whole dataset and its partition months (None when it still lives in a single CSV)."""
+    if manifest_path(csv_path).exists():
+        return read_store(csv_path)
+    return pd.read_csv(csv_path or PERFORMANCE_CSV), None
+
+
+def trade_index(csv_path: str | Path | None = None, manifest: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    """``trade_id -> month`` as of ``manifest``. Only the part of the log appended since the last call is read."""
+    manifest = manifest if manifest is not None else read_manifest(csv_path)
+    length = int((manifest or {}).get("index_bytes", 0))
+    path = store_dir(csv_path) / INDEX_NAME
+    if length <= 0:
+        return {}
+    key = str(path.resolve())
+    with _INDEX_LOCK:
+        inode = os.stat(path).st_ino
+        cached = _INDEX_CACHE.get(key)
+        if cached is None or cached[0] != inode or cached[1] > length:
+            cached = (inode, 0, {})
+        _, offset, index = cached
+        if offset < length:
+            with open(path, "rb") as fh:
+                fh.seek(offset)
+                tail = fh.read(length - offset)
+            entries = pd.read_csv(io.BytesIO(tail), sep="\t", header=None, names=["trade_id", "month"], dtype=str, keep_default_na=False)
+            index = dict(index)
+            index.update(zip(entries["trade_id"], entries["month"]))
+        _INDEX_CACHE[key] = (inode, length, index)
+        return index
+
+
+def _append_index(path: Path, valid_bytes: int, entries: Mapping[str, str]) -> int:
+    """Append ``entries`` after the first ``valid_bytes`` (dropping a tail left by an interrupted write)."""
+    lines = "".join(f"{trade_id}\t{month}\n" for trade_id, month in entries.items()).encode("utf-8")
+    with open(path, "a+b") as fh:
+        fh.truncate(valid_bytes)
+        fh.seek(valid_bytes)
+        fh.write(lines)
+        fh.flush()
+        os.fsync(fh.fileno())
+    return valid_bytes + len(lines)
+
+
+def write_months(
+    parts: Mapping[str, pd.DataFrame], csv_path: str | Path | None = None, columns: Optional[list[str]] = None
+) -> Dict[str, Any]:
+    """
+    Replace the given month partitions (an empty frame drops the month) and commit a new
+    manifest. Callers hold ``advisory_file_lock(PERFORMANCE_CSV)``.
+    """
+    root = store_dir(csv_path)
+    root.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(csv_path) or {"format": STORE_FORMAT_VERSION, "generation": 0, "partitions": {}, "index_bytes": 0}
+    generation = int(previous.get("generation", 0)) + 1
+    partitions = dict(previous.get("partitions", {}))
+    index = trade_index(csv_path, previous)
+    additions: Dict[str, str] = {}
+    columns = list(columns if columns is not None else previous.get("columns", []))
+    for month, frame in sorted(parts.items()):
+        if frame.empty:
+            partitions.pop(month, None)
+            continue
+        name = f"{month}.{generation:06d}.csv"
+        atomic_write_csv(frame, root / name)
+        partitions[month] = {"file": name, "rows": int(len(frame))}
+        columns = [str(col) for col in frame.columns]
+        for trade_id in frame["trade_id"].astype(str):
+            if index.get(trade_id) != month:
+                additions[trade_id] = month
+    index_bytes = int(previous.get("index_bytes", 0))
+    if additions:
+        index_bytes = _append_index(root / INDEX_NAME, index_bytes, additions)
+    manifest = {
+        "format": STORE_FORMAT_VERSION,
+        "generation": generation,
+        "partitions": partitions,
+        "index_bytes": index_bytes,
+        "columns": columns,
+        "rows": int(sum(part["rows"] for part in partitions.values())),
+    }
+    atomic_write_json(manifest, root / MANIFEST_NAME)
+    _remove_stale_files(root, manifest, previous)
+    return manifest
+
+
+def _remove_stale_files(root: Path, manifest: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    # Files of the previous generation stay until the next write for readers still holding it.
+    live = {part["file"] for part in manifest["partitions"].values()}
+    live.update(part["file"] for part in previous.get("partitions", {}).values())
+    for path in root.iterdir():
+        if _PARTITION_FILE.match(path.name) and path.name not in live:
+            try:
+                path.unlink()
+            except OSError as exc:
+                log.warning("Could not remove stale performance partition %s: %s", path, exc)
+
+
+def split_months(df: pd.DataFrame, months: Optional[np.ndarray] = None) -> Dict[str, pd.DataFrame]:
+    months = partition_months(df) if months is None else months
+    return {str(month): df[months == month].reset_index(drop=True) for month in pd.unique(months)}
+
+
+def ensure_store(csv_path: str | Path | None = None) -> Dict[str, Any]:
+    """Manifest of the store, migrating the legacy single-file CSV on first use. Callers hold the lock."""
+    manifest = read_manifest(csv_path)
+    if manifest is not None:
+        return manifest
+    legacy = Path(csv_path or PERFORMANCE_CSV)
+    df = pd.read_csv(legacy) if legacy.exists() else pd.DataFrame()
+    df = ensure_trade_id(df) if not df.empty else df
+    manifest = write_months(split_months(df) if not df.empty else {}, csv_path, columns=[str(col) for col in df.columns])
+    if legacy.exists():
+        legacy.replace(legacy.with_name(f"{legacy.name}.migrated"))
+        log.info("Migrated %s (%d rows) to %s", legacy, len(df), store_dir(csv_path))
+    return manifest
@@ -0,0 +1,133 @@
+"""
+Server-side chart timeframes for the 5m future bars.
+
+``resample_bars`` follows the frontend's ``resampleCandles`` (web/lib/timeframes.ts):
+
+- ``5m`` returns the bars unchanged.
+- ``15m``/``30m``/``1h``/``4h`` bucket sequentially: the base interval is the
+  median positive gap, each bucket holds ``round(target / base)`` bars and a
+  gap over 1.5x the base starts a new bucket, so buckets are anchored to the
+  session open rather than the clock. The bucket time is its first bar's time.
+- ``1d``/``1w`` bucket by UTC midnight / UTC Monday 00:00.
+
+Open is the first bar, close the last, high/low the extremes and volume the
+sum (missing volume counts as 0).
+
+``resampled_bars`` resamples the requested range in one pass, as the browser
+does with the bars it loaded, and keeps the result in the shared bar cache
+under ``(symbol file, timeframe, start, end)``. Splitting the range (e.g. per
+day) would restart sequential buckets at every split.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.settings import TIMEZONE
+from dashboard.services.data.bar_cache import BAR_CACHE
+from dashboard.services.data.bar_store import read_bars
+
+_MINUTE_NS = 60 * 1_000_000_000
+_DAY_NS = 24 * 60 * _MINUTE_NS
+TIMEFRAME_NS: Dict[str, int] = {
+    "5m": 5 * _MINUTE_NS,
+    "15m": 15 * _MINUTE_NS,
+    "30m": 30 * _MINUTE_NS,
+    "1h": 60 * _MINUTE_NS,
+    "4h": 4 * 60 * _MINUTE_NS,
+    "1d": _DAY_NS,
+    "1w": 7 * _DAY_NS,
+}
+SEQUENTIAL_TIMEFRAMES = {"15m", "30m", "1h", "4h"}
+DEFAULT_TIMEFRAME = "5m"
+BAR_COLUMNS = ["Datetime", "Open", "High", "Low", "Close", "Volume"]
+
+
+def parse_timeframe(raw: Optional[str]) -> str:
+    timeframe = str(raw or DEFAULT_TIMEFRAME).strip().lower()
+    if timeframe not in TIMEFRAME_NS:
+        raise ValueError(f"timeframe must be one of {', '.join(TIMEFRAME_NS)}")
+    return timeframe
+
+
+def _sequential_starts(ns: np.ndarray, target_ns: int) -> np.ndarray:
+    diffs = np.diff(ns)
+    positive = np.sort(diffs[diffs > 0])
+    base = int(positive[positive.size // 2]) if positive.size else TIMEFRAME_NS["5m"]
+    per_bucket = max(1, int(np.floor(target_ns / base + 0.5)))
+    run_break = np.concatenate(([True], diffs > base * 1.5))
+    run_starts = np.flatnonzero(run_break)
+    position = np.arange(ns.size) - run_starts[np.cumsum(run_break) - 1]
+    return np.flatnonzero(run_break | (position % per_bucket == 0))
+
+
+def _calendar_keys(ns: np.ndarray, timeframe: str) -> np.ndarray:
+    days = ns // _DAY_NS
+    if timeframe == "1w":
+        days = days - (days + 3) % 7  # 1970-01-01 was a Thursday; Monday=0
+    return days * _DAY_NS
+
+
+def resample_bars(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Bucket ``df`` (tz-aware ``Datetime`` plus OHLC[V]) into ``timeframe`` bars, in time order."""
+    if timeframe not in TIMEFRAME_NS:
+        raise ValueError(f"timeframe must be one of {', '.join(TIMEFRAME_NS)}")
+    if timeframe == DEFAULT_TIMEFRAME:
+        return df
+    utc = pd.to_datetime(df["Datetime"], utc=True)
+    tz = getattr(df["Datetime"].dtype, "tz", None) or "UTC"
+    if df.empty:
+        empty: Dict[str, Any] = {col: np.array([], dtype="float64") for col in BAR_COLUMNS[1:]}
+        return pd.DataFrame({"Datetime": utc.dt.tz_convert(tz), **empty})[BAR_COLUMNS]
+
+    ns = utc.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").view("int64")
+    order = np.argsort(ns, kind="stable")
+    ns = ns[order]
+    if timeframe in SEQUENTIAL_TIMEFRAMES:
+        starts = _sequential_starts(ns, TIMEFRAME_NS[timeframe])
+        times = ns[starts]
+    else:
+        keys = _calendar_keys(ns, timeframe)
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        times = keys[starts]
+    ends = np.concatenate((starts[1:], [ns.size])) - 1
+
+    def column(name: str) -> np.ndarray:
+        return df[name].to_numpy(dtype="float64")[order]
+
+    volume = column("Volume") if "Volume" in df.columns else np.zeros(ns.size)
+    return pd.DataFrame(
+        {
+            "Datetime": pd.DatetimeIndex(times.view("datetime64[ns]")).tz_localize("UTC").tz_convert(tz),
+            "Open": column("Open")[starts],
+            "High": np.maximum.reduceat(column("High"), starts),
+            "Low": np.minimum.reduceat(column("Low"), starts),
+            "Close": column("Close")[ends],
+            "Volume": np.add.reduceat(np.nan_to_num(volume, nan=0.0), starts),
+        }
+    )
+
+
+def resampled_bars(
+    csv_path: str | Path,
+    timeframe: str,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    tz_name: str = TIMEZONE,
+) -> pd.DataFrame:
+    """``read_bars`` for ``[start, end]`` resampled to ``timeframe``, cached per range."""
+    bars = read_bars(csv_path, start, end, TIMEZONE)
+    if timeframe == DEFAULT_TIMEFRAME or bars.empty:
+        out = resample_bars(bars, timeframe)
+    else:
+        bounds = tuple(None if ts is None else pd.Timestamp(ts).isoformat() for ts in (start, end))
+        tag = ("resample", timeframe) + bounds
+        # Copied: callers get a frame of their own, the cached one stays as built.
+        out = BAR_CACHE.fetch(BAR_CACHE.key_for(csv_path) + tag, lambda: resample_bars(bars, timeframe)).copy()
+    if tz_name != TIMEZONE:
+        out["Datetime"] = out["Datetime"].dt.tz_convert(tz_name)
+    return out
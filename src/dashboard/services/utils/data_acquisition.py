@@ -18,6 +18,8 @@ from dashboard.config.settings import (
     CMEHolidayCalendar,
     get_last_business_day,
 )
+from dashboard.services.data.bar_store import append_bars
+from dashboard.services.data.day_index import ensure_day_index
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +36,47 @@ def _resolve_rate_limit_cooldown_minutes() -> int:
 RATE_LIMIT_COOLDOWN_MINUTES = _resolve_rate_limit_cooldown_minutes()
 RATE_LIMIT_UNTIL_FILE = Path(os.environ.get("YF_RATE_LIMIT_UNTIL_FILE", "/app/log/.yf_rate_limited_until"))
 
+TAIL_READ_BYTES = 8192
+
+
+def _read_tail_last_date(csv_path, tail_bytes=TAIL_READ_BYTES):
+    """
+    Date (UTC) of the latest timestamp among the complete rows in the last
+    ``tail_bytes`` of the file. Returns None for a header-only file and raises
+    ValueError when the header or tail rows do not look like a future CSV.
+    """
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(len(header), size - tail_bytes)
+        f.seek(start)
+        chunk = f.read(size - start)
+    if header.split(b',', 1)[0].strip().strip(b'"') != b'Datetime':
+        raise ValueError("Datetime is not the first column")
+    lines = chunk.splitlines()
+    if start > len(header) and lines:
+        lines = lines[1:]  # first line may be cut mid-row
+    stamps = [line.split(b',', 1)[0].strip().decode('utf-8', errors='replace') for line in lines if line.strip()]
+    if not stamps:
+        if start > len(header):
+            raise ValueError("no complete row in file tail")
+        return None
+    dt = pd.to_datetime(pd.Series(stamps), format='%Y-%m-%d %H:%M:%S%z', utc=True, errors='coerce')
+    if dt.isna().any():
+        raise ValueError("malformed timestamp in file tail")
+    return dt.max().date()
+
+
 def get_last_row_date(csv_path):
     """Helper function to read the last row of the CSV and extract the date."""
+    try:
+        return _read_tail_last_date(csv_path)
+    except FileNotFoundError as e:
+        logger.error(f"Error reading last row of {csv_path}: {e}")
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Tail read of {csv_path} failed ({e}); parsing full file.")
     try:
         df = pd.read_csv(csv_path, parse_dates=['Datetime'], date_format='%Y-%m-%d %H:%M:%S%z')
         if df.empty or 'Datetime' not in df:
@@ -48,6 +89,16 @@ def get_last_row_date(csv_path):
         logger.error(f"Error reading last row of {csv_path}: {e}")
         return None
 
+
+def _csv_has_rows(csv_path):
+    """True when the CSV has at least one non-empty line after its header."""
+    with open(csv_path, 'rb') as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                return True
+    return False
+
 def is_date_in_csv(csv_path, target_date):
     """Check if the target date exists by comparing with the last row's date."""
     last_date = get_last_row_date(csv_path)
@@ -452,7 +503,11 @@ def acquire_missing_data(max_retries=5, retry_delay=300, fallback_source=None):
                         validated_df.index = validated_df.index.strftime('%Y-%m-%d %H:%M:%S%z').str.replace(r'(\d{2})(\d{2})$', r'\1:\2', regex=True)
 
                         # Write to CSV, appending contiguously for gap days
-                        if not Path(csv_path).exists() or pd.read_csv(csv_path).empty:
+                        previous_stat = None
+                        if Path(csv_path).exists():
+                            st = os.stat(csv_path)
+                            previous_stat = {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+                        if not Path(csv_path).exists() or not _csv_has_rows(csv_path):
                             validated_df.to_csv(csv_path, index_label='Datetime')
                         else:
                             # Ensure file ends with a newline before appending
@@ -463,6 +518,11 @@ def acquire_missing_data(max_retries=5, retry_delay=300, fallback_source=None):
                             # Append data without extra newline
                             with open(csv_path, 'a', newline='') as f:
                                 validated_df.to_csv(f, header=False, index_label='Datetime')
+                        try:
+                            append_bars(csv_path, validated_df.rename_axis("Datetime").reset_index(), previous_stat)
+                            ensure_day_index(csv_path)
+                        except (OSError, ValueError) as e:
+                            logger.warning(f"Bar store/day index update failed for {csv_path}; they will be rebuilt on next read: {e}")
                         logger.info(f"Data for {ticker} on {day} validated and saved to {csv_path}")
                         day_saved = True
                         break
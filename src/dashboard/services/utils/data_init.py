@@ -17,6 +17,8 @@ from dashboard.config.settings import (
     TRADE_SUM_CSV,
 )
 
+from dashboard.services.data.performance_store import performance_exists
+
 log = logging.getLogger(__name__)
 
 
@@ -135,6 +137,8 @@ def ensure_required_csvs() -> list[str]:
         path = Path(raw_path)
         if path.exists():
             continue
+        if raw_path == PERFORMANCE_CSV and performance_exists(PERFORMANCE_CSV):
+            continue  # migrated to the partitioned performance store
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
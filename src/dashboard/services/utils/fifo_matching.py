@@ -0,0 +1,338 @@
+"""
+Quantity-aware FIFO matching of broker fills into round trips.
+
+Per symbol, the n-th bought contract closes against the n-th sold contract.
+Instead of exploding fills into single-contract queue entries, each side's
+fills are laid out on a cumulative-quantity axis and the two interval lists
+are joined: every overlap is one *segment* of ``Quantity`` identical
+contract-level round trips (same buy fill, same sell fill). Round trips are
+built per segment and only expanded to contracts where the output is
+per contract (execution legs) or where sums must match a per-contract sum.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+logger = logging.getLogger(__name__)
+
+GROUP_KEYS = ['EnteredAt', 'ExitedAt', 'ContractName', 'Type', 'EntryPrice', 'ExitPrice']
+LEG_COLUMNS = [
+    'raw_fill_id', 'Id', 'TradeDay', 'ContractName', 'Time', 'Qty', 'Price', 'Fee', 'LegRole',
+    'EnteredAt', 'ExitedAt', 'EntryPrice', 'ExitPrice', 'Type',
+]
+
+
+def _prepare_fills(df: pd.DataFrame, sort_kind: str = 'quicksort') -> pd.DataFrame:
+    df['Date/Time'] = pd.to_datetime(df['Date/Time'], format='%Y%m%d;%H%M%S')
+    df['Date/Time'] = df['Date/Time'].dt.tz_localize(pytz.timezone('America/New_York'))
+    df = df.sort_values('Date/Time', kind=sort_kind).reset_index(drop=True)
+    df['TotalFee'] = (
+        df['BrokerExecutionCommission'].abs()
+        + df['ThirdPartyExecutionCommission'].abs()
+        + df['ThirdPartyRegulatoryCommission'].abs()
+    )
+    # Per contract of the traded (integer) quantity; flat rows get inf but are never matched.
+    df['FeePerUnit'] = df['TotalFee'] / df['Quantity'].astype(int).abs()
+    # Position in the time-sorted export and contracts of the fill already matched,
+    # both used in execution-leg fill ids.
+    df['RowId'] = np.arange(len(df))
+    df['UnitBase'] = 0
+    return df
+
+
+def load_broker_fills(file_path) -> pd.DataFrame:
+    """Broker fill export sorted by fill time, with ``TotalFee`` and ``FeePerUnit`` per fill."""
+    return _prepare_fills(pd.read_csv(file_path))
+
+
+def iter_fill_batches(file_path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Time-sorted fill batches of a time-ordered export, read ``chunksize`` rows at a time.
+    Fills sharing the last timestamp of a chunk are held for the next batch, so a batch
+    always has every fill of its timestamps. Raises ValueError if the export goes back in time.
+    """
+    held = None
+    last_time = None
+    row_base = 0
+    for raw in pd.read_csv(file_path, chunksize=chunksize):
+        chunk = _prepare_fills(raw, sort_kind='stable')
+        if chunk.empty:
+            continue
+        if last_time is not None and chunk['Date/Time'].iloc[0] < last_time:
+            raise ValueError(f"{file_path} is not in time order; import it without streaming")
+        last_time = chunk['Date/Time'].iloc[-1]
+        if held is not None:
+            chunk = pd.concat([held, chunk], ignore_index=True)
+        chunk['RowId'] = row_base + np.arange(len(chunk))
+        tail = (chunk['Date/Time'] == last_time).to_numpy()
+        held = chunk[tail].reset_index(drop=True)
+        row_base += int((~tail).sum())
+        if not tail.all():
+            yield chunk[~tail].reset_index(drop=True)
+    if held is not None and not held.empty:
+        yield held
+
+
+def match_fills(fills: pd.DataFrame) -> pd.DataFrame:
+    """
+    FIFO segments, in per-symbol contract order: ``BuyRow``/``SellRow`` are fill positions,
+    ``BuyUnit``/``SellUnit`` the first matched contract within each fill.
+    """
+    qty = fills['Quantity'].to_numpy().astype(int)
+    symbols = fills['Symbol'].to_numpy()
+    parts = []
+    for symbol in fills['Symbol'].unique():
+        rows = np.flatnonzero(symbols == symbol)
+        buys, sells = rows[qty[rows] > 0], rows[qty[rows] < 0]
+        buy_end, sell_end = np.cumsum(qty[buys]), np.cumsum(-qty[sells])
+        matched = min(buy_end[-1] if len(buys) else 0, sell_end[-1] if len(sells) else 0)
+        if matched == 0:
+            continue
+        # Breakpoints of both interval lists; each gap between them is one segment.
+        edges = np.union1d(np.r_[0, buy_end[buy_end < matched], sell_end[sell_end < matched]], [matched])
+        lo, size = edges[:-1], np.diff(edges)
+        b = np.searchsorted(buy_end, lo, side='right')
+        s = np.searchsorted(sell_end, lo, side='right')
+        parts.append(
+            pd.DataFrame(
+                {
+                    'Symbol': symbol,
+                    'BuyRow': buys[b],
+                    'SellRow': sells[s],
+                    'Quantity': size,
+                    'BuyUnit': lo - (buy_end[b] - qty[buys[b]]),
+                    'SellUnit': lo - (sell_end[s] + qty[sells[s]]),
+                }
+            )
+        )
+    if not parts:
+        return pd.DataFrame(columns=['Symbol', 'BuyRow', 'SellRow', 'Quantity', 'BuyUnit', 'SellUnit'])
+    return pd.concat(parts, ignore_index=True)
+
+
+def open_inventory(fills: pd.DataFrame, segments: pd.DataFrame) -> pd.DataFrame:
+    """Fills with contracts left after ``segments``, ``Quantity`` reduced to the open remainder."""
+    qty = fills['Quantity'].to_numpy().astype(int)
+    consumed = np.zeros(len(fills), dtype=np.int64)
+    if not segments.empty:
+        size = segments['Quantity'].to_numpy().astype(np.int64)
+        consumed += np.bincount(segments['BuyRow'].to_numpy().astype(np.int64), weights=size, minlength=len(fills)).astype(np.int64)
+        consumed += np.bincount(segments['SellRow'].to_numpy().astype(np.int64), weights=size, minlength=len(fills)).astype(np.int64)
+    left = np.abs(qty) - consumed
+    keep = left > 0
+    out = fills[keep].copy()
+    out['Quantity'] = np.sign(qty[keep]) * left[keep]
+    out['UnitBase'] = out['UnitBase'].to_numpy() + consumed[keep]
+    return out.reset_index(drop=True)
+
+
+def log_unmatched(inventory: pd.DataFrame) -> None:
+    for symbol in inventory['Symbol'].unique():
+        rows = inventory[inventory['Symbol'] == symbol]
+        for side, side_rows in (('BUY', rows[rows['Quantity'] > 0]), ('SELL', rows[rows['Quantity'] < 0])):
+            if side_rows.empty:
+                continue
+            logger.warning("Unmatched %s fills for symbol %s:", side, symbol)
+            for _, fill in side_rows.iterrows():
+                logger.warning(
+                    "  Time: %s, Price: %s, Qty: %d, Symbol: %s",
+                    fill['Date/Time'], fill['Price'], abs(int(fill['Quantity'])), fill['Symbol'],
+                )
+
+
+def _kahan_group_sums(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """Per-group sums in row order with pandas' compensated groupby summation, bit for bit."""
+    order = np.argsort(codes, kind='stable')
+    ordered = values[order]
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    starts, lengths = bounds[:-1], np.diff(bounds)
+    total = np.zeros(n_groups)
+    comp = np.zeros(n_groups)
+    for k in range(int(lengths.max()) if n_groups else 0):
+        g = np.flatnonzero(lengths > k)
+        value = ordered[starts[g] + k]
+        keep = ~np.isnan(value)
+        g, value = g[keep], value[keep]
+        y = value - comp[g]
+        t = total[g] + y
+        c = t - total[g] - y
+        # An infinite value leaves a NaN compensation; pandas resets it.
+        comp[g] = np.where(np.isnan(c), 0.0, c)
+        total[g] = t
+    return total
+
+
+def _central_time_strings(times: pd.Series) -> pd.Series:
+    """``strftime('%m/%d/%Y %H:%M:%S %z')`` in US/Central, built from the fast ISO formatter."""
+    wall = times.dt.tz_convert(pytz.timezone('US/Central')).dt.tz_localize(None)
+    iso = wall.dt.strftime('%Y-%m-%d %H:%M:%S')
+    offset_minutes = (wall - times.dt.tz_convert('UTC').dt.tz_localize(None)) // pd.Timedelta(minutes=1)
+    offset = offset_minutes.map(
+        {minutes: f"{'-' if minutes < 0 else '+'}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}" for minutes in offset_minutes.unique()}
+    )
+    stamp = iso.str[5:7] + '/' + iso.str[8:10] + '/' + iso.str[:4] + iso.str[10:] + ' ' + offset
+    return stamp.str.replace('+0300', '+03:00')
+
+
+def _duration(seconds: float) -> str:
+    days = seconds // (24 * 3600)
+    seconds %= (24 * 3600)
+    hours = seconds // 3600
+    seconds %= 3600
+    minutes = seconds // 60
+    seconds %= 60
+    return f"{int(days)} days {int(hours):02}:{int(minutes):02}:{int(seconds):02}"
+
+
+def fifo_round_trips(
+    fills: pd.DataFrame,
+    point_values: Dict[str, float],
+    source_name: Optional[str] = None,
+    float_prices: bool = False,
+    log_open: bool = True,
+) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+    """
+    ``(round_trips, segments, legs)``: round trips grouped by GROUP_KEYS (Size/PnL/Fees
+    summed over contracts, TradeDay/TradeDuration first), the segments they came from
+    with their group code, and per-contract open/close execution legs when
+    ``source_name`` (the export file name used in fill ids) is given. Fills left open
+    are logged unless ``log_open`` is False.
+    """
+    segments = match_fills(fills)
+    if log_open:
+        log_unmatched(open_inventory(fills, segments))
+    if segments.empty:
+        return pd.DataFrame(), segments, (pd.DataFrame() if source_name is not None else None)
+
+    fill_time = fills['Date/Time']
+    local = _central_time_strings(fill_time).tolist()
+    time_ns = fill_time.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy().view('int64')
+    prices = fills['Price'].astype(float).tolist() if float_prices else fills['Price'].tolist()
+    fee_per_unit = fills['FeePerUnit'].tolist()
+
+    buy_rows, sell_rows = segments['BuyRow'].to_numpy(), segments['SellRow'].to_numpy()
+    is_long = time_ns[buy_rows] <= time_ns[sell_rows]
+    open_rows = np.where(is_long, buy_rows, sell_rows)
+    close_rows = np.where(is_long, sell_rows, buy_rows)
+    seconds = (time_ns[close_rows] - time_ns[open_rows]) / 1_000_000_000
+
+    records = []
+    for symbol, b, s, long_, o, c, secs in zip(
+        segments['Symbol'].tolist(), buy_rows.tolist(), sell_rows.tolist(), is_long.tolist(),
+        open_rows.tolist(), close_rows.tolist(), seconds.tolist(),
+    ):
+        point_value = point_values[symbol]
+        entry_price, exit_price = prices[o], prices[c]
+        fees = fee_per_unit[b] + fee_per_unit[s]
+        if long_:
+            pnl = (exit_price - entry_price) * point_value - fees
+        else:
+            pnl = (entry_price - exit_price) * point_value - fees
+        records.append(
+            (
+                local[o], local[c], symbol, 'Long' if long_ else 'Short', entry_price, exit_price,
+                round(fees, 2), round(pnl, 2), local[o], _duration(secs),
+            )
+        )
+    seg = pd.DataFrame(records, columns=GROUP_KEYS + ['Fees', 'PnL', 'TradeDay', 'TradeDuration'])
+    quantity = segments['Quantity'].to_numpy()
+
+    groups = seg.groupby(GROUP_KEYS, sort=True, dropna=source_name is None)
+    codes = groups.ngroup().to_numpy()
+    grouped = groups[['TradeDay', 'TradeDuration']].first().reset_index()
+    n_groups = len(grouped)
+    in_group = codes >= 0
+    unit_codes = np.repeat(codes[in_group], quantity[in_group])
+    grouped['Size'] = np.bincount(codes[in_group], weights=quantity[in_group], minlength=n_groups).astype(np.int64)
+    for column in ('PnL', 'Fees'):
+        unit_values = np.repeat(seg[column].to_numpy(dtype=float)[in_group], quantity[in_group])
+        grouped[column] = _kahan_group_sums(unit_values, unit_codes, n_groups)
+    grouped = grouped[GROUP_KEYS + ['Size', 'PnL', 'Fees', 'TradeDay', 'TradeDuration']]
+    segments = segments.assign(Group=codes)
+
+    legs = None
+    if source_name is not None:
+        legs = _execution_legs(fills, segments, seg, is_long, open_rows, close_rows, local, fee_per_unit, source_name)
+    return grouped, segments, legs
+
+
+def _execution_legs(fills, segments, seg, is_long, open_rows, close_rows, local, fee_per_unit, source_name):
+    """Open and close leg per matched contract, interleaved in contract order."""
+    quantity = segments['Quantity'].to_numpy()
+    n_units = int(quantity.sum())
+    seg_of_unit = np.repeat(np.arange(len(segments)), quantity)
+    offset = np.arange(n_units) - np.repeat(np.cumsum(quantity) - quantity, quantity)
+    buy_unit = segments['BuyUnit'].to_numpy()[seg_of_unit] + offset
+    sell_unit = segments['SellUnit'].to_numpy()[seg_of_unit] + offset
+    long_ = is_long[seg_of_unit]
+    open_unit = np.where(long_, buy_unit, sell_unit)
+    close_unit = np.where(long_, sell_unit, buy_unit)
+    open_row, close_row = open_rows[seg_of_unit], close_rows[seg_of_unit]
+
+    row_id = fills['RowId'].to_numpy()
+    unit_base = fills['UnitBase'].to_numpy()
+
+    def _fill_ids(rows, units, is_buy):
+        prefix = pd.Series([f"{source_name}:{int(r)}:" for r in row_id[rows].tolist()])
+        return (prefix + pd.Series(unit_base[rows] + units).astype(str) + np.where(is_buy, ':B', ':S')).to_numpy()
+
+    raw_fill_id = np.empty(2 * n_units, dtype=object)
+    raw_fill_id[0::2] = _fill_ids(open_row, open_unit, long_)
+    raw_fill_id[1::2] = _fill_ids(close_row, close_unit, ~long_)
+    leg_rows = np.empty(2 * n_units, dtype=np.int64)
+    leg_rows[0::2], leg_rows[1::2] = open_row, close_row
+    qty = np.empty(2 * n_units, dtype=np.int64)
+    qty[0::2] = np.where(long_, 1, -1)
+    qty[1::2] = -qty[0::2]
+    role = np.empty(2 * n_units, dtype=object)
+    role[0::2], role[1::2] = 'open', 'close'
+    leg_seg = np.repeat(seg_of_unit, 2)
+
+    local_arr = np.asarray(local, dtype=object)
+    price = fills['Price'].astype(float).to_numpy()
+    fee = np.array([round(float(value), 6) for value in fee_per_unit])
+    legs = pd.DataFrame(
+        {
+            'raw_fill_id': raw_fill_id,
+            'Time': local_arr[leg_rows],
+            'Qty': qty,
+            'Price': price[leg_rows],
+            'Fee': fee[leg_rows],
+            'LegRole': role,
+        }
+    )
+    for column in GROUP_KEYS:
+        legs[column] = seg[column].to_numpy()[leg_seg]
+    legs['Group'] = segments['Group'].to_numpy()[leg_seg]
+    return legs
+
+
+def stream_fifo_round_trips(
+    batches: Iterable[pd.DataFrame],
+    point_values: Callable[[Iterable[str]], Dict[str, float]],
+) -> Iterator[Tuple[pd.DataFrame, pd.Timestamp]]:
+    """
+    ``(round_trips, horizon)`` per fill batch (see ``iter_fill_batches``), carrying the open
+    inventory of each symbol into the next batch. Every contract closes in the batch of
+    its later fill, and a batch holds all fills of its timestamps, so no group spans two
+    batches and each frame matches the whole-file grouping of its rows. No round trip
+    yielded later enters before ``horizon``.
+    """
+    inventory = None
+    for batch in batches:
+        fills = batch if inventory is None or inventory.empty else pd.concat([inventory, batch], ignore_index=True)
+        grouped, segments, _ = fifo_round_trips(fills, point_values(fills['Symbol'].unique()), log_open=False)
+        inventory = open_inventory(fills, segments)
+        # Later round trips open from the inventory or from fills at or after this batch's last one.
+        horizon = batch['Date/Time'].iloc[-1]
+        if not inventory.empty:
+            horizon = min(horizon, inventory['Date/Time'].min())
+        yield grouped, horizon
+    if inventory is not None:
+        log_unmatched(inventory)
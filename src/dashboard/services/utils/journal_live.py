@@ -10,6 +10,8 @@ import pandas as pd
 from dashboard.config.analysis import ANALYSIS_TIMEZONE
 from dashboard.config.app_config import get_app_config
 from dashboard.config.settings import JOURNAL_LIVE_CSV, JOURNAL_ADJUSTMENTS_CSV, JOURNAL_MATCHES_CSV, CONTRACT_SPECS_CSV, PERFORMANCE_CSV, DAY_PLAN_CSV
+from dashboard.services.data.performance_repository import performance_snapshot
+from dashboard.services.data.performance_store import performance_exists
 from dashboard.services.utils.persistence import advisory_file_lock, atomic_write_csv, append_audit_event
 from dashboard.services.utils.trade_enrichment import ensure_trade_id
 
@@ -955,8 +957,7 @@ def confirm_matches(
     adjustment_rows = load_journal_adjustments().to_dict(orient="records")
     point_values = _load_point_values()
     if performance_rows is None:
-        perf_df = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV)) if pd.io.common.file_exists(PERFORMANCE_CSV) else pd.DataFrame()
-        perf_rows = perf_df.to_dict(orient="records")
+        perf_rows = performance_snapshot(PERFORMANCE_CSV).records() if performance_exists(PERFORMANCE_CSV) else []
     else:
         perf_rows = ensure_trade_id(pd.DataFrame(performance_rows)).to_dict(orient="records")
 
@@ -1141,8 +1142,7 @@ def reconfirm_match(
     adjustment_rows = load_journal_adjustments().to_dict(orient="records")
     point_values = _load_point_values()
     if performance_rows is None:
-        perf_df = ensure_trade_id(pd.read_csv(PERFORMANCE_CSV)) if pd.io.common.file_exists(PERFORMANCE_CSV) else pd.DataFrame()
-        perf_rows = perf_df.to_dict(orient="records")
+        perf_rows = performance_snapshot(PERFORMANCE_CSV).records() if performance_exists(PERFORMANCE_CSV) else []
     else:
         perf_rows = ensure_trade_id(pd.DataFrame(performance_rows)).to_dict(orient="records")
     for _, row in check.iterrows():
@@ -0,0 +1,92 @@
+"""
+Bounded process pool for parsing independent broker exports.
+
+Each uploaded file is parsed and FIFO-matched on its own, so a batch of files
+can be spread over worker processes and only the merge afterwards has to run
+once. Workers are spawned (not forked from a threaded server) and re-read
+config and contract specs themselves; results come back in input order with
+per-file errors instead of exceptions.
+
+Spawning costs a fresh interpreter importing pandas and the app per worker,
+more than parsing a few monthly statements takes, so a batch smaller than
+``performance_import.parallel_min_mb`` in total (or a single file, or a pool
+size of one) is parsed in-process. The pool lives for one call only. Every
+gunicorn worker can run its own pool, so up to ``WORKERS * parse_workers``
+parser processes may run at once.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from dashboard.config.app_config import get_app_config
+
+FileResult = Tuple[str, Any, Optional[BaseException]]
+
+
+def parse_workers() -> int:
+    cfg = get_app_config().get("performance_import", {})
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    default = min(4, cpus)
+    try:
+        workers = int(cfg.get("parse_workers", default))
+    except (TypeError, ValueError):
+        workers = default
+    return max(1, workers)
+
+
+def parallel_min_bytes() -> int:
+    cfg = get_app_config().get("performance_import", {})
+    try:
+        min_mb = float(cfg.get("parallel_min_mb", 8))
+    except (TypeError, ValueError):
+        min_mb = 8.0
+    return max(0, int(min_mb * 1024 * 1024))
+
+
+def _total_size(paths: Sequence[str]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            continue
+    return total
+
+
+def map_files(
+    fn: Callable[..., Any],
+    paths: Sequence[str],
+    *args: Any,
+    max_workers: int | None = None,
+    min_parallel_bytes: int | None = None,
+) -> List[FileResult]:
+    """
+    ``[(path, fn(path, *args), None) | (path, None, error)]`` in the order of ``paths``.
+    ``fn`` must be a module-level function so it can be sent to a worker.
+    """
+    paths = [str(path) for path in paths]
+    workers = min(len(paths), max_workers or parse_workers())
+    min_bytes = parallel_min_bytes() if min_parallel_bytes is None else min_parallel_bytes
+    if workers <= 1 or _total_size(paths) < min_bytes:
+        return [_call(fn, path, args) for path in paths]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(fn, path, *args) for path in paths]
+        results: List[FileResult] = []
+        for path, future in zip(paths, futures):
+            try:
+                results.append((path, future.result(), None))
+            except Exception as exc:
+                results.append((path, None, exc))
+    return results
+
+
+def _call(fn: Callable[..., Any], path: str, args: tuple) -> FileResult:
+    try:
+        return path, fn(path, *args), None
+    except Exception as exc:
+        return path, None, exc
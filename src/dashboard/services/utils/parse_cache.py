@@ -0,0 +1,156 @@
+"""
+On-disk cache of parsed broker exports, keyed by content.
+
+Users often re-upload overlapping statements. An entry is keyed by the SHA-256
+of the raw upload bytes, the contract-specs file (point values change PnL),
+the kind of parse and CACHE_FORMAT_VERSION, so an identical file skips the
+read, the diagnostics and the FIFO pass entirely. Entries are ``<key>.npz``
+files under ``TEMP_PERF_DIR/.parse_cache`` holding one array per column
+(strings as codes into their distinct values, no pickles). Hits touch the
+entry; after each store, entries older than
+``performance_import.parse_cache_max_age_days`` are dropped, then the least
+recently used ones until the directory fits in
+``performance_import.parse_cache_max_mb`` (0 disables the cache).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.config.app_config import get_app_config
+from dashboard.config.env import TEMP_PERF_DIR
+
+CACHE_FORMAT_VERSION = 1
+CACHE_DIR = Path(TEMP_PERF_DIR) / ".parse_cache"
+FILL_ID_COLUMN = "raw_fill_id"
+
+
+def cache_limits() -> Tuple[int, float]:
+    """``(max_bytes, max_age_seconds)`` from app config."""
+    cfg = get_app_config().get("performance_import", {})
+    try:
+        max_mb = float(cfg.get("parse_cache_max_mb", 64))
+        max_age_days = float(cfg.get("parse_cache_max_age_days", 30))
+    except (TypeError, ValueError):
+        max_mb, max_age_days = 64.0, 30.0
+    return max(0, int(max_mb * 1024 * 1024)), max(0.0, max_age_days * 86400)
+
+
+def _file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(path: str | Path, kind: str, specs_path: str | Path) -> str:
+    specs = _file_sha256(specs_path) if Path(specs_path).exists() else "no-specs"
+    payload = f"{CACHE_FORMAT_VERSION}|{kind}|{_file_sha256(path)}|{specs}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.npz"
+
+
+def _frame_arrays(prefix: str, df: pd.DataFrame, source_name: Optional[str]) -> Optional[Dict[str, np.ndarray]]:
+    arrays = {f"{prefix}/__columns__": np.array([str(c) for c in df.columns], dtype=str)}
+    for col in df.columns:
+        values = df[col]
+        if values.dtype != object:
+            arrays[f"{prefix}/{col}"] = values.to_numpy()
+            continue
+        if not values.map(lambda v: isinstance(v, str)).all():
+            return None
+        if col == FILL_ID_COLUMN and source_name is not None:
+            # Fill ids embed the (per-upload) file name; store them without it.
+            values = values.str.slice(len(source_name) + 1)
+        # Strings as codes into their distinct values: compact, and cheap to rebuild.
+        codes, uniques = pd.factorize(values)
+        arrays[f"{prefix}/{col}@codes"] = codes.astype(np.int32)
+        arrays[f"{prefix}/{col}@values"] = np.asarray(uniques, dtype=str)
+    return arrays
+
+
+def _arrays_frame(prefix: str, data, source_name: Optional[str]) -> pd.DataFrame:
+    columns = [str(c) for c in data[f"{prefix}/__columns__"]]
+    names = set(data.files)
+    out: Dict[str, object] = {}
+    for col in columns:
+        if f"{prefix}/{col}" in names:
+            out[col] = data[f"{prefix}/{col}"]
+            continue
+        uniques = data[f"{prefix}/{col}@values"].astype(object)
+        if col == FILL_ID_COLUMN and source_name is not None:
+            uniques = np.array([f"{source_name}:{v}" for v in uniques], dtype=object)
+        out[col] = uniques[data[f"{prefix}/{col}@codes"]]
+    return pd.DataFrame(out, columns=columns)
+
+
+def load(key: str, source_name: Optional[str] = None) -> Optional[Tuple[pd.DataFrame, ...]]:
+    """Cached frames for ``key`` (fill ids re-prefixed with ``source_name``), or None on a miss."""
+    path = _entry_path(key)
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            count = int(data["__frames__"])
+            frames = tuple(_arrays_frame(str(i), data, source_name) for i in range(count))
+        os.utime(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return frames
+
+
+def store(key: str, frames: Sequence[pd.DataFrame], source_name: Optional[str] = None) -> bool:
+    """Write an entry (skipped when disabled or a column is not plain strings/numbers), then evict."""
+    max_bytes, max_age = cache_limits()
+    if max_bytes <= 0:
+        return False
+    arrays: Dict[str, np.ndarray] = {"__frames__": np.array(len(frames))}
+    for i, df in enumerate(frames):
+        part = _frame_arrays(str(i), df, source_name)
+        if part is None:
+            return False
+        arrays.update(part)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    target = _entry_path(key)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(CACHE_DIR))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez_compressed(fh, **arrays)
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    evict(max_bytes, max_age)
+    return True
+
+
+def evict(max_bytes: int, max_age_seconds: float, now: Optional[float] = None) -> int:
+    """Drop entries older than ``max_age_seconds``, then least recently used ones over ``max_bytes``."""
+    now = time.time() if now is None else now
+    entries = []
+    for path in CACHE_DIR.glob("*.npz"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    entries.sort(key=lambda entry: entry[0])
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if now - mtime <= max_age_seconds and total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
@@ -3,20 +3,39 @@ import logging
 import os
 import re
 import time
-from collections import deque
 from datetime import timedelta, time as dt_time
 from pathlib import Path
 import pandas as pd
-import pytz
 import yfinance as yf
 
 from dashboard.config.analysis import ANALYSIS_TIMEZONE
 from dashboard.config.app_config import get_app_config
 from dashboard.config.settings import PERFORMANCE_DIR, TIMEZONE, PERFORMANCE_CSV, CONTRACT_SPECS_CSV
 from dashboard.config.env import TEMP_PERF_DIR
+from dashboard.services.analysis.daily_rollup import rollup_is_current, sync_daily_rollup
+from dashboard.services.analysis.running_metrics import sync_running_state
+from dashboard.services.data.performance_repository import performance_repository
+from dashboard.services.data.performance_store import (
+    ensure_store,
+    partition_months,
+    read_store,
+    split_months,
+    trade_index,
+    write_months,
+)
 from dashboard.services.portfolio import sync_trade_sum_from_performance_rows
-from dashboard.services.utils.trade_enrichment import ensure_trade_id
-from dashboard.services.utils.persistence import advisory_file_lock, atomic_write_csv, append_audit_event
+from dashboard.services.utils.fifo_matching import (
+    GROUP_KEYS,
+    LEG_COLUMNS,
+    fifo_round_trips,
+    iter_fill_batches,
+    load_broker_fills,
+    stream_fifo_round_trips,
+)
+from dashboard.services.utils import parse_cache
+from dashboard.services.utils.parallel_parse import map_files
+from dashboard.services.utils.trade_enrichment import ensure_trade_id, symbol_root
+from dashboard.services.utils.persistence import advisory_file_lock, append_audit_event
 
 logger = logging.getLogger(__name__)
 
@@ -86,21 +105,6 @@ def _apply_phase_tags(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def _symbol_root(raw_symbol: object) -> str:
-    sym = str(raw_symbol or "").strip().upper()
-    if not sym:
-        return ""
-    # Remove exchange suffix, e.g. MESH26.CME -> MESH26
-    sym = sym.split(".")[0]
-    # Match futures code with month code + year (e.g. MESH26 -> MES)
-    m = re.match(r"^([A-Z]+?)([FGHJKMNQUVXZ])(\d{1,2})$", sym)
-    if m:
-        return m.group(1)
-    # Fallback to leading alpha token.
-    m2 = re.match(r"^([A-Z]+)", sym)
-    return m2.group(1) if m2 else sym
-
-
 def _load_point_values() -> dict[str, float]:
     specs = dict(_DEFAULT_POINT_VALUES)
     specs_path = Path(CONTRACT_SPECS_CSV)
@@ -109,7 +113,7 @@ def _load_point_values() -> dict[str, float]:
             df = pd.read_csv(specs_path)
             if {"symbol", "point_value"}.issubset(df.columns):
                 for _, row in df.iterrows():
-                    root = _symbol_root(row.get("symbol"))
+                    root = symbol_root(row.get("symbol"))
                     if not root:
                         continue
                     try:
@@ -169,434 +173,329 @@ def _dedupe_by_trade_signature(df: pd.DataFrame, *, label: str) -> pd.DataFrame:
         logger.info("Deduped %s by trade signature: removed %d duplicate row(s)", label, removed)
     return out
 
-def process_csv(file_path):
-    # Read the CSV data
-    df = pd.read_csv(file_path)
-
-    # Convert 'Date/Time' to datetime
-    df['Date/Time'] = pd.to_datetime(df['Date/Time'], format='%Y%m%d;%H%M%S')
-
-    # Localize to Eastern Time (America/New_York)
-    eastern_tz = pytz.timezone('America/New_York')
-    df['Date/Time'] = df['Date/Time'].apply(lambda x: x.tz_localize(eastern_tz))
-
-    # Sort by 'Date/Time' for FIFO
-    df = df.sort_values('Date/Time').reset_index(drop=True)
-
-    # Calculate per-unit fees
-    def calculate_trade_fee(row):
-        return (
-            abs(row['BrokerExecutionCommission']) +
-            abs(row['ThirdPartyExecutionCommission']) +
-            abs(row['ThirdPartyRegulatoryCommission'])
-        )
-
-    df['TotalFee'] = df.apply(calculate_trade_fee, axis=1)
-    df['FeePerUnit'] = df['TotalFee'] / df['Quantity'].abs()
-
-    # Initialize round trips list
-    round_trips = []
-
+def _point_values_for(symbols) -> dict[str, float]:
     point_values = _load_point_values()
-
-    # Group trades by symbol
-    for symbol in df['Symbol'].unique():
-        symbol_df = df[df['Symbol'] == symbol].copy()
-        symbol_root = _symbol_root(symbol)
-        point_value = point_values.get(symbol_root)
+    out: dict[str, float] = {}
+    for symbol in symbols:
+        root = symbol_root(symbol)
+        point_value = point_values.get(root)
         if point_value is None:
             point_value = _DEFAULT_POINT_VALUES.get("MES", 5.0)
             logger.warning(
                 "Missing point_value for symbol '%s' (root '%s'); defaulting to %.2f. Add row to %s",
                 symbol,
-                symbol_root,
+                root,
                 point_value,
                 CONTRACT_SPECS_CSV,
             )
+        out[symbol] = point_value
+    return out
 
-        # Initialize queues for this symbol
-        buy_trades = deque()
-        sell_trades = deque()
-
-        # Split trades into single-unit trades
-        for _, row in symbol_df.iterrows():
-            qty = int(row['Quantity'])
-            fee_per_unit = row['TotalFee'] / abs(qty)
-            trade = {
-                'Time': row['Date/Time'],
-                'Price': row['Price'],
-                'FeePerUnit': fee_per_unit,
-                'TradeDate': row['TradeDate'],
-                'Symbol': row['Symbol'],
-                'OriginalQty': qty
-            }
-            if qty > 0:
-                for _ in range(qty):
-                    buy_trades.append(trade.copy())
-            else:
-                for _ in range(-qty):
-                    sell_trades.append(trade.copy())
-
-        # Generate round trips for this symbol
-        while buy_trades and sell_trades:
-            buy = buy_trades.popleft()
-            sell = sell_trades.popleft()
-            
-            # Determine trade type
-            if buy['Time'] <= sell['Time']:
-                trade_type = 'Long'
-                entered_at = buy['Time']
-                exited_at = sell['Time']
-                entry_price = buy['Price']
-                exit_price = sell['Price']
-                fees = buy['FeePerUnit'] + sell['FeePerUnit']
-                pnl = (exit_price - entry_price) * point_value - fees
-            else:
-                trade_type = 'Short'
-                entered_at = sell['Time']
-                exited_at = buy['Time']
-                entry_price = sell['Price']
-                exit_price = buy['Price']
-                fees = buy['FeePerUnit'] + sell['FeePerUnit']
-                pnl = (entry_price - exit_price) * point_value - fees
-
-            # Calculate duration
-            trade_duration_seconds = (exited_at - entered_at).total_seconds()
-            trade_duration_days = trade_duration_seconds // (24 * 3600)
-            trade_duration_seconds %= (24 * 3600)
-            trade_duration_hours = trade_duration_seconds // 3600
-            trade_duration_seconds %= 3600
-            trade_duration_minutes = trade_duration_seconds // 60
-            trade_duration_seconds %= 60
-            trade_duration_seconds = int(trade_duration_seconds)
-            trade_duration_str = f"{int(trade_duration_days)} days {int(trade_duration_hours):02}:{int(trade_duration_minutes):02}:{trade_duration_seconds:02}"
-
-            # Convert to +03:00 timezone
-            target_tz = pytz.timezone('US/Central')
-            entered_at_tz = entered_at.astimezone(target_tz)
-            exited_at_tz = exited_at.astimezone(target_tz)
-            entered_at_str = entered_at_tz.strftime('%m/%d/%Y %H:%M:%S %z').replace('+0300', '+03:00')
-            exited_at_str = exited_at_tz.strftime('%m/%d/%Y %H:%M:%S %z').replace('+0300', '+03:00')
-
-            # Create round trip
-            round_trip = {
-                'ContractName': buy['Symbol'],
-                'EnteredAt': entered_at_str,
-                'ExitedAt': exited_at_str,
-                'EntryPrice': entry_price,
-                'ExitPrice': exit_price,
-                'Fees': round(fees, 2),
-                'PnL': round(pnl, 2),
-                'Size': 1,
-                'Type': trade_type,
-                'TradeDay': entered_at_str,
-                'TradeDuration': trade_duration_str
-            }
-            round_trips.append(round_trip)
-
-        # Print unmatched buy trades
-        if buy_trades:
-            print(f"\nUnmatched BUY trades for symbol {symbol}:")
-            for t in buy_trades:
-                print(f"  Time: {t['Time']}, Price: {t['Price']}, Qty: 1, Symbol: {t['Symbol']}")
-
-        # Print unmatched sell trades
-        if sell_trades:
-            print(f"\nUnmatched SELL trades for symbol {symbol}:")
-            for t in sell_trades:
-                print(f"  Time: {t['Time']}, Price: {t['Price']}, Qty: 1, Symbol: {t['Symbol']}")
-
-    # Convert to DataFrame
-    round_trips_df = pd.DataFrame(round_trips)
-
-    # Combine round trips with identical EnteredAt and ExitedAt
-    grouped = round_trips_df.groupby([
-        'EnteredAt', 'ExitedAt', 'ContractName', 'Type', 'EntryPrice', 'ExitPrice'
-    ]).agg({
-        'Size': 'sum',
-        'PnL': 'sum',
-        'Fees': 'sum',
-        'TradeDay': 'first',
-        'TradeDuration': 'first'
-    }).reset_index()
-
-    # Assign Ids based on US/Central trade day. Parse in UTC first to handle mixed offsets safely.
-    trade_day_ts = pd.to_datetime(
-        grouped['TradeDay'],
-        format='%m/%d/%Y %H:%M:%S %z',
-        errors='coerce',
-        utc=True,
-    )
-    entered_at_ts = pd.to_datetime(
-        grouped['EnteredAt'],
-        format='%m/%d/%Y %H:%M:%S %z',
-        errors='coerce',
-        utc=True,
-    )
-    grouped['TradeDate'] = trade_day_ts.fillna(entered_at_ts).dt.tz_convert('US/Central').dt.date
+
+def _trade_dates(grouped: pd.DataFrame) -> pd.Series:
+    # TradeDay is already US/Central wall time, so its date prefix is the trade date
+    # (same as parsing in UTC and converting back).
+    trade_date = pd.to_datetime(grouped['TradeDay'].str[:10], format='%m/%d/%Y', errors='coerce')
+    entered_date = pd.to_datetime(grouped['EnteredAt'].str[:10], format='%m/%d/%Y', errors='coerce')
+    return trade_date.fillna(entered_date).dt.date
+
+
+def _number_by_trade_day(grouped: pd.DataFrame) -> pd.DataFrame:
+    # Ids restart on each US/Central trade day, in EnteredAt order.
+    grouped['TradeDate'] = _trade_dates(grouped)
     grouped = grouped[grouped['TradeDate'].notna()].copy()
     grouped = grouped.sort_values(['TradeDate', 'EnteredAt']).reset_index(drop=True)
-    
-    # Reset Id for each unique trade date
-    grouped['Id'] = 1
-    for date in grouped['TradeDate'].unique():
-        mask = grouped['TradeDate'] == date
-        grouped.loc[mask, 'Id'] = range(1, mask.sum() + 1)
+    grouped['Id'] = grouped.groupby('TradeDate').cumcount() + 1
+    return grouped.drop(columns=['TradeDate'])
+
+
+ROUND_TRIP_COLUMNS = [
+    'Id', 'ContractName', 'EnteredAt', 'ExitedAt', 'EntryPrice', 'ExitPrice',
+    'Fees', 'PnL', 'Size', 'Type', 'TradeDay', 'TradeDuration'
+]
 
-    # Drop temporary TradeDate column
-    grouped = grouped.drop(columns=['TradeDate'])
 
-    # Reorder columns
-    output_columns = [
-        'Id', 'ContractName', 'EnteredAt', 'ExitedAt', 'EntryPrice', 'ExitPrice',
-        'Fees', 'PnL', 'Size', 'Type', 'TradeDay', 'TradeDuration'
-    ]
-    round_trips_df = grouped[output_columns]
+def process_csv(file_path):
+    """Parse a raw broker fill CSV into round trips (FIFO per symbol, one row per distinct entry/exit)."""
+    fills = load_broker_fills(file_path)
+    grouped, _, _ = fifo_round_trips(fills, _point_values_for(fills['Symbol'].unique()))
+    if grouped.empty:
+        return pd.DataFrame(columns=ROUND_TRIP_COLUMNS)
+    return _number_by_trade_day(grouped)[ROUND_TRIP_COLUMNS]
+
+
+def _import_settings() -> tuple[int, int]:
+    cfg = get_app_config().get("performance_import", {})
+    try:
+        threshold = int(float(cfg.get("stream_threshold_mb", 32)) * 1024 * 1024)
+        chunk_rows = int(cfg.get("stream_chunk_rows", 50000))
+    except (TypeError, ValueError):
+        threshold, chunk_rows = 32 * 1024 * 1024, 50000
+    return max(0, threshold), max(1, chunk_rows)
 
-    return round_trips_df
+
+def _should_stream(file_path) -> bool:
+    threshold, _ = _import_settings()
+    return threshold > 0 and os.path.getsize(file_path) >= threshold
+
+
+def iter_round_trip_batches(file_path, chunksize: int | None = None):
+    """Round trips of a time-ordered broker export, parsed ``chunksize`` fills at a time.
+
+    Only the open FIFO inventory is kept between chunks, so memory follows open positions
+    plus chunk size rather than file size. A trade day's round trips are held back until
+    no open position can still enter on that day, then numbered, so the concatenated
+    batches equal process_csv's rows and Ids (fills in the same second keep file order).
+    """
+    point_values: dict[str, float] = {}
+
+    def _lookup(symbols) -> dict[str, float]:
+        missing = [symbol for symbol in symbols if symbol not in point_values]
+        if missing:
+            point_values.update(_point_values_for(missing))
+        return point_values
+
+    pending: list[pd.DataFrame] = []
+    batches = iter_fill_batches(file_path, chunksize or _import_settings()[1])
+    for grouped, horizon in stream_fifo_round_trips(batches, _lookup):
+        if not grouped.empty:
+            pending.append(grouped)
+        if not pending:
+            continue
+        held = pd.concat(pending, ignore_index=True)
+        trade_day = pd.to_datetime(_trade_dates(held))
+        done = (trade_day < pd.Timestamp(horizon.tz_convert('US/Central').date())).to_numpy()
+        pending = [held[~done]] if not done.all() else []
+        if done.any():
+            yield _numbered_batch(held[done])
+    if pending:
+        yield _numbered_batch(pd.concat(pending, ignore_index=True))
+
+
+def _numbered_batch(grouped: pd.DataFrame) -> pd.DataFrame:
+    # Same row order as the whole-file groupby before numbering; groups never span batches.
+    grouped = grouped.sort_values(GROUP_KEYS).reset_index(drop=True)
+    return _number_by_trade_day(grouped)[ROUND_TRIP_COLUMNS]
+
+
+def _parse_cache_key(file_path, kind: str) -> str | None:
+    try:
+        return parse_cache.cache_key(file_path, kind, CONTRACT_SPECS_CSV)
+    except OSError as exc:
+        logger.warning(f"Parse cache skipped for {file_path}: {exc}")
+        return None
+
+
+def _store_parsed(key: str | None, frames, source_name: str | None = None) -> None:
+    if key is None:
+        return
+    try:
+        parse_cache.store(key, frames, source_name)
+    except OSError as exc:
+        logger.warning(f"Failed to write parse cache entry {key}: {exc}")
+
+
+def cached_process_csv(file_path) -> tuple[pd.DataFrame, bool]:
+    """``(process_csv(file_path), hit)``, reusing the result for byte-identical re-uploads."""
+    key = _parse_cache_key(file_path, "round_trips")
+    cached = parse_cache.load(key) if key else None
+    if cached is not None:
+        return cached[0], True
+    round_trips_df = process_csv(file_path)
+    _store_parsed(key, (round_trips_df,))
+    return round_trips_df, False
+
+
+def _round_trip_frames(file_path, spill_dir) -> tuple[list[pd.DataFrame], str | None]:
+    """Round trips of one export as ``(frames, spill)``.
+
+    Below the streaming threshold this is the whole-file parse. Above it the round trips are
+    written in time order to a spill file in ``spill_dir`` that the merge reads chunk by chunk.
+    """
+    if _should_stream(file_path):
+        written = _write_range_partial(file_path, spill_dir)
+        return [], (written[0] if written else None)
+    round_trips_df, _ = cached_process_csv(file_path)
+    return ([] if round_trips_df.empty else [round_trips_df]), None
+
+
+def read_round_trip_chunks(file_path):
+    """Round-trip rows of a spill or range file, ``stream_chunk_rows`` at a time."""
+    yield from pd.read_csv(file_path, chunksize=_import_settings()[1])
 
 
 def process_csv_with_execution_legs(file_path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Parse raw broker CSV to round-trip trades and fill-derived execution legs.
 
-    Legs are generated from the same FIFO unit-matching logic used for round trips,
-    so UI split/merge can operate on raw-derived units instead of synthetic trade legs.
+    Legs are generated from the same FIFO matching used for round trips, one open and
+    one close leg per matched contract, so UI split/merge can operate on raw-derived
+    units instead of synthetic trade legs.
     """
-    df = pd.read_csv(file_path)
-    df['Date/Time'] = pd.to_datetime(df['Date/Time'], format='%Y%m%d;%H%M%S')
-    eastern_tz = pytz.timezone('America/New_York')
-    df['Date/Time'] = df['Date/Time'].apply(lambda x: x.tz_localize(eastern_tz))
-    df = df.sort_values('Date/Time').reset_index(drop=True)
-
-    def calculate_trade_fee(row):
-        return (
-            abs(row['BrokerExecutionCommission']) +
-            abs(row['ThirdPartyExecutionCommission']) +
-            abs(row['ThirdPartyRegulatoryCommission'])
-        )
-
-    df['TotalFee'] = df.apply(calculate_trade_fee, axis=1)
-    df['FeePerUnit'] = df['TotalFee'] / df['Quantity'].abs()
+    fills = load_broker_fills(file_path)
+    grouped, _, legs = fifo_round_trips(
+        fills,
+        _point_values_for(fills['Symbol'].unique()),
+        source_name=Path(file_path).name,
+        float_prices=True,
+    )
+    if grouped.empty:
+        return pd.DataFrame(), pd.DataFrame()
 
-    point_values = _load_point_values()
-    round_trip_units: list[dict[str, object]] = []
-    execution_legs: list[dict[str, object]] = []
-    unit_counter = 0
-
-    for symbol in df['Symbol'].unique():
-        symbol_df = df[df['Symbol'] == symbol].copy()
-        symbol_root = _symbol_root(symbol)
-        point_value = point_values.get(symbol_root)
-        if point_value is None:
-            point_value = _DEFAULT_POINT_VALUES.get("MES", 5.0)
-            logger.warning(
-                "Missing point_value for symbol '%s' (root '%s'); defaulting to %.2f. Add row to %s",
-                symbol,
-                symbol_root,
-                point_value,
-                CONTRACT_SPECS_CSV,
-            )
+    grouped['Group'] = range(len(grouped))
+    grouped = _number_by_trade_day(grouped)
+    round_trips_df = grouped[ROUND_TRIP_COLUMNS].copy()
 
-        buy_trades = deque()
-        sell_trades = deque()
-
-        for ridx, row in symbol_df.iterrows():
-            qty = int(row['Quantity'])
-            fee_per_unit = row['TotalFee'] / abs(qty)
-            for u in range(abs(qty)):
-                fill_id = f"{Path(file_path).name}:{int(ridx)}:{u}:{'B' if qty > 0 else 'S'}"
-                trade = {
-                    'FillId': fill_id,
-                    'Time': row['Date/Time'],
-                    'Price': float(row['Price']),
-                    'FeePerUnit': float(fee_per_unit),
-                    'Symbol': str(row['Symbol']),
-                }
-                if qty > 0:
-                    buy_trades.append(trade)
-                else:
-                    sell_trades.append(trade)
-
-        while buy_trades and sell_trades:
-            buy = buy_trades.popleft()
-            sell = sell_trades.popleft()
-            unit_counter += 1
-            if buy['Time'] <= sell['Time']:
-                trade_type = 'Long'
-                entered_at = buy['Time']
-                exited_at = sell['Time']
-                entry_price = float(buy['Price'])
-                exit_price = float(sell['Price'])
-                fees = float(buy['FeePerUnit'] + sell['FeePerUnit'])
-                pnl = (exit_price - entry_price) * point_value - fees
-                open_fill = buy
-                close_fill = sell
-                open_qty = 1
-                close_qty = -1
-            else:
-                trade_type = 'Short'
-                entered_at = sell['Time']
-                exited_at = buy['Time']
-                entry_price = float(sell['Price'])
-                exit_price = float(buy['Price'])
-                fees = float(buy['FeePerUnit'] + sell['FeePerUnit'])
-                pnl = (entry_price - exit_price) * point_value - fees
-                open_fill = sell
-                close_fill = buy
-                open_qty = -1
-                close_qty = 1
-
-            trade_duration_seconds = (exited_at - entered_at).total_seconds()
-            trade_duration_days = trade_duration_seconds // (24 * 3600)
-            trade_duration_seconds %= (24 * 3600)
-            trade_duration_hours = trade_duration_seconds // 3600
-            trade_duration_seconds %= 3600
-            trade_duration_minutes = trade_duration_seconds // 60
-            trade_duration_seconds %= 60
-            trade_duration_seconds = int(trade_duration_seconds)
-            trade_duration_str = f"{int(trade_duration_days)} days {int(trade_duration_hours):02}:{int(trade_duration_minutes):02}:{trade_duration_seconds:02}"
-
-            target_tz = pytz.timezone('US/Central')
-            entered_at_tz = entered_at.astimezone(target_tz)
-            exited_at_tz = exited_at.astimezone(target_tz)
-            entered_at_str = entered_at_tz.strftime('%m/%d/%Y %H:%M:%S %z').replace('+0300', '+03:00')
-            exited_at_str = exited_at_tz.strftime('%m/%d/%Y %H:%M:%S %z').replace('+0300', '+03:00')
-            unit_key = "|".join(
-                [
-                    str(symbol),
-                    trade_type,
-                    entered_at_str,
-                    exited_at_str,
-                    f"{entry_price:.8f}",
-                    f"{exit_price:.8f}",
-                    str(unit_counter),
-                ]
-            )
-            round_trip_units.append(
-                {
-                    'ContractName': symbol,
-                    'EnteredAt': entered_at_str,
-                    'ExitedAt': exited_at_str,
-                    'EntryPrice': entry_price,
-                    'ExitPrice': exit_price,
-                    'Fees': round(fees, 2),
-                    'PnL': round(pnl, 2),
-                    'Size': 1,
-                    'Type': trade_type,
-                    'TradeDay': entered_at_str,
-                    'TradeDuration': trade_duration_str,
-                    '__unit_key': unit_key,
-                }
-            )
-            execution_legs.append(
-                {
-                    '__unit_key': unit_key,
-                    'raw_fill_id': str(open_fill['FillId']),
-                    'ContractName': str(symbol),
-                    'Time': entered_at_str,
-                    'Qty': open_qty,
-                    'Price': float(open_fill['Price']),
-                    'Fee': round(float(open_fill['FeePerUnit']), 6),
-                    'LegRole': 'open',
-                }
+    # Legs of groups dropped for an unparseable trade day keep Id 0 and an empty TradeDay.
+    numbered = grouped.set_index('Group')
+    legs['Id'] = legs['Group'].map(numbered['Id']).fillna(0).astype(int)
+    legs['TradeDay'] = legs['Group'].map(numbered['TradeDay']).fillna("").astype(str)
+    return round_trips_df, legs[LEG_COLUMNS].copy()
+
+
+def preview_upload_file(file_path: str) -> dict[str, object]:
+    """Parse-preview one uploaded broker export.
+
+    Returns ``{"status", "parsed_rows", "reason", "unparseable_rows", "round_trips", "legs", "cache"}``
+    (plus ``bad_symbols`` for unbalanced files). Reasons and rows match the parse-preview
+    response; the caller adds the display file name. ``cache`` is "hit" when a byte-identical
+    file already previewed successfully, in which case nothing is re-read or re-matched.
+    """
+
+    def _failed(reason: str, rows: list[dict[str, object]], **extra) -> dict[str, object]:
+        return {"status": "failed", "parsed_rows": 0, "reason": reason, "unparseable_rows": rows, "cache": "miss", **extra}
+
+    def _ok(parsed_df: pd.DataFrame, legs_df: pd.DataFrame, cache: str) -> dict[str, object]:
+        return {
+            "status": "ok",
+            "parsed_rows": int(len(parsed_df)),
+            "unparseable_rows": [],
+            "round_trips": parsed_df,
+            "legs": legs_df,
+            "cache": cache,
+        }
+
+    source_name = Path(file_path).name
+    key = _parse_cache_key(file_path, "preview")
+    cached = parse_cache.load(key, source_name) if key else None
+    if cached is not None:
+        return _ok(*cached, cache="hit")
+
+    # Parse diagnostics first from raw rows.
+    try:
+        raw_df = pd.read_csv(file_path)
+        required = {"Date/Time", "Symbol", "Quantity"}
+        missing = sorted(list(required.difference(set(raw_df.columns))))
+        if missing:
+            return _failed(
+                "missing_columns",
+                [{"row_number": None, "reason": f"missing required columns: {', '.join(missing)}", "row": {}}],
             )
-            execution_legs.append(
-                {
-                    '__unit_key': unit_key,
-                    'raw_fill_id': str(close_fill['FillId']),
-                    'ContractName': str(symbol),
-                    'Time': exited_at_str,
-                    'Qty': close_qty,
-                    'Price': float(close_fill['Price']),
-                    'Fee': round(float(close_fill['FeePerUnit']), 6),
-                    'LegRole': 'close',
-                }
+
+        qty = pd.to_numeric(raw_df["Quantity"], errors="coerce").fillna(0.0)
+        raw_df["__qty"] = qty
+        by_symbol = raw_df.groupby(raw_df["Symbol"].astype(str), observed=True)["__qty"].sum()
+        bad_symbols = by_symbol[by_symbol != 0]
+        if not bad_symbols.empty:
+            rows = []
+            for symbol, net_qty in bad_symbols.items():
+                bad_rows = raw_df[raw_df["Symbol"].astype(str) == str(symbol)].copy()
+                for ridx, row in bad_rows.iterrows():
+                    rows.append(
+                        {
+                            "row_number": int(ridx) + 2,  # CSV header offset
+                            "reason": f"symbol net quantity is not zero ({net_qty}); incomplete round-trip set",
+                            "row": {k: (None if pd.isna(v) else str(v)) for k, v in row.to_dict().items() if not str(k).startswith("__")},
+                        }
+                    )
+            return _failed(
+                "net_quantity_not_zero",
+                rows,
+                bad_symbols=[{"symbol": str(k), "net_qty": float(v)} for k, v in bad_symbols.items()],
             )
+    except Exception as exc:
+        return _failed("read_error", [{"row_number": None, "reason": f"failed to read raw csv: {exc}", "row": {}}])
 
-    if not round_trip_units:
-        return pd.DataFrame(), pd.DataFrame()
+    # Convert raw fills to round-trip trades (preview only).
+    try:
+        parsed_df, legs_df = process_csv_with_execution_legs(str(file_path))
+    except Exception as exc:
+        return _failed("parse_error", [{"row_number": None, "reason": f"parse error: {exc}", "row": {}}])
+    if parsed_df.empty:
+        return _failed("empty_parse", [{"row_number": None, "reason": "no round-trip trades parsed from file", "row": {}}])
+    _store_parsed(key, (parsed_df, legs_df), source_name)
+    return _ok(parsed_df, legs_df, cache="miss")
 
-    unit_df = pd.DataFrame(round_trip_units)
-    grouped = unit_df.groupby(
-        ['EnteredAt', 'ExitedAt', 'ContractName', 'Type', 'EntryPrice', 'ExitPrice'], dropna=False
-    ).agg(
-        {
-            'Size': 'sum',
-            'PnL': 'sum',
-            'Fees': 'sum',
-            'TradeDay': 'first',
-            'TradeDuration': 'first',
-        }
-    ).reset_index()
-    trade_day_ts = pd.to_datetime(grouped['TradeDay'], format='%m/%d/%Y %H:%M:%S %z', errors='coerce', utc=True)
-    entered_at_ts = pd.to_datetime(grouped['EnteredAt'], format='%m/%d/%Y %H:%M:%S %z', errors='coerce', utc=True)
-    grouped['TradeDate'] = trade_day_ts.fillna(entered_at_ts).dt.tz_convert('US/Central').dt.date
-    grouped = grouped[grouped['TradeDate'].notna()].copy()
-    grouped = grouped.sort_values(['TradeDate', 'EnteredAt']).reset_index(drop=True)
-    grouped['Id'] = 1
-    for date in grouped['TradeDate'].unique():
-        mask = grouped['TradeDate'] == date
-        grouped.loc[mask, 'Id'] = range(1, mask.sum() + 1)
-    grouped = grouped.drop(columns=['TradeDate'])
-
-    output_columns = [
-        'Id', 'ContractName', 'EnteredAt', 'ExitedAt', 'EntryPrice', 'ExitPrice',
-        'Fees', 'PnL', 'Size', 'Type', 'TradeDay', 'TradeDuration'
-    ]
-    round_trips_df = grouped[output_columns].copy()
-
-    # Map unit legs to grouped trades by signature (same keys as grouping).
-    group_keys = ['EnteredAt', 'ExitedAt', 'ContractName', 'Type', 'EntryPrice', 'ExitPrice']
-    unit_with_group = unit_df[group_keys + ['__unit_key']].copy()
-    leg_df = pd.DataFrame(execution_legs)
-    # Keep group keys from unit mapping to avoid suffix collisions (e.g., ContractName_x/y)
-    # so downstream merge keys remain stable.
-    leg_df = leg_df.drop(columns=['ContractName'], errors='ignore')
-    leg_df = leg_df.merge(unit_with_group, on='__unit_key', how='left')
-    leg_df = leg_df.merge(grouped[group_keys + ['Id', 'TradeDay']], on=group_keys, how='left')
-    leg_df['TradeDay'] = leg_df['TradeDay'].fillna("").astype(str)
-    leg_df['Id'] = pd.to_numeric(leg_df['Id'], errors='coerce').fillna(0).astype(int)
-    leg_df = leg_df[
-        ['raw_fill_id', 'Id', 'TradeDay', 'ContractName', 'Time', 'Qty', 'Price', 'Fee', 'LegRole', 'EnteredAt', 'ExitedAt', 'EntryPrice', 'ExitPrice', 'Type']
-    ].copy()
-    return round_trips_df, leg_df
-
-
-def calculate_streaks(df):
+
+def calculate_streaks(df, previous: int = 0):
+    """Signed win/loss run per row; ``previous`` is the streak the rows continue (0 for none)."""
     df['WinOrLoss'] = df['PnL'].apply(lambda x: 1 if x > 0 else -1)
     df['Streak'] = 0
-    streak_counter = 0
+    streak = previous
 
     for i in range(len(df)):
-        if i == 0 or df['WinOrLoss'].iloc[i] != df['WinOrLoss'].iloc[i - 1]:
-            streak_counter = 1
-        else:
-            streak_counter += 1
-        df.loc[i, 'Streak'] = streak_counter * df['WinOrLoss'].iloc[i]
+        win_or_loss = df['WinOrLoss'].iloc[i]
+        streak = streak + win_or_loss if streak * win_or_loss > 0 else win_or_loss
+        df.loc[i, 'Streak'] = streak
 
     return df
 
-def generate_aggregated_data(valid_dataframes):
+def _normalize_stored_rows(past_performance_df: pd.DataFrame) -> pd.DataFrame:
+    past_performance_df = _dedupe_by_trade_signature(past_performance_df, label="past_performance")
+    past_performance_df = ensure_trade_id(past_performance_df)
+    past_performance_df['EnteredAt'] = pd.to_datetime(past_performance_df['EnteredAt'], utc=True).dt.tz_convert(TIMEZONE)
+    past_performance_df['ExitedAt'] = pd.to_datetime(past_performance_df['ExitedAt'], utc=True).dt.tz_convert(TIMEZONE)
+    past_performance_df['TradeDay'] = past_performance_df['EnteredAt'].dt.strftime('%Y-%m-%d')
+    past_performance_df['DayOfWeek'] = past_performance_df['EnteredAt'].dt.day_name()
+    past_performance_df['YearMonth'] = past_performance_df['EnteredAt'].dt.tz_localize(None).dt.to_period('M')
+    past_performance_df['HourOfDay'] = past_performance_df['EnteredAt'].dt.hour
+    return past_performance_df
+
+
+def generate_aggregated_data(valid_dataframes, batched=()):
+    """Upsert round trips into the performance store, touching only the months they fall in.
+
+    ``valid_dataframes`` are merged together. Each entry of ``batched`` is one time-ordered
+    export as an iterable of round-trip frames (see ``read_round_trip_chunks``); its frames
+    are upserted one at a time with streaks carried across them, so memory follows the
+    chunk size rather than the export. Returns the whole dataset after the merge.
+    """
+    repository = performance_repository(PERFORMANCE_CSV)
+    updated_count = inserted_count = 0
+    affected_dates: set[str] = set()
+    rewritten: set[str] = set()
     with advisory_file_lock(PERFORMANCE_CSV):
-        past_performance_df = pd.read_csv(PERFORMANCE_CSV) if os.path.exists(PERFORMANCE_CSV) else pd.DataFrame()
-        if not past_performance_df.empty:
-            past_performance_df = _dedupe_by_trade_signature(past_performance_df, label="past_performance")
-            past_performance_df = ensure_trade_id(past_performance_df)
-            past_performance_df['EnteredAt'] = pd.to_datetime(past_performance_df['EnteredAt'], utc=True).dt.tz_convert(TIMEZONE)
-            past_performance_df['ExitedAt'] = pd.to_datetime(past_performance_df['ExitedAt'], utc=True).dt.tz_convert(TIMEZONE)
-            past_performance_df['TradeDay'] = past_performance_df['EnteredAt'].dt.strftime('%Y-%m-%d')
-            past_performance_df['DayOfWeek'] = past_performance_df['EnteredAt'].dt.day_name()
-            past_performance_df['YearMonth'] = past_performance_df['EnteredAt'].dt.tz_localize(None).dt.to_period('M')
-            past_performance_df['HourOfDay'] = past_performance_df['EnteredAt'].dt.hour
-        _final_df, _updated_count, _inserted_count, _affected_dates = _generate_aggregated_data_inner(past_performance_df, valid_dataframes)
-        atomic_write_csv(_final_df, PERFORMANCE_CSV)
+        previous_token = repository.token()
+        rollup_current = rollup_is_current(PERFORMANCE_CSV)
+        ensure_store(PERFORMANCE_CSV)
+        for combined_df in _incoming_frames(valid_dataframes, batched):
+            updated, inserted, dates, months = _upsert_months(combined_df)
+            updated_count += updated
+            inserted_count += inserted
+            affected_dates |= dates
+            rewritten |= months
+        snapshot = repository.replace_months(previous_token, rewritten)
+        _final_df = snapshot.copy()
+        # Refresh the daily rollup for affected days only; rebuild it if it was already stale.
+        try:
+            sync_daily_rollup(snapshot.prepared(), affected_dates if rollup_current else None, PERFORMANCE_CSV)
+        except (TypeError, ValueError, OSError, KeyError) as e:
+            logger.error(f"Failed to sync daily rollup: {e}")
+        # Fold appended trades into the running metrics; a trade inserted in the past forces a rebuild.
+        try:
+            state, incremental = sync_running_state(snapshot.prepared(), PERFORMANCE_CSV)
+            logger.info(
+                "Running metrics %s over %d trade(s)", "advanced" if incremental else "rebuilt", state["trades"]
+            )
+        except (TypeError, ValueError, OSError, KeyError) as e:
+            logger.error(f"Failed to sync running metrics: {e}")
     append_audit_event(
         "performance_sum_merged",
         {
             "performance_csv": PERFORMANCE_CSV,
-            "updated_trades": _updated_count,
-            "inserted_trades": _inserted_count,
-            "affected_trade_days": sorted(_affected_dates),
+            "updated_trades": updated_count,
+            "inserted_trades": inserted_count,
+            "affected_trade_days": sorted(affected_dates),
+            "rewritten_months": sorted(rewritten),
             "final_rows": int(len(_final_df)),
         },
         actor="job:acquire_missing_performance",
@@ -605,18 +504,47 @@ def generate_aggregated_data(valid_dataframes):
     return _final_df
 
 
-def _generate_aggregated_data_inner(past_performance_df: pd.DataFrame, valid_dataframes: list[pd.DataFrame]):
+def _incoming_frames(valid_dataframes, batched):
+    if valid_dataframes:
+        yield _prepare_incoming(valid_dataframes)[0]
+    for batches in batched:
+        streak = 0
+        for batch in batches:
+            if batch.empty:
+                continue
+            combined_df, streak = _prepare_incoming([batch], streak)
+            yield combined_df
+
+
+def _upsert_months(combined_df: pd.DataFrame) -> tuple[int, int, set[str], set[str]]:
+    """Write ``combined_df`` into the store; ``(updated, inserted, affected_dates, months)``."""
+    manifest = ensure_store(PERFORMANCE_CSV)
+    # Months of the incoming trades plus the months already holding any of their trade_ids.
+    index = trade_index(PERFORMANCE_CSV, manifest)
+    touched = set(partition_months(combined_df))
+    touched.update(index[trade_id] for trade_id in combined_df["trade_id"].astype(str) if trade_id in index)
+    past_performance_df, _ = read_store(PERFORMANCE_CSV, touched)
     if not past_performance_df.empty:
-        past_performance_df = past_performance_df.copy()
+        past_performance_df = _normalize_stored_rows(past_performance_df)
+    touched_df, updated_count, inserted_count, affected_dates = _generate_aggregated_data_inner(past_performance_df, combined_df)
+    parts = {month: touched_df.iloc[0:0] for month in touched}
+    parts.update(split_months(touched_df))
+    write_months(parts, PERFORMANCE_CSV)
+    return updated_count, inserted_count, affected_dates, set(parts)
 
+
+def _prepare_incoming(valid_dataframes: list[pd.DataFrame], streak: int = 0) -> tuple[pd.DataFrame, int]:
+    """Normalized incoming rows and the streak after the last of them."""
     combined_df = pd.concat(valid_dataframes, ignore_index=True)
     logger.info("All valid files have been successfully concatenated.")
     combined_df['EnteredAt'] = pd.to_datetime(combined_df['EnteredAt'], utc=True).dt.tz_convert(TIMEZONE)
     combined_df['ExitedAt'] = pd.to_datetime(combined_df['ExitedAt'], utc=True).dt.tz_convert(TIMEZONE)
     combined_df['TradeDay'] = pd.to_datetime(combined_df['EnteredAt'], utc=True).dt.tz_convert(TIMEZONE).dt.strftime('%Y-%m-%d')
-    combined_df.sort_values(by='EnteredAt', inplace=True)
+    # Stable, so trades entered together keep parse order and get the same streaks however the export is chunked.
+    combined_df.sort_values(by='EnteredAt', inplace=True, kind='stable')
     combined_df.reset_index(drop=True, inplace=True)
-    combined_df = calculate_streaks(combined_df)
+    combined_df = calculate_streaks(combined_df, streak)
+    streak = int(combined_df['Streak'].iloc[-1]) if not combined_df.empty else streak
     combined_df['DayOfWeek'] = combined_df['EnteredAt'].dt.day_name()
     combined_df['YearMonth'] = combined_df['EnteredAt'].dt.tz_localize(None).dt.to_period('M')
     combined_df['HourOfDay'] = combined_df['EnteredAt'].dt.hour
@@ -632,7 +560,13 @@ def _generate_aggregated_data_inner(past_performance_df: pd.DataFrame, valid_dat
             'Size', 'Type', 'TradeDuration', 'WinOrLoss', 'Streak', 'Comment'
         ]
     available_columns = [col for col in desired_columns if col in combined_df.columns]
-    combined_df = combined_df[available_columns]
+    return combined_df[available_columns], streak
+
+
+def _generate_aggregated_data_inner(past_performance_df: pd.DataFrame, combined_df: pd.DataFrame):
+    """Upsert ``combined_df`` into the stored rows of the months it touches."""
+    if not past_performance_df.empty:
+        past_performance_df = past_performance_df.copy()
 
     updated_count = 0
     affected_dates: set[str] = set()
@@ -677,8 +611,12 @@ def _generate_aggregated_data_inner(past_performance_df: pd.DataFrame, valid_dat
             if pd.notna(raw_day):
                 affected_dates.add(str(raw_day))
 
-    # Concatenate old and new
-    final_df = pd.concat([past_performance_df, new_rows_df], ignore_index=True)
+    # Concatenate old and new (no stored rows in the touched months: keep the stored columns only)
+    if past_performance_df.empty:
+        columns = list(dict.fromkeys([*past_performance_df.columns, *new_rows_df.columns]))
+        final_df = new_rows_df.reindex(columns=columns).reset_index(drop=True)
+    else:
+        final_df = pd.concat([past_performance_df, new_rows_df], ignore_index=True)
     final_df = _dedupe_by_trade_signature(final_df, label="final_combined")
     final_df = ensure_trade_id(final_df)
     final_df = _apply_phase_tags(final_df)
@@ -702,34 +640,61 @@ def _generate_aggregated_data_inner(past_performance_df: pd.DataFrame, valid_dat
     except (TypeError, ValueError, OSError, KeyError) as e:
         logger.error(f"Failed to sync trade_sum: {e}")
 
-    # Save and return
     return final_df, updated_count, int(len(new_rows_df)), affected_dates
 
+def _write_range_partial(file_path, target_dir):
+    """Write one temp export's round trips to a partial file in ``target_dir``.
+
+    Returns ``(partial_path, startdate, enddate)``, or None when nothing matched.
+    """
+    partial = Path(target_dir) / f".{Path(file_path).name}.partial"
+    batches = iter_round_trip_batches(file_path) if _should_stream(file_path) else [cached_process_csv(file_path)[0]]
+    startdate = enddate = None
+    try:
+        for batch in batches:
+            if batch.empty:
+                continue
+            # Exports span CST and CDT; parse the offsets in UTC and date the rows in trading time.
+            batch["TradeDay"] = pd.to_datetime(batch["TradeDay"], utc=True, errors="raise").dt.tz_convert(TIMEZONE)
+            first, last = batch["TradeDay"].min().date(), batch["TradeDay"].max().date()
+            batch.to_csv(partial, mode="w" if startdate is None else "a", header=startdate is None, index=False)
+            startdate = first if startdate is None else min(startdate, first)
+            enddate = last if enddate is None else max(enddate, last)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    if startdate is None:
+        return None
+    return str(partial), startdate, enddate
+
+
 def round_trip_converter():
     root_dir = TEMP_PERF_DIR
     target_dir = PERFORMANCE_DIR
     Path(target_dir).mkdir(parents=True, exist_ok=True)
-    csv_files = glob.glob(str(Path(root_dir) / "*.csv"))
+    csv_files = sorted(glob.glob(str(Path(root_dir) / "*.csv")))
     if not csv_files:
         logger.info("No temp files to convert in %s", root_dir)
         return
 
-    # Process each CSV file
-    for file_path in csv_files:
-        logger.info("Processing temp performance file: %s", file_path)
+    # Parse files concurrently; outputs are named and sources removed in file order.
+    logger.info("Processing %d temp performance file(s) from %s", len(csv_files), root_dir)
+    for file_path, converted, exc in map_files(_write_range_partial, csv_files, str(target_dir)):
+        if exc is not None:
+            if not isinstance(exc, (pd.errors.ParserError, ValueError, OSError, KeyError)):
+                raise exc
+            logger.error("Failed to convert temp performance file %s: %s", file_path, exc)
+            continue
+        if converted is None:
+            logger.warning("No round-trip rows generated from %s; leaving file in place", file_path)
+            continue
+        partial, startdate, enddate = converted
         try:
-            round_trips_df = process_csv(file_path)
-            if round_trips_df.empty:
-                logger.warning("No round-trip rows generated from %s; leaving file in place", file_path)
-                continue
-            round_trips_df["TradeDay"] = pd.to_datetime(round_trips_df["TradeDay"], errors="raise")
-            startdate = round_trips_df["TradeDay"].min().date()
-            enddate = round_trips_df["TradeDay"].max().date()
             output_filename = os.path.join(target_dir, f"Performance_{startdate}_to_{enddate}.csv")
-            round_trips_df.to_csv(output_filename, index=False)
+            os.replace(partial, output_filename)
             logger.info("Saved converted performance file: %s", output_filename)
             os.remove(file_path)
-        except (pd.errors.ParserError, ValueError, OSError, KeyError) as exc:
+        except OSError as exc:
             logger.error("Failed to convert temp performance file %s: %s", file_path, exc)
 
 
@@ -738,6 +703,7 @@ def acquire_missing_performance():
     """Acquire missing performace data"""
     try:
         all_dataframes = []
+        large_files: list[str] = []
         aggregate_name = os.path.basename(PERFORMANCE_CSV)
         for filename in os.listdir(PERFORMANCE_DIR):
             if filename == aggregate_name:
@@ -747,6 +713,10 @@ def acquire_missing_performance():
                 continue
             file_path = os.path.join(PERFORMANCE_DIR, filename)
             try:
+                if _should_stream(file_path):
+                    # Large range files are merged chunk by chunk instead of being loaded whole.
+                    large_files.append(file_path)
+                    continue
                 df = pd.read_csv(file_path)
                 if not df.empty:
                     all_dataframes.append(df)
@@ -754,8 +724,8 @@ def acquire_missing_performance():
                 logger.error(f"Failed to read {filename}: {e}")
         # Concatenate all dataframes
         valid_dataframes = [df for df in all_dataframes if not df.empty]
-        if valid_dataframes:
-            generate_aggregated_data(valid_dataframes)
+        if valid_dataframes or large_files:
+            generate_aggregated_data(valid_dataframes, [read_round_trip_chunks(path) for path in large_files])
         else:
             logger.warning("No valid data was found to concatenate.")
     except Exception:
@@ -783,40 +753,45 @@ def merge_uploaded_temp_files(file_paths: list[str], archive_raw: bool = False)
         archive_dir.mkdir(parents=True, exist_ok=True)
     stamp = time.strftime("%Y%m%d%H%M%S", time.gmtime())
 
+    # Parse every existing file up front (concurrently), then handle results in upload order.
+    # Exports above the streaming threshold come back as spill files merged chunk by chunk.
+    existing = list(dict.fromkeys(str(Path(raw_path)) for raw_path in file_paths if Path(raw_path).exists()))
+    parsed = {path: (result, error) for path, result, error in map_files(_round_trip_frames, existing, str(TEMP_PERF_DIR))}
+    spills: list[str] = [result[1] for result, _ in parsed.values() if result is not None and result[1]]
+
     for raw_path in file_paths:
         p = Path(raw_path)
         if not p.exists():
             failed_files.append({"file": str(p), "error": "file not found"})
             continue
-        try:
-            converted = process_csv(str(p))
-            if converted.empty:
-                failed_files.append({"file": str(p), "error": "no round-trip rows produced"})
-                continue
-            valid_dataframes.append(converted)
+        result, error = parsed[str(p)]
+        if error is not None:
+            failed_files.append({"file": str(p), "error": str(error)})
+        elif not result[0] and not result[1]:
+            failed_files.append({"file": str(p), "error": "no round-trip rows produced"})
+        else:
+            valid_dataframes.extend(result[0])
             saved_paths.append(str(p))
-        except Exception as exc:
-            failed_files.append({"file": str(p), "error": str(exc)})
-            continue
-        finally:
-            # Raw upload lifecycle is explicit and immediate in interactive mode.
-            if p.exists():
-                try:
-                    if archive_raw:
-                        target = archive_dir / f"{stamp}_{p.name}"
-                        p.replace(target)
-                        archived_paths.append(str(target))
-                    else:
-                        p.unlink()
-                        removed_paths.append(str(p))
-                except OSError as exc:
-                    failed_files.append({"file": str(p), "error": f"cleanup failed: {exc}"})
-
-    if not valid_dataframes:
-        detail = "; ".join([f"{f['file']}: {f['error']}" for f in failed_files]) or "no valid files"
-        raise ValueError(f"upload merge failed: {detail}")
-
-    merged_df = generate_aggregated_data(valid_dataframes)
+        # Raw upload lifecycle is explicit and immediate in interactive mode.
+        try:
+            if archive_raw:
+                target = archive_dir / f"{stamp}_{p.name}"
+                p.replace(target)
+                archived_paths.append(str(target))
+            else:
+                p.unlink()
+                removed_paths.append(str(p))
+        except OSError as exc:
+            failed_files.append({"file": str(p), "error": f"cleanup failed: {exc}"})
+
+    try:
+        if not valid_dataframes and not spills:
+            detail = "; ".join([f"{f['file']}: {f['error']}" for f in failed_files]) or "no valid files"
+            raise ValueError(f"upload merge failed: {detail}")
+        merged_df = generate_aggregated_data(valid_dataframes, [read_round_trip_chunks(path) for path in spills])
+    finally:
+        for spill in spills:
+            Path(spill).unlink(missing_ok=True)
     return {
         "processed_files": saved_paths,
         "archived_files": archived_paths,
@@ -59,6 +59,21 @@ def atomic_write_csv(df: pd.DataFrame, target: str | Path) -> None:
             os.unlink(tmp_path)
 
 
+def atomic_write_json(payload: Any, target: str | Path) -> None:
+    target_path = Path(target)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{target_path.name}.", suffix=".tmp", dir=str(target_path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(_to_jsonable(payload), fh, sort_keys=True)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, target_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
 def append_audit_event(event_type: str, details: dict[str, Any], *, actor: str = "system") -> None:
     payload = {
         "ts_utc": datetime.now(timezone.utc).isoformat(),
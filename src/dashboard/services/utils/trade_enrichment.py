@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import re
 
 import numpy as np
 import pandas as pd
@@ -26,6 +27,21 @@ def _norm_str(value: object) -> str:
     return str(value).strip().upper()
 
 
+def symbol_root(raw_symbol: object) -> str:
+    sym = str(raw_symbol or "").strip().upper()
+    if not sym:
+        return ""
+    # Remove exchange suffix, e.g. MESH26.CME -> MESH26
+    sym = sym.split(".")[0]
+    # Match futures code with month code + year (e.g. MESH26 -> MES)
+    m = re.match(r"^([A-Z]+?)([FGHJKMNQUVXZ])(\d{1,2})$", sym)
+    if m:
+        return m.group(1)
+    # Fallback to leading alpha token.
+    m2 = re.match(r"^([A-Z]+)", sym)
+    return m2.group(1) if m2 else sym
+
+
 def _trade_key_payload(row: pd.Series) -> str:
     parts = [
         _norm_str(row.get("ContractName")),
@@ -1,8 +1,11 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 from dashboard.app import app
 import dashboard.services.portfolio as portfolio
 import dashboard.services.analysis.portfolio_metrics as pm
+import dashboard.services.utils.parse_cache as parse_cache
 import dashboard.services.utils.persistence as persistence
 
 # Ensure API auth checks are bypassed only in pytest context.
@@ -24,5 +27,74 @@ def tmp_portfolio_csv(monkeypatch, tmp_path):
     monkeypatch.setattr(portfolio, "CASHFLOW_CSV", cashflow_file)
     monkeypatch.setattr(portfolio, "TRADE_SUM_CSV", trade_sum_file)
     monkeypatch.setattr(persistence, "AUDIT_LOG_JSONL", str(audit_log_file))
+    monkeypatch.setattr(parse_cache, "CACHE_DIR", tmp_path / "parse_cache")
     monkeypatch.setattr(pm, "equity_series", portfolio.equity_series)
     yield
+
+
+@pytest.fixture
+def broker_export():
+    """
+    Factory writing a time-ordered broker fill export to ``path`` and returning it as str.
+    Fills land on a ``tick``-second grid within 8h of each day; a coarse tick puts several
+    fills on one timestamp. With ``flat`` each buy is closed by the next fill, so no
+    position is left open.
+    """
+
+    def make(path, seed, n=120, symbols=("MESM5",), start="2025-04-01 08:00:00", days=10, tick=1, flat=False):
+        rng = np.random.default_rng(seed)
+        t = pd.Timestamp(start) + pd.to_timedelta(
+            np.sort(rng.integers(0, days, n) * 86400 + rng.integers(0, 8 * 3600 // tick, n) * tick), unit="s"
+        )
+        qty = rng.integers(1, 6, n) * rng.choice([-1, 1], n)
+        if flat:
+            qty[0::2] = np.abs(qty[0::2])
+            qty[1::2] = -qty[0 : n - 1 : 2]
+        pd.DataFrame(
+            {
+                "Date/Time": t.strftime("%Y%m%d;%H%M%S"),
+                "Symbol": rng.choice(list(symbols), n),
+                "Quantity": qty,
+                "Price": np.round(5000 + rng.normal(0, 20, n) * 4) / 4,
+                "TradeDate": t.strftime("%Y%m%d"),
+                "BrokerExecutionCommission": -np.round(rng.uniform(0.1, 1, n) * np.abs(qty), 4),
+                "ThirdPartyExecutionCommission": -np.round(rng.uniform(0, 0.5, n), 4),
+                "ThirdPartyRegulatoryCommission": -0.02 * np.abs(qty),
+            }
+        ).to_csv(path, index=False)
+        return str(path)
+
+    return make
+
+
+@pytest.fixture
+def trades_frame():
+    """
+    Factory for a performance frame of ``n`` trades entered over ``days`` from ``start``
+    (the default range spans the March DST switch). Holds run up to ``max_hold_hours``,
+    so some trades exit on the next CME day; 0 exits each trade when it was entered.
+    """
+
+    def make(n=400, seed=5, start="2025-02-20", days=45, symbols=("MESH5", "MNQM5"), max_hold_hours=6):
+        rng = np.random.default_rng(seed)
+        entered = pd.Timestamp(start, tz="UTC") + pd.to_timedelta(np.sort(rng.integers(0, days * 86400, n)), unit="s")
+        exited = entered + pd.to_timedelta(rng.integers(0, max_hold_hours * 3600 + 1, n), unit="s")
+        pnl = np.round(rng.normal(0, 150, n), 2)
+        pnl[rng.random(n) < 0.05] = -400.0
+        return pd.DataFrame(
+            {
+                "trade_id": [f"{seed}-{i}" for i in range(n)],
+                "TradeDay": entered.tz_convert("US/Central").strftime("%Y-%m-%d"),
+                "ContractName": rng.choice(list(symbols), n),
+                "EnteredAt": entered.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "ExitedAt": exited.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "Fees": 1.24,
+                "PnL(Net)": pnl,
+                "WinOrLoss": np.sign(pnl).astype(int),
+                "Size": rng.integers(1, 4, n),
+                "Setup": np.array(["Breakout", "Pullback|Trend", ""])[rng.integers(0, 3, n)],
+                "Phase": np.array(["Trend", "Range"])[rng.integers(0, 2, n)],
+            }
+        )
+
+    return make
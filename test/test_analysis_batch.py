@@ -0,0 +1,69 @@
+import pandas as pd
+
+from dashboard.api import routes
+from dashboard.services.analysis.result_cache import clear_result_cache
+
+
+def _seed_perf_csv(path):
+    entered = pd.date_range("2025-11-03 14:00", periods=12, freq="7h", tz="UTC")
+    pnl = [25.0, -10.0, 40.0, -5.0, -60.0, 15.0, 30.0, -20.0, 5.0, 12.5, -7.5, 50.0]
+    pd.DataFrame(
+        {
+            "TradeDay": entered.tz_convert("US/Central").strftime("%Y-%m-%d"),
+            "ContractName": ["MES"] * 12,
+            "IntradayIndex": range(1, 13),
+            "EnteredAt": entered.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "ExitedAt": (entered + pd.Timedelta(minutes=9)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "PnL(Net)": pnl,
+            "WinOrLoss": [1 if v > 0 else -1 for v in pnl],
+            "Type": ["Long", "Short"] * 6,
+            "Size": [1, 2, 1, 3, 1, 1, 2, 1, 1, 2, 1, 1],
+        }
+    ).to_csv(path, index=False)
+
+
+def test_batch_matches_individual_metric_calls(client, tmp_path, monkeypatch):
+    perf_csv = tmp_path / "perf.csv"
+    _seed_perf_csv(perf_csv)
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_csv))
+
+    scope = {"symbol": "MES", "include_unmatched": True}
+    items = [
+        {"metric": "drawdown", "granularity": "1W-MON"},
+        {"metric": "rolling_win_rate", "window": 3},
+        {"metric": "overtrading_detection", "params": {"cap_loss_per_trade": 50}},
+        {"metric": "performance_envelope", "key": "envelope"},
+        "kelly_criterion",
+    ]
+
+    loads = []
+    original = routes._filter_performance_range
+    monkeypatch.setattr(routes, "_filter_performance_range", lambda *a, **k: loads.append(1) or original(*a, **k))
+    resp = client.post("/api/analysis/batch", json={**scope, "metrics": items})
+    assert resp.status_code == 200
+    assert len(loads) == 1
+    results = resp.get_json()["results"]
+    keys = ["drawdown", "rolling_win_rate", "overtrading_detection", "envelope", "kelly_criterion"]
+    assert sorted(results) == sorted(keys)
+
+    clear_result_cache()
+    for item, key in zip(items, keys):
+        item = {"metric": item} if isinstance(item, str) else dict(item)
+        metric = item.pop("metric")
+        item.pop("key", None)
+        single = client.post(f"/api/analysis/{metric}", json={**scope, **item})
+        assert single.status_code == 200
+        assert results[key] == {"ok": True, "metric": metric, "data": single.get_json()}
+
+
+def test_batch_rejects_bad_requests(client, tmp_path, monkeypatch):
+    perf_csv = tmp_path / "perf.csv"
+    _seed_perf_csv(perf_csv)
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_csv))
+
+    assert client.post("/api/analysis/batch", json={"metrics": []}).status_code == 400
+    assert client.post("/api/analysis/batch", json={"metrics": ["nope"]}).status_code == 400
+    assert client.post("/api/analysis/batch", json={"metrics": ["drawdown", "drawdown"]}).status_code == 400
+    assert client.post("/api/analysis/batch", json={"metrics": [{"metric": "drawdown", "window": 0}]}).status_code == 400
+    resp = client.post("/api/analysis/batch", json={"metrics": ["drawdown"], "start_date": "bad"})
+    assert resp.status_code == 400
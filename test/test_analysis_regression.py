@@ -1,8 +1,13 @@
+import numpy as np
 import pandas as pd
+import pytest
 
 from dashboard.services.analysis import compute
 from dashboard.services.analysis.behavioral import behavior_heatmap
 
+# Grouped sums add rows in another order than per-period Series.sum; allow last-bit differences.
+SUM_ORDER_RTOL = 1e-9
+
 
 def _fixture_df() -> pd.DataFrame:
     entered = pd.to_datetime(
@@ -164,3 +169,177 @@ def test_overtrading_tags_all_post_loss_trades_in_window():
     # Both trades after the big loss should be evaluated/tagged, not left as default LightBlue.
     assert trades.loc[trades["TradeIndex"] == 2, "TradeTag"].iloc[0] != "LightBlue"
     assert trades.loc[trades["TradeIndex"] == 3, "TradeTag"].iloc[0] != "LightBlue"
+
+
+def _tie_heavy_trades(n=1500, seed=0):
+    # 2-decimal PnL over 1/5/30-minute holds puts many window means exactly on .xx5.
+    rng = np.random.default_rng(seed)
+    entered = pd.Timestamp("2024-01-02", tz="UTC") + pd.to_timedelta(np.sort(rng.integers(0, 200 * 86400, n)), unit="s")
+    held = pd.to_timedelta(rng.choice([0, 60, 300, 1800], n), unit="s")
+    pnl = np.round(rng.normal(0, 50, n), 2)
+    pnl[rng.random(n) < 0.2] = 0.0
+    pnl[:300] = 0.0  # flat return windows for Sharpe
+    return pd.DataFrame({"EnteredAt": entered, "ExitedAt": entered + held, "PnL(Net)": pnl})
+
+
+def _loop_rolling_reference(df, window):
+    """The per-window loops the rolling metrics replaced."""
+    df = df.sort_values("ExitedAt").reset_index(drop=True)
+    win = pd.Series(np.where(df["PnL(Net)"] > 0, 1, -1))
+    hours = (df["ExitedAt"] - df["EnteredAt"]).dt.total_seconds() / 3600
+    eff = df["PnL(Net)"] / hours.replace(0, np.nan)
+    win_rate = [round((win.iloc[i - window + 1:i + 1] == 1).sum() / window * 100, 2) for i in range(window - 1, len(df))]
+    efficiency = [round(np.mean(eff.iloc[i - window + 1:i + 1]), 2) for i in range(window - 1, len(df))]
+
+    day = df["ExitedAt"].dt.tz_convert("US/Central").dt.tz_localize(None).dt.date
+    daily = df.groupby(day)["PnL(Net)"].sum()
+    prev = (10000 + daily.cumsum()).shift(1).fillna(10000)
+    returns = (daily / prev).fillna(0).to_numpy()
+    sharpe = []
+    for i in range(window - 1, len(returns)):
+        w = returns[i - window + 1:i + 1]
+        std = np.std(w, ddof=1) if len(w) > 1 else 0
+        ann_std = std * np.sqrt(252) if std > 0 else 0
+        sharpe.append(round((np.mean(w) * 252 - 0.02) / ann_std if ann_std > 0 else 0, 2))
+    return win_rate, [0 if np.isnan(v) else v for v in efficiency], sharpe
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 20])
+def test_rolling_metrics_match_per_window_loops(window):
+    df = _tie_heavy_trades()
+    win_rate, efficiency, sharpe = _loop_rolling_reference(df, window)
+    assert compute.rolling_win_rate(df, window=window)["WinRate"].tolist() == win_rate
+    np.testing.assert_allclose(compute.trade_efficiency(df, window=window)["Efficiency"], efficiency, rtol=0, atol=0)
+    np.testing.assert_allclose(compute.sharpe_ratio(df, window=window)["SharpeRatio"], sharpe, rtol=0, atol=0)
+
+
+def test_sharpe_ratio_is_exact_on_near_flat_windows_after_volatile_days():
+    # Large swings, then cent-sized moves: running sums lose the tiny std entirely.
+    days = pd.bdate_range("2025-01-06", periods=80, tz="UTC") + pd.Timedelta(hours=15)
+    rng = np.random.default_rng(7)
+    pnl = np.concatenate([np.round(rng.normal(0, 3000, 40), 2), np.round(rng.normal(5, 0.02, 40), 2)])
+    df = pd.DataFrame({"EnteredAt": days, "ExitedAt": days + pd.Timedelta(minutes=30), "PnL(Net)": pnl})
+
+    single = compute.sharpe_ratio(df, window=5)["SharpeRatio"]
+    assert single.tolist() == _loop_rolling_reference(df, 5)[2]
+    assert single.tolist() == compute.sharpe_ratio(df, window=[5])["Sharpe_5d"].tolist()
+
+
+def test_sharpe_ratio_multi_window_matches_single_windows():
+    df = _fixture_df()  # consecutive business days: gap filling adds nothing
+    out = compute.sharpe_ratio(df, window=[2, 3, 2], risk_free_rate=0.0)
+    assert out.columns.tolist() == ["Date", "Sharpe_2d", "Sharpe_3d"]
+    assert out["Sharpe_3d"].tolist() == [10.55, 1.73, 5.38, -5.25]
+    assert out["Sharpe_2d"].tolist() == compute.sharpe_ratio(df, window=2, risk_free_rate=0.0)["SharpeRatio"].tolist()[1:]
+
+    # Dropping Tuesday leaves a flat business day in its place.
+    gapped = out.assign(Date=out["Date"].astype(str))
+    filled = compute.sharpe_ratio(df.drop(index=1), window=[2, 3], risk_free_rate=0.0)
+    assert filled["Date"].astype(str).tolist() == gapped["Date"].tolist()
+    assert filled["Sharpe_2d"].iloc[0] == compute.sharpe_ratio(df.assign(**{"PnL(Net)": [100, 0, 200, -100, 50, -25]}), window=2, risk_free_rate=0.0)["SharpeRatio"].iloc[1]
+    assert compute.sharpe_ratio(df, window=[3, 10]).columns.tolist() == ["Date", "Sharpe_3d", "Sharpe_10d"]
+    assert compute.sharpe_ratio(df, window=[3, 10]).empty
+
+
+def test_rolling_metrics_shorter_than_window_are_empty():
+    df = _fixture_df()
+    assert compute.rolling_win_rate(df, window=10).columns.tolist() == ["TradeIndex", "WinRate"]
+    assert compute.trade_efficiency(df, window=10).empty
+    assert compute.sharpe_ratio(df, window=10).empty
+
+
+def _loss_cluster_trades(n=400, seed=1):
+    # Few trades a day with frequent big losses, so streaks and post-loss windows overlap.
+    rng = np.random.default_rng(seed)
+    entered = pd.Timestamp("2025-06-02 13:00", tz="UTC") + pd.to_timedelta(np.sort(rng.integers(0, 30 * 86400, n)), unit="s")
+    pnl = np.round(rng.choice([-350.0, -120.0, -40.0, 60.0, 180.0], n) + rng.normal(0, 5, n), 2)
+    return pd.DataFrame({"EnteredAt": entered, "ExitedAt": entered + pd.Timedelta(minutes=3), "PnL(Net)": pnl, "Size": 1})
+
+
+def _loop_overtrading_flags(pnl, cap_loss, after, max_losses):
+    """The per-trade loops overtrading_detection used for streak and post-loss flags."""
+    is_loss = [v / cap_loss <= -1 for v in pnl]
+    streak, breach, post = 0, [], [False] * len(pnl)
+    for idx, loss in enumerate(is_loss):
+        streak = streak + 1 if loss else 0
+        breach.append(streak > max_losses)
+        if loss:
+            for j in range(idx + 1, min(idx + after + 1, len(pnl))):
+                post[j] = True
+    return breach, post
+
+
+@pytest.mark.parametrize("after,max_losses", [(0, 0), (2, 1), (5, 3)])
+def test_overtrading_flags_match_per_trade_loops(after, max_losses):
+    df = _loss_cluster_trades()
+    _, trades = compute.overtrading_detection(
+        df, cap_loss_per_trade=100, cap_trades_after_big_loss=after, max_consecutive_losses=max_losses
+    )
+    breach, post = _loop_overtrading_flags(trades["PnL(Net)"].tolist(), 100, after, max_losses)
+    assert trades["IsConsecutiveLossBreach"].tolist() == breach
+    assert trades["IsPostLoss"].tolist() == post
+    expected_reason = [
+        ", ".join(r for r, flag in (("consecutive_losses", b), ("reentry_after_big_loss", p)) if flag)
+        for b, p in zip(breach, post)
+    ]
+    assert trades["BreachReason"].tolist() == expected_reason
+    expected_tag = ["DarkRed" if b and p else "LightCoral" if b or p else "LightBlue" for b, p in zip(breach, post)]
+    assert trades["TradeTag"].tolist() == expected_tag
+
+
+def test_rule_compliance_matches_per_day_loop():
+    df = _loss_cluster_trades()
+    out = compute.rule_compliance_score(
+        df, max_trades_per_day=14, max_consecutive_losses=2, max_daily_loss=800, big_loss_threshold=300, max_trades_after_big_loss=3
+    )
+    exited = df["ExitedAt"].dt.tz_convert("US/Central")
+    ordered = df.assign(TradeDay=exited.dt.strftime("%Y-%m-%d")).sort_values("ExitedAt")
+    expected = []
+    for day, g in ordered.groupby("TradeDay"):
+        pnl = g["PnL(Net)"].tolist()
+        streak = longest = 0
+        for v in pnl:
+            streak = streak + 1 if v < 0 else 0
+            longest = max(longest, streak)
+        breaches = []
+        if len(pnl) > 14:
+            breaches.append("trades>14")
+        if longest > 2:
+            breaches.append("consecutive_losses>2")
+        if g["PnL(Net)"].sum() < -800:
+            breaches.append("daily_loss>800")
+        if any(v <= -300 and len(pnl) - i - 1 > 3 for i, v in enumerate(pnl)):
+            breaches.append("trades_after_big_loss>3")
+        expected.append((day, len(pnl), len(breaches), ", ".join(breaches) or "none"))
+    daily = out["daily"]
+    assert list(zip(daily["TradeDay"], daily["Trades"], daily["BreachCount"], daily["Breaches"])) == expected
+    assert daily["Score"].tolist() == [100 - count * 25 for _, _, count, _ in expected]
+
+
+def test_envelope_and_kelly_match_per_period_loops():
+    df = _loss_cluster_trades(seed=4)
+    df["Size"] = np.random.default_rng(4).integers(1, 4, len(df))
+    df["WinOrLoss"] = np.where(df["PnL(Net)"] > 0, 1, -1)
+    day = df["ExitedAt"].dt.tz_convert("US/Central").dt.tz_localize(None)
+    ordered = df.assign(TradeDay=day).sort_values("TradeDay")
+
+    _, actual = compute.performance_envelope(df, granularity="1W-MON")
+    expected = []
+    for _, g in ordered.groupby(ordered["TradeDay"].dt.to_period("W-MON")):
+        wins, losses = g[g["WinOrLoss"] == 1], g[g["WinOrLoss"] == -1]
+        avg_win = wins["PnL(Net)"].sum() / wins["Size"].sum() if not wins.empty else 0
+        avg_loss = abs(losses["PnL(Net)"].sum() / losses["Size"].sum()) if not losses.empty else 1e-10
+        expected.append(min(avg_win / avg_loss, 20))
+    np.testing.assert_allclose(actual["AvgWinToAvgLoss"], expected, rtol=SUM_ORDER_RTOL)
+
+    kelly = compute.kelly_criterion(df)["data"]
+    expected = []
+    for _, g in df.groupby(day.dt.floor("D")):
+        pnl = g["PnL(Net)"].tolist()
+        wins, losses = [v for v in pnl if v > 0], [v for v in pnl if v < 0]
+        if not wins or not losses:
+            expected.append(0.0)
+            continue
+        rate = len(wins) / len(pnl)
+        expected.append(rate - (1 - rate) / (np.mean(wins) / -np.mean(losses)))
+    np.testing.assert_allclose(kelly["KellyValue"], expected, rtol=SUM_ORDER_RTOL, atol=SUM_ORDER_RTOL)
@@ -40,6 +40,19 @@ def test_analysis_rejects_invalid_window_type(tmp_path, monkeypatch):
     assert resp.status_code == 400
 
 
+def test_analysis_sharpe_accepts_window_list(tmp_path, monkeypatch):
+    perf_csv = tmp_path / "perf.csv"
+    _seed_perf_csv(perf_csv)
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_csv))
+
+    client = app.test_client()
+    resp = client.post("/api/analysis/sharpe_ratio", json={"window": [1, 1], "include_unmatched": True})
+    assert resp.status_code == 200
+    assert list(resp.get_json()[0]) == ["Date", "Sharpe_1d"]
+    assert client.post("/api/analysis/sharpe_ratio", json={"window": [7, 0]}).status_code == 400
+    assert client.post("/api/analysis/rolling_win_rate", json={"window": [7, 14]}).status_code == 400
+
+
 def test_analysis_rejects_invalid_start_date(tmp_path, monkeypatch):
     perf_csv = tmp_path / "perf.csv"
     _seed_perf_csv(perf_csv)
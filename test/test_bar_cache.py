@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+
+from dashboard.services.data.bar_cache import BarCache
+
+
+def _write(path, rows):
+    pd.DataFrame({"Close": list(range(rows))}).to_csv(path, index=False)
+
+
+def test_bar_cache_hits_until_file_changes(tmp_path):
+    cache = BarCache(max_bytes=10 * 1024 * 1024)
+    path = tmp_path / "bars.csv"
+    _write(path, 3)
+    calls = []
+
+    def loader(p):
+        calls.append(p)
+        return pd.read_csv(p)
+
+    first = cache.get(path, loader)
+    second = cache.get(path, loader)
+    assert first is second
+    assert len(calls) == 1
+
+    _write(path, 5)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    third = cache.get(path, loader)
+    assert len(third) == 5
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 1
+
+
+def test_bar_cache_evicts_least_recently_used_over_budget(tmp_path):
+    paths = []
+    for idx in range(3):
+        p = tmp_path / f"bars{idx}.csv"
+        _write(p, 1000)
+        paths.append(p)
+    one_frame = int(pd.read_csv(paths[0]).memory_usage(index=True, deep=True).sum())
+    cache = BarCache(max_bytes=one_frame * 2)
+
+    cache.get(paths[0], pd.read_csv)
+    cache.get(paths[1], pd.read_csv)
+    cache.get(paths[0], pd.read_csv)
+    cache.get(paths[2], pd.read_csv)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+    cache.get(paths[0], pd.read_csv)
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,121 @@
+import pandas as pd
+import pytest
+
+from dashboard.services.data.bar_serialization import iso_times, parse_bar_format, serialize_bars
+from dashboard.services.utils.datetime_utils import iso_utc
+
+
+def _bars():
+    return pd.DataFrame(
+        {
+            "Datetime": pd.to_datetime(
+                ["2026-03-06 14:30:00+00:00", "2026-03-09 13:30:00+00:00", "2026-11-02 15:00:00+00:00"], utc=True
+            ).tz_convert("US/Central"),
+            "Open": [1.0, 2.0, 3.0],
+            "High": [1.5, 2.5, 3.5],
+            "Low": [0.5, 1.5, 2.5],
+            "Close": [1.25, 2.25, 3.25],
+            "Volume": [100, 200, 300],
+        }
+    )
+
+
+def test_rows_match_per_row_isoformat_across_dst():
+    df = _bars()
+    rows = serialize_bars(df, "US/Central")
+    expected = [
+        {
+            "time": row["Datetime"].tz_convert("US/Central").isoformat(),
+            "open": float(row["Open"]),
+            "high": float(row["High"]),
+            "low": float(row["Low"]),
+            "close": float(row["Close"]),
+            "volume": float(row["Volume"]),
+        }
+        for _, row in df.iterrows()
+    ]
+    assert rows == expected
+    assert [r["time"] for r in serialize_bars(df, "UTC")] == [iso_utc(t) for t in df["Datetime"]]
+
+
+def test_subsecond_timestamps_fall_back_to_isoformat():
+    ts = pd.Series(pd.to_datetime(["2026-03-06 14:30:00.250+00:00"], utc=True))
+    assert iso_times(ts, "UTC") == [ts.iloc[0].isoformat()]
+
+
+def test_columnar_shape_uses_epoch_millis():
+    out = serialize_bars(_bars().drop(columns=["Volume"]), fmt="columnar")
+    assert out["time"][0] == 1772807400000
+    assert out["close"] == [1.25, 2.25, 3.25]
+    assert out["volume"] is None
+
+
+def test_parse_bar_format_rejects_unknown():
+    assert parse_bar_format(None) == "rows"
+    with pytest.raises(ValueError):
+        parse_bar_format("csv")
+
+
+def test_candles_route_columnar_format(client, tmp_path, monkeypatch):
+    from dashboard.api import routes
+
+    csv_path = tmp_path / "MES.csv"
+    pd.DataFrame(
+        {
+            "Datetime": ["2026-03-30 09:30:00-05:00", "2026-03-30 09:35:00-05:00"],
+            "Open": [1.0, 2.0],
+            "High": [1.5, 2.5],
+            "Low": [0.5, 1.5],
+            "Close": [1.25, 2.25],
+            "Volume": [10, 20],
+        }
+    ).to_csv(csv_path, index=False)
+    monkeypatch.setitem(routes.DATA_SOURCE_DROPDOWN, "MES", str(csv_path))
+
+    resp = client.get("/api/candles?symbol=MES&format=columnar")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["open"] == [1.0, 2.0]
+    assert body["time"][1] - body["time"][0] == 5 * 60 * 1000
+    assert client.get("/api/candles?symbol=MES&format=xml").status_code == 400
+
+
+def test_pack_bars_round_trips_columns_and_meta():
+    from dashboard.services.data.bar_serialization import pack_bars, unpack_bars
+
+    df = _bars()
+    payload = pack_bars(df, {"note": "x"})
+    arrays, meta = unpack_bars(payload)
+    columnar = serialize_bars(df, fmt="columnar")
+    assert arrays["time"].tolist() == columnar["time"]
+    assert arrays["close"].tolist() == columnar["close"]
+    assert arrays["volume"].tolist() == columnar["volume"]
+    assert meta == {"note": "x"}
+
+
+def test_candles_route_negotiates_binary(client, tmp_path, monkeypatch):
+    from dashboard.api import routes
+    from dashboard.services.data.bar_serialization import BAR_BINARY_MIMETYPE, unpack_bars
+
+    csv_path = tmp_path / "MES.csv"
+    pd.DataFrame(
+        {
+            "Datetime": ["2026-03-30 09:30:00-05:00"],
+            "Open": [1.0],
+            "High": [1.5],
+            "Low": [0.5],
+            "Close": [1.25],
+            "Volume": [10],
+        }
+    ).to_csv(csv_path, index=False)
+    monkeypatch.setitem(routes.DATA_SOURCE_DROPDOWN, "MES", str(csv_path))
+
+    json_resp = client.get("/api/candles?symbol=MES")
+    assert json_resp.mimetype == "application/json"
+
+    resp = client.get("/api/candles?symbol=MES", headers={"Accept": BAR_BINARY_MIMETYPE})
+    assert resp.status_code == 200
+    assert resp.mimetype == BAR_BINARY_MIMETYPE
+    assert "Accept" in resp.headers["Vary"]
+    arrays, _ = unpack_bars(resp.data)
+    assert arrays["open"].tolist() == [1.0]
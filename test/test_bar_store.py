@@ -0,0 +1,108 @@
+import pandas as pd
+import pytest
+
+from dashboard.services.data import bar_store
+from dashboard.services.data.load_data import load_future
+
+
+def _seed_future_csv(path, stamps):
+    df = pd.DataFrame(
+        {
+            "Datetime": stamps,
+            "Open": [5600.0 + i for i in range(len(stamps))],
+            "High": [5605.0 + i for i in range(len(stamps))],
+            "Low": [5595.0 + i for i in range(len(stamps))],
+            "Close": [5602.0 + i for i in range(len(stamps))],
+            "Volume": [1000 + i for i in range(len(stamps))],
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_store_partitions_by_trading_month(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _seed_future_csv(
+        csv_path,
+        ["2026-02-27 09:30:00-06:00", "2026-03-02 09:30:00-06:00", "2026-03-31 14:30:00+00:00"],
+    )
+
+    manifest = bar_store.ensure_bar_store(csv_path)
+    assert sorted(manifest["partitions"]) == ["2026-02", "2026-03"]
+    assert manifest["partitions"]["2026-03"]["rows"] == 2
+    assert manifest["columns"] == ["Datetime", "Open", "High", "Low", "Close", "Volume"]
+
+
+def test_load_future_matches_csv_parse(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _seed_future_csv(
+        csv_path,
+        ["2026-03-30 09:30:00-05:00", "2026-03-30 09:35:00-05:00", "2026-03-31 09:30:00-05:00"],
+    )
+
+    out = load_future("2026-03-30", "2026-03-30", str(csv_path))
+    expected = bar_store.read_source_csv(csv_path)
+    expected["Datetime"] = expected["Datetime"].dt.tz_convert("US/Central")
+    expected = expected.iloc[:2].reset_index(drop=True)
+    pd.testing.assert_frame_equal(out, expected)
+
+
+def test_store_rebuilds_when_csv_changes(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _seed_future_csv(csv_path, ["2026-03-30 09:30:00-05:00"])
+    assert len(load_future("2026-03-30", "2026-03-31", str(csv_path))) == 1
+
+    _seed_future_csv(csv_path, ["2026-03-30 09:30:00-05:00", "2026-03-31 09:30:00-05:00"])
+    assert len(load_future("2026-03-30", "2026-03-31", str(csv_path))) == 2
+
+
+def test_append_bars_updates_only_touched_months(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _seed_future_csv(csv_path, ["2026-02-27 09:30:00-06:00", "2026-03-30 09:30:00-05:00"])
+    bar_store.ensure_bar_store(csv_path)
+    feb_file = bar_store.store_dir(csv_path) / "2026-02.npz"
+    feb_mtime = feb_file.stat().st_mtime_ns
+
+    st = csv_path.stat()
+    previous = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    new_rows = pd.DataFrame(
+        {
+            "Datetime": ["2026-03-31 09:30:00-05:00"],
+            "Open": [1.0],
+            "High": [2.0],
+            "Low": [0.5],
+            "Close": [1.5],
+            "Volume": [10],
+        }
+    )
+    with open(csv_path, "a", newline="") as fh:
+        new_rows.to_csv(fh, header=False, index=False)
+    bar_store.append_bars(csv_path, new_rows, previous)
+
+    manifest = bar_store.load_manifest(csv_path)
+    assert manifest["partitions"]["2026-03"]["rows"] == 2
+    assert feb_file.stat().st_mtime_ns == feb_mtime
+    out = bar_store.read_bars(csv_path, pd.Timestamp("2026-03-31", tz="US/Central"), None)
+    assert out["Close"].tolist() == [1.5]
+
+
+def test_load_future_rejects_bad_datetime_format(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _seed_future_csv(csv_path, ["2026-03-30T09:30:00Z"])
+    with pytest.raises(ValueError, match="Invalid datetime format"):
+        load_future("2026-03-30", "2026-03-30", str(csv_path))
+
+
+def test_candles_route_reads_store(client, tmp_path, monkeypatch):
+    from dashboard.api import routes
+
+    csv_path = tmp_path / "MES.csv"
+    _seed_future_csv(csv_path, ["2026-03-30 14:30:00+00:00", "2026-04-01 14:30:00+00:00"])
+    monkeypatch.setitem(routes.DATA_SOURCE_DROPDOWN, "MES", str(csv_path))
+
+    resp = client.get("/api/candles?symbol=MES&start=2026-03-30T00:00:00Z&end=2026-03-31T00:00:00Z")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body == [
+        {"time": "2026-03-30T14:30:00+00:00", "open": 5600.0, "high": 5605.0, "low": 5595.0, "close": 5602.0, "volume": 1000.0}
+    ]
@@ -0,0 +1,173 @@
+import pandas as pd
+import pytest
+
+from dashboard.api import routes
+from dashboard.services.analysis import compute
+from dashboard.services.analysis.daily_rollup import (
+    DailyRollup,
+    build_daily_rollup,
+    read_daily_rollup,
+    read_period_cube,
+    rollup_is_current,
+    sync_daily_rollup,
+)
+from dashboard.services.analysis.period_cube import build_period_cube
+from dashboard.services.analysis.result_cache import clear_result_cache
+
+
+# Rollup PnL sums add trades per day, then days per period; the trade path adds
+# trades per period. Both round to the nearest double at each step, so they may
+# differ in the last bits but not by more than this.
+SUM_ORDER_RTOL = 1e-9
+
+
+def _assert_frames_close(actual, expected):
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True), check_exact=False, rtol=SUM_ORDER_RTOL
+    )
+
+
+def _assert_json_close(actual, expected):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            _assert_json_close(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_json_close(a, e)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=SUM_ORDER_RTOL, abs=1e-9, nan_ok=True)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize("symbol", [None, "MES"])
+def test_rollup_days_match_trade_metrics(symbol, trades_frame):
+    df = trades_frame(600, 9)
+    days = DailyRollup(build_daily_rollup(df)).days(symbol)
+    if symbol:
+        df = df[df["ContractName"].str.startswith(symbol)]
+    for granularity in ("1D", "1W-MON", "1M"):
+        _assert_frames_close(compute.pnl_growth(days, granularity=granularity), compute.pnl_growth(df, granularity=granularity))
+        _assert_frames_close(compute.drawdown(days, granularity=granularity), compute.drawdown(df, granularity=granularity))
+        _assert_frames_close(
+            compute.performance_envelope(days, granularity=granularity)[1],
+            compute.performance_envelope(df, granularity=granularity)[1],
+        )
+    _assert_frames_close(compute.sharpe_ratio(days, window=5), compute.sharpe_ratio(df, window=5))
+    _assert_frames_close(compute.kelly_criterion(days)["data"], compute.kelly_criterion(df)["data"])
+    for args in ((8, 3, 500, 200, 2), (3, 1, 150, 400, 0), (20, 6, 5000, 0, 0)):
+        from_rollup = compute.rule_compliance_score(days, *args)
+        from_trades = compute.rule_compliance_score(df, *args)
+        assert from_rollup["summary"] == from_trades["summary"]
+        pd.testing.assert_frame_equal(from_rollup["daily"].reset_index(drop=True), from_trades["daily"].reset_index(drop=True))
+
+
+def test_rollup_days_fall_back_when_range_splits_a_day(trades_frame):
+    rollup = DailyRollup(build_daily_rollup(trades_frame(600, 9)))
+    rows = rollup.frame[(rollup.frame["Symbol"] == "*") & (rollup.frame["Setup"] == "*")]
+    overnight = rows[rows["FirstTradeDay"] < rows["LastTradeDay"]].iloc[0]
+    split_at = pd.Timestamp(overnight["LastTradeDay"], tz="US/Central")
+    assert rollup.days(start=split_at) is None
+    first_day = pd.Timestamp(rows["FirstTradeDay"].min(), tz="US/Central")
+    assert len(rollup.days(start=first_day, end=split_at + pd.Timedelta(days=60))) == len(rows)
+
+
+def test_rollup_days_sum_periods_without_cube_for_a_date_range(trades_frame):
+    # The range keeps the later block only, dropping early-April days from the same month.
+    df = pd.concat([trades_frame(600, 9), trades_frame(200, 5, "2025-04-20")], ignore_index=True)
+    rollup = DailyRollup(build_daily_rollup(df))
+    cut = "2025-04-15"
+    days = rollup.days(start=pd.Timestamp(cut, tz="US/Central"))
+    kept = df[df["TradeDay"] >= cut]
+    for granularity in ("1D", "1W-MON", "1M"):
+        _assert_frames_close(compute.pnl_growth(days, granularity=granularity), compute.pnl_growth(kept, granularity=granularity))
+        _assert_frames_close(
+            compute.performance_envelope(days, granularity=granularity)[1],
+            compute.performance_envelope(kept, granularity=granularity)[1],
+        )
+
+
+def test_sync_refreshes_only_affected_days(tmp_path, trades_frame):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    df = trades_frame(600, 9)
+    df.to_csv(perf_csv, index=False)
+    sync_daily_rollup(df, csv_path=perf_csv)
+    assert rollup_is_current(perf_csv)
+    before = read_daily_rollup(perf_csv)
+
+    changed_day = df["TradeDay"].iloc[100]
+    df.loc[df["TradeDay"] == changed_day, "PnL(Net)"] -= 25.0
+    df = pd.concat([df, trades_frame(20, 4, "2025-04-10")], ignore_index=True)
+    df.to_csv(perf_csv, index=False)
+    assert not rollup_is_current(perf_csv)
+    affected = {changed_day} | set(df["TradeDay"].iloc[-20:])
+    sync_daily_rollup(pd.read_csv(perf_csv), affected, csv_path=perf_csv)
+
+    after = read_daily_rollup(perf_csv)
+    pd.testing.assert_frame_equal(after, build_daily_rollup(pd.read_csv(perf_csv)), check_dtype=False)
+    untouched = before[before["LastTradeDay"] < changed_day]
+    pd.testing.assert_frame_equal(after.iloc[: len(untouched)], untouched)
+    pd.testing.assert_frame_equal(read_period_cube(perf_csv), build_period_cube(after), check_dtype=False, check_exact=False, rtol=SUM_ORDER_RTOL)
+
+
+def test_analysis_route_reads_rollup_for_day_metrics(client, tmp_path, monkeypatch, trades_frame):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    df = trades_frame(600, 9)
+    df.to_csv(perf_csv, index=False)
+    sync_daily_rollup(df, csv_path=perf_csv)
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_csv))
+    loads = []
+    original = routes._filter_performance_range
+    monkeypatch.setattr(routes, "_filter_performance_range", lambda *a, **k: loads.append(1) or original(*a, **k))
+    clear_result_cache()
+
+    resp = client.post("/api/analysis/drawdown", json={"symbol": "MNQ", "granularity": "1W-MON", "include_unmatched": True})
+    assert resp.status_code == 200
+    assert loads == []
+    expected = compute.drawdown(df[df["ContractName"].str.startswith("MNQ")], granularity="1W-MON")
+    assert [row["Drawdown"] for row in resp.get_json()] == pytest.approx(expected["Drawdown"].tolist())
+
+    for granularity in ("1D", "1M"):
+        resp = client.post("/api/analysis/performance_envelope", json={"granularity": granularity, "include_unmatched": True})
+        assert resp.status_code == 200
+    assert loads == []
+
+    resp = client.post("/api/analysis/rolling_win_rate", json={"include_unmatched": True})
+    assert resp.status_code == 200
+    assert loads == [1]
+
+
+def test_rollup_and_trade_paths_agree_within_sum_order_tolerance(client, tmp_path, monkeypatch, trades_frame):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    df = trades_frame(600, 9)
+    df.to_csv(perf_csv, index=False)
+    sync_daily_rollup(df, csv_path=perf_csv)
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_csv))
+    requests = [
+        ("pnl_growth", {"granularity": "1W-MON"}),
+        ("drawdown", {"granularity": "1M", "symbol": "MES"}),
+        ("performance_envelope", {"granularity": "1D"}),
+        ("sharpe_ratio", {"window": 5}),
+        ("kelly_criterion", {}),
+    ]
+
+    def run():
+        clear_result_cache()
+        out = []
+        for metric, payload in requests:
+            resp = client.post(f"/api/analysis/{metric}", json={**payload, "include_unmatched": True})
+            assert resp.status_code == 200
+            out.append(resp.get_json())
+        return out
+
+    loads = []
+    original = routes._filter_performance_range
+    monkeypatch.setattr(routes, "_filter_performance_range", lambda *a, **k: loads.append(1) or original(*a, **k))
+    from_rollup = run()
+    assert loads == []
+    monkeypatch.setattr(routes, "ROLLUP_METRICS", frozenset())
+    from_trades = run()
+    assert len(loads) == len(requests)
+    _assert_json_close(from_rollup, from_trades)
@@ -191,3 +191,36 @@ def test_is_holiday_fallback_to_static_calendar(monkeypatch):
     print(f"Fallback holiday check for 2024-03-18: {result}")
     # March 18, 2024 is not a CME holiday in static list; expect False
     assert result is False
+
+
+def _write_future_csv(path, stamps):
+    pd.DataFrame({"Datetime": stamps, "Close": [1.0] * len(stamps)}).to_csv(path, index=False)
+
+
+def test_get_last_row_date_reads_only_tail(tmp_path, monkeypatch):
+    csv_path = tmp_path / "MES.csv"
+    stamps = [f"2026-03-{day:02d} 09:30:00-05:00" for day in range(2, 31)] * 20
+    stamps.append("2026-03-31 15:10:00-05:00")
+    _write_future_csv(csv_path, stamps)
+
+    def _no_full_parse(*args, **kwargs):
+        raise AssertionError("full parse should not be needed")
+
+    monkeypatch.setattr(da.pd, "read_csv", _no_full_parse)
+    assert da.get_last_row_date(csv_path) == datetime.date(2026, 3, 31)
+    assert da.is_date_in_csv(csv_path, datetime.date(2026, 3, 31)) is True
+
+
+def test_get_last_row_date_falls_back_when_tail_malformed(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _write_future_csv(csv_path, ["2026-03-30 09:30:00-05:00"])
+    with open(csv_path, "a") as fh:
+        fh.write("garbage,1.0\n")
+    assert da.get_last_row_date(csv_path) == datetime.date(2026, 3, 30)
+
+
+def test_get_last_row_date_header_only_and_missing(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    csv_path.write_text("Datetime,Open,High,Low,Close,Adj Close,Volume\n")
+    assert da.get_last_row_date(csv_path) is None
+    assert da.get_last_row_date(tmp_path / "missing.csv") is None
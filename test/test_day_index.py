@@ -0,0 +1,94 @@
+import pandas as pd
+
+from dashboard.services.data import day_index
+
+
+def _write(path, stamps, mode="w", header=True):
+    df = pd.DataFrame(
+        {
+            "Datetime": stamps,
+            "Open": [1.0] * len(stamps),
+            "High": [2.0] * len(stamps),
+            "Low": [0.5] * len(stamps),
+            "Close": [1.5] * len(stamps),
+            "Volume": [10] * len(stamps),
+        }
+    )
+    with open(path, mode, newline="") as fh:
+        df.to_csv(fh, index=False, header=header)
+
+
+def test_index_maps_days_to_offsets_and_reads_range(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _write(
+        csv_path,
+        ["2026-03-30 09:30:00-05:00", "2026-03-30 09:35:00-05:00", "2026-03-31 09:30:00-05:00", "2026-04-01 09:30:00-05:00"],
+    )
+
+    index = day_index.ensure_day_index(csv_path)
+    assert [entry[0] for entry in index["days"]] == ["2026-03-30", "2026-03-31", "2026-04-01"]
+    assert [entry[2] for entry in index["days"]] == [2, 1, 1]
+    assert index["rows"] == 4
+    assert day_index.last_utc_date(index).isoformat() == "2026-04-01"
+
+    out = day_index.read_day_range(csv_path, "2026-03-31", "2026-03-31")
+    assert out["Datetime"].tolist() == ["2026-03-31 09:30:00-05:00"]
+    assert list(out.columns) == ["Datetime", "Open", "High", "Low", "Close", "Volume"]
+
+
+def test_index_extends_on_append_and_rebuilds_on_rewrite(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _write(csv_path, ["2026-03-30 09:30:00-05:00"])
+    first = day_index.ensure_day_index(csv_path)
+
+    _write(csv_path, ["2026-03-30 09:35:00-05:00", "2026-03-31 09:30:00-05:00"], mode="a", header=False)
+    extended = day_index.ensure_day_index(csv_path)
+    assert extended["days"][0][1] == first["days"][0][1]
+    assert [entry[2] for entry in extended["days"]] == [2, 1]
+    assert extended == day_index.build_day_index(csv_path)
+
+    _write(csv_path, ["2026-04-02 09:30:00-05:00"])
+    rebuilt = day_index.ensure_day_index(csv_path)
+    assert [entry[0] for entry in rebuilt["days"]] == ["2026-04-02"]
+    assert rebuilt["rows"] == 1
+
+
+def test_unordered_csv_is_not_sliced(tmp_path):
+    csv_path = tmp_path / "MES.csv"
+    _write(csv_path, ["2026-03-31 09:30:00-05:00", "2026-03-30 09:30:00-05:00"])
+    assert day_index.read_day_range(csv_path, "2026-03-30", "2026-03-30") is None
+
+
+def test_fetch_status_uses_index(client, tmp_path, monkeypatch):
+    from dashboard.api import routes
+
+    csv_path = tmp_path / "MES.csv"
+    _write(csv_path, ["2026-03-30 09:30:00-05:00", "2026-03-31 09:30:00-05:00"])
+    monkeypatch.setattr(routes, "SYMBOL_CATALOG", {"MES": {"enabled": True, "data_path": str(csv_path)}})
+
+    resp = client.get("/api/data/fetch/status")
+    assert resp.status_code == 200
+    row = resp.get_json()["rows"][0]
+    assert row["rows"] == 2
+    assert row["last_date"] == "2026-03-31"
+    assert row["status"] == "ready"
+
+
+def test_read_bars_falls_back_to_index_slice(tmp_path, monkeypatch):
+    from dashboard.services.data import bar_store
+
+    csv_path = tmp_path / "MES.csv"
+    _write(csv_path, ["2026-03-30 09:30:00-05:00", "2026-03-31 09:30:00-05:00"])
+
+    def _unwritable(_path):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(bar_store, "ensure_bar_store", _unwritable)
+    monkeypatch.setattr(bar_store, "cached_frame", lambda *_: (_ for _ in ()).throw(AssertionError("full parse")))
+    out = bar_store.read_bars(
+        csv_path,
+        pd.Timestamp("2026-03-31 00:00", tz="US/Central"),
+        pd.Timestamp("2026-03-31 23:59", tz="US/Central"),
+    )
+    assert len(out) == 1
+    assert str(out["Datetime"].dt.tz) == "US/Central"
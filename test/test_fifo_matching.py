@@ -0,0 +1,194 @@
+import os
+from collections import deque
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.services.utils import performance_acquisition as pa
+from dashboard.services.data.performance_store import read_performance
+from dashboard.services.utils.fifo_matching import load_broker_fills, match_fills
+
+
+@pytest.fixture
+def export(broker_export):
+    # Two roots across the March DST switch; half-hour slots, so many fills share a timestamp.
+    return partial(broker_export, n=160, symbols=("MESH5", "MNQM5"), start="2025-03-03 08:00:00", days=15, tick=1800)
+
+
+def _unit_round_trips(path):
+    """Reference: explode fills into single contracts and pair them one by one."""
+    fills = load_broker_fills(path)
+    point_values = pa._point_values_for(fills["Symbol"].unique())
+    units = []
+    for symbol in fills["Symbol"].unique():
+        queues = {True: deque(), False: deque()}
+        for _, row in fills[fills["Symbol"] == symbol].iterrows():
+            qty = int(row["Quantity"])
+            queues[qty > 0].extend([row] * abs(qty))
+        while queues[True] and queues[False]:
+            buy, sell = queues[True].popleft(), queues[False].popleft()
+            long_ = buy["Date/Time"] <= sell["Date/Time"]
+            entry, exit_ = (buy, sell) if long_ else (sell, buy)
+            fees = buy["TotalFee"] / abs(int(buy["Quantity"])) + sell["TotalFee"] / abs(int(sell["Quantity"]))
+            move = exit_["Price"] - entry["Price"] if long_ else entry["Price"] - exit_["Price"]
+            seconds = int((exit_["Date/Time"] - entry["Date/Time"]).total_seconds())
+            entered = entry["Date/Time"].tz_convert("US/Central").strftime("%m/%d/%Y %H:%M:%S %z")
+            units.append(
+                {
+                    "ContractName": symbol,
+                    "EnteredAt": entered,
+                    "ExitedAt": exit_["Date/Time"].tz_convert("US/Central").strftime("%m/%d/%Y %H:%M:%S %z"),
+                    "EntryPrice": entry["Price"],
+                    "ExitPrice": exit_["Price"],
+                    "Fees": round(fees, 2),
+                    "PnL": round(move * point_values[symbol] - fees, 2),
+                    "Size": 1,
+                    "Type": "Long" if long_ else "Short",
+                    "TradeDay": entered,
+                    "TradeDuration": f"{seconds // 86400} days {seconds % 86400 // 3600:02}:{seconds % 3600 // 60:02}:{seconds % 60:02}",
+                }
+            )
+    grouped = (
+        pd.DataFrame(units)
+        .groupby(["EnteredAt", "ExitedAt", "ContractName", "Type", "EntryPrice", "ExitPrice"])
+        .agg({"Size": "sum", "PnL": "sum", "Fees": "sum", "TradeDay": "first", "TradeDuration": "first"})
+        .reset_index()
+    )
+    return pa._number_by_trade_day(grouped)[pa.ROUND_TRIP_COLUMNS]
+
+
+def test_quantity_matching_equals_per_contract_pairing(tmp_path, export):
+    for seed in range(3):
+        path = export(tmp_path / f"fills_{seed}.csv", seed)
+        pd.testing.assert_frame_equal(pa.process_csv(path), _unit_round_trips(path), check_exact=True)
+
+
+def test_segments_split_partial_fills():
+    fills = pd.DataFrame(
+        {
+            "Symbol": ["MESH5"] * 4,
+            "Quantity": [3, -2, -2, 1],
+        }
+    )
+    segments = match_fills(fills)
+    assert segments[["BuyRow", "SellRow", "Quantity", "BuyUnit", "SellUnit"]].values.tolist() == [
+        [0, 1, 2, 0, 0],
+        [0, 2, 1, 2, 0],
+        [3, 2, 1, 0, 1],
+    ]
+
+
+def test_execution_legs_cover_each_matched_contract(tmp_path, export):
+    path = export(tmp_path / "fills.csv", 7)
+    round_trips, legs = pa.process_csv_with_execution_legs(str(path))
+    assert len(legs) == 2 * round_trips["Size"].sum()
+    assert legs["raw_fill_id"].is_unique
+    assert (legs["LegRole"].iloc[0::2] == "open").all() and (legs["LegRole"].iloc[1::2] == "close").all()
+    assert (legs["Qty"].iloc[0::2].to_numpy() == -legs["Qty"].iloc[1::2].to_numpy()).all()
+    per_trade = legs.groupby(["TradeDay", "Id"]).size() // 2
+    sizes = round_trips.set_index(["TradeDay", "Id"])["Size"]
+    pd.testing.assert_series_equal(per_trade.sort_index(), sizes.sort_index(), check_names=False)
+    assert pa.process_csv(path)["PnL"].tolist() == round_trips["PnL"].tolist()
+
+
+def _unique_times_export(export, path, seed, n):
+    # Unique, time-ordered fill times make the whole-file sort order unambiguous.
+    rng = np.random.default_rng(seed)
+    fills = pd.read_csv(export(path, seed, n=n))
+    seconds = np.sort(rng.choice(15 * 86400, len(fills), replace=False) // 86400 * 86400 + rng.choice(8 * 3600, len(fills), replace=False))
+    fills["Date/Time"] = (pd.Timestamp("2025-03-03 08:00:00") + pd.to_timedelta(seconds, unit="s")).strftime("%Y%m%d;%H%M%S")
+    fills.to_csv(path, index=False)
+    return path
+
+
+def test_streamed_batches_match_whole_file_parse(tmp_path, export):
+    path = _unique_times_export(export, tmp_path / "fills.csv", 3, n=400)
+
+    batches = list(pa.iter_round_trip_batches(path, chunksize=37))
+    assert len(batches) > 1
+    streamed = pd.concat(batches, ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, pa.process_csv(path), check_exact=True)
+
+
+def test_streamed_ids_follow_entry_order_when_trades_close_out_of_order(tmp_path):
+    # MESH5 enters first but closes after an MNQM5 trade entered and closed in between.
+    path = tmp_path / "fills.csv"
+    pd.DataFrame(
+        {
+            "Date/Time": ["20250303;100000", "20250303;100100", "20250303;100200", "20250303;101000"],
+            "Symbol": ["MESH5", "MNQM5", "MNQM5", "MESH5"],
+            "Quantity": [1, 1, -1, -1],
+            "Price": [5000.0, 20000.0, 20010.0, 5005.0],
+            "TradeDate": "20250303",
+            "BrokerExecutionCommission": -0.25,
+            "ThirdPartyExecutionCommission": -0.1,
+            "ThirdPartyRegulatoryCommission": -0.02,
+        }
+    ).to_csv(path, index=False)
+
+    whole = pa.process_csv(path)
+    streamed = pd.concat(pa.iter_round_trip_batches(path, chunksize=2), ignore_index=True)
+
+    assert whole[["ContractName", "Id"]].values.tolist() == [["MESH5", 1], ["MNQM5", 2]]
+    pd.testing.assert_frame_equal(streamed, whole, check_exact=True)
+
+
+def test_streaming_holds_fills_sharing_a_timestamp_together(tmp_path, export):
+    # Many fills per half hour, so chunk edges fall inside runs of equal timestamps.
+    path = export(tmp_path / "fills.csv", 5, n=300)
+    whole = pd.concat(pa.iter_round_trip_batches(path, chunksize=10_000), ignore_index=True)
+    chunked = pd.concat(pa.iter_round_trip_batches(path, chunksize=7), ignore_index=True)
+    pd.testing.assert_frame_equal(chunked, whole, check_exact=True)
+
+
+def test_streaming_rejects_exports_out_of_time_order(tmp_path, export):
+    path = export(tmp_path / "fills.csv", 1, n=50)
+    fills = pd.read_csv(path)
+    fills.iloc[::-1].to_csv(path, index=False)
+    with pytest.raises(ValueError, match="time order"):
+        list(pa.iter_round_trip_batches(path, chunksize=10))
+
+
+def test_converter_streams_large_exports_into_a_range_file(tmp_path, monkeypatch, export):
+    temp_dir, target_dir = tmp_path / "temp", tmp_path / "performance"
+    temp_dir.mkdir()
+    path = export(temp_dir / "fills.csv", 2, n=200)
+    expected = pd.concat(pa.iter_round_trip_batches(path, chunksize=25), ignore_index=True)
+    monkeypatch.setattr(pa, "TEMP_PERF_DIR", str(temp_dir))
+    monkeypatch.setattr(pa, "PERFORMANCE_DIR", str(target_dir))
+    monkeypatch.setattr(pa, "_import_settings", lambda: (1, 25))
+
+    pa.round_trip_converter()
+
+    written = list(target_dir.iterdir())
+    assert len(written) == 1 and pa.RANGE_FILE_PATTERN.match(written[0].name)
+    out = pd.read_csv(written[0])
+    assert len(out) == len(expected)
+    assert np.allclose(out["PnL"], expected["PnL"])
+    assert not os.path.exists(path)
+
+
+def test_streamed_upload_merges_chunk_by_chunk_like_a_whole_file_merge(tmp_path, monkeypatch, export):
+    monkeypatch.setattr(pa, "TEMP_PERF_DIR", str(tmp_path))
+    monkeypatch.setattr(pa, "sync_trade_sum_from_performance_rows", lambda *args, **kwargs: None)
+    merged = {}
+    real_upsert = pa._upsert_months
+    for label, settings in (("whole", (0, 25)), ("streamed", (1, 25))):
+        monkeypatch.setattr(pa, "PERFORMANCE_CSV", str(tmp_path / label / "Performance_sum.csv"))
+        monkeypatch.setattr(pa, "_import_settings", lambda settings=settings: settings)
+        (tmp_path / label).mkdir()
+        path = _unique_times_export(export, tmp_path / f"{label}.csv", 4, n=300)
+        chunks = []
+        monkeypatch.setattr(pa, "_upsert_months", lambda df: chunks.append(len(df)) or real_upsert(df))
+
+        result = pa.merge_uploaded_temp_files([str(path)])
+
+        assert result["failed_files"] == []
+        assert not list(tmp_path.glob(".*.partial"))
+        merged[label] = (read_performance(tmp_path / label / "Performance_sum.csv")[0], chunks)
+
+    (whole, whole_chunks), (streamed, streamed_chunks) = merged["whole"], merged["streamed"]
+    assert len(whole_chunks) == 1 and len(streamed_chunks) > 1 and max(streamed_chunks) <= 25
+    pd.testing.assert_frame_equal(streamed, whole)
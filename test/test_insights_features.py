@@ -1,6 +1,8 @@
 import pandas as pd
+import pytest
 
 from dashboard.services.analysis import compute
+from dashboard.services.analysis.sections import run_sections
 
 
 def _fixture_df() -> pd.DataFrame:
@@ -170,3 +172,41 @@ def test_day_plan_review_is_included_in_insights_bundle(monkeypatch):
     assert "summary" in review and "daily" in review
     assert int(review["summary"]["DaysWithPlan"]) >= 2
     assert any(str(r.get("Date")) == "2025-01-06" for r in review["daily"])
+
+
+def test_insights_bundle_sections_run_concurrently_with_passed_day_plan(monkeypatch):
+    df = _fixture_df()
+    plan = pd.DataFrame([{"Date": "2025-01-06", "Bias": "Bullish", "ExpectedDayType": "Trend day", "ActualDayType": "Trend day"}])
+    monkeypatch.setattr(compute, "load_day_plan", lambda: pytest.fail("day plan should be passed in"))
+
+    bundle = compute.insights_bundle(df, params={"min_trades": 1}, day_plan=plan, debug=True)
+    assert set(bundle["debug"]["timings_ms"]) == {
+        "setup", "setup_quality", "compliance", "execution_quality", "playbook", "monthly", "day_plan", "llm_prompt",
+    }
+    assert bundle["day_plan_review"]["summary"]["DaysWithPlan"] == 1
+    assert list(plan.columns) == ["Date", "Bias", "ExpectedDayType", "ActualDayType"]
+
+    monkeypatch.setattr(compute, "INSIGHTS_WORKERS", 1)
+    sequential = compute.insights_bundle(df, params={"min_trades": 1}, day_plan=plan)
+    assert "debug" not in sequential
+    assert sequential == {k: v for k, v in bundle.items() if k != "debug"}
+
+
+def test_run_sections_respects_dependencies_and_reraises():
+    results, timings = run_sections(
+        {
+            "a": (lambda: 2, ()),
+            "b": (lambda a: a * 10, ("a",)),
+            "c": (lambda a, b: a + b, ("a", "b")),
+        }
+    )
+    assert results == {"a": 2, "b": 20, "c": 22}
+    assert set(timings) == {"a", "b", "c"}
+
+    def _boom():
+        raise KeyError("missing column")
+
+    with pytest.raises(KeyError):
+        run_sections({"a": (_boom, ()), "b": (lambda a: a, ("a",))})
+    with pytest.raises(ValueError):
+        run_sections({"a": (lambda b: b, ("b",)), "b": (lambda a: a, ("a",))})
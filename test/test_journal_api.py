@@ -2,6 +2,7 @@ import pandas as pd
 
 from dashboard.app import app
 from dashboard.api import routes
+from dashboard.services.data.performance_store import read_performance
 
 
 def _seed_perf_csv(path):
@@ -48,7 +49,7 @@ def test_journal_tags_updates_performance_sum_csv(tmp_path, monkeypatch):
     assert body["inserted"] == 0
     assert body["skipped"] == 0
 
-    out = pd.read_csv(perf_csv)
+    out = read_performance(perf_csv)[0]
     row = out.loc[out["trade_id"] == "t1"].iloc[0]
     assert row["Phase"] == "Open"
     assert row["Context"] == "TR"
@@ -139,6 +140,6 @@ def test_journal_tags_updates_trade_intent(tmp_path, monkeypatch):
         json={"rows": [{"trade_id": "t1", "TradeIntent": "Swing", "setups": "Wedge"}]},
     )
     assert resp.status_code == 200
-    out = pd.read_csv(perf_csv)
+    out = read_performance(perf_csv)[0]
     row = out.loc[out["trade_id"] == "t1"].iloc[0]
     assert row["TradeIntent"] == "Swing"
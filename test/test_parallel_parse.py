@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pandas as pd
+
+from dashboard.services.utils import parallel_parse
+from dashboard.services.utils import performance_acquisition as pa
+from dashboard.services.utils.parallel_parse import map_files
+
+
+def test_pool_results_keep_input_order_and_per_file_errors(tmp_path, broker_export):
+    good = [broker_export(tmp_path / f"fills_{seed}.csv", seed) for seed in range(3)]
+    broken = tmp_path / "broken.csv"
+    broken.write_text("Date/Time,Symbol\n20250401;080000,MESM5\n")
+    paths = [good[0], str(broken), good[1], good[2]]
+
+    pooled = map_files(pa.process_csv, paths, max_workers=2, min_parallel_bytes=0)
+    inline = map_files(pa.process_csv, paths, max_workers=1)
+
+    assert [path for path, _, _ in pooled] == paths
+    assert isinstance(pooled[1][2], KeyError) and isinstance(inline[1][2], KeyError)
+    for idx in (0, 2, 3):
+        assert pooled[idx][2] is None
+        pd.testing.assert_frame_equal(pooled[idx][1], inline[idx][1])
+
+
+def test_small_batches_are_parsed_in_process(tmp_path, monkeypatch, broker_export):
+    paths = [broker_export(tmp_path / f"fills_{seed}.csv", seed) for seed in range(2)]
+
+    def _no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+
+    monkeypatch.setattr(parallel_parse, "ProcessPoolExecutor", _no_pool)
+    results = map_files(pa.process_csv, paths, max_workers=2, min_parallel_bytes=sum(Path(p).stat().st_size for p in paths) + 1)
+    assert [error for _, _, error in results] == [None, None]
+
+
+def test_merge_uploaded_files_reports_failures_in_upload_order(tmp_path, monkeypatch, broker_export):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    monkeypatch.setattr(pa, "PERFORMANCE_CSV", str(perf_csv))
+    monkeypatch.setattr(pa, "TEMP_PERF_DIR", str(tmp_path))
+    monkeypatch.setattr(pa, "sync_trade_sum_from_performance_rows", lambda *args, **kwargs: None)
+    flat = tmp_path / "open_only.csv"
+    pd.read_csv(broker_export(tmp_path / "src.csv", 9)).head(1).to_csv(flat, index=False)
+    paths = [broker_export(tmp_path / "a.csv", 4), str(tmp_path / "missing.csv"), str(flat), broker_export(tmp_path / "b.csv", 5)]
+    expected_rows = sum(len(pa.process_csv(path)) for path in (paths[0], paths[3]))
+
+    result = pa.merge_uploaded_temp_files(paths)
+
+    assert result["processed_files"] == [paths[0], paths[3]]
+    assert result["failed_files"] == [
+        {"file": paths[1], "error": "file not found"},
+        {"file": paths[2], "error": "no round-trip rows produced"},
+    ]
+    assert result["removed_files"] == [paths[0], paths[2], paths[3]]
+    assert result["merged_rows"] == expected_rows
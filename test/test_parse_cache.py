@@ -0,0 +1,80 @@
+import io
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import dashboard.api.routes as routes
+from dashboard.app import app
+from dashboard.services.utils import parallel_parse, parse_cache
+from dashboard.services.utils import performance_acquisition as pa
+
+
+def test_preview_hit_returns_identical_frames_under_the_new_file_name(tmp_path, broker_export):
+    first = broker_export(tmp_path / "preview_1_fills.csv", 1, flat=True)
+    second = tmp_path / "preview_2_fills.csv"
+    second.write_bytes(Path(first).read_bytes())
+
+    miss = pa.preview_upload_file(first)
+    hit = pa.preview_upload_file(str(second))
+
+    assert (miss["cache"], hit["cache"]) == ("miss", "hit")
+    pd.testing.assert_frame_equal(hit["round_trips"], miss["round_trips"], check_exact=True)
+    expected_legs = pa.process_csv_with_execution_legs(str(second))[1]
+    pd.testing.assert_frame_equal(hit["legs"], expected_legs, check_exact=True)
+
+
+def test_key_changes_with_file_bytes_and_contract_specs(tmp_path, monkeypatch, broker_export):
+    path = broker_export(tmp_path / "fills.csv", 2, flat=True)
+    specs = tmp_path / "specs.csv"
+    specs.write_text("Symbol,PointValue\nMES,5\n")
+    key = parse_cache.cache_key(path, "preview", specs)
+    assert parse_cache.cache_key(path, "round_trips", specs) != key
+
+    specs.write_text("Symbol,PointValue\nMES,50\n")
+    assert parse_cache.cache_key(path, "preview", specs) != key
+
+    with open(path, "a") as fh:
+        fh.write("\n")
+    assert parse_cache.cache_key(path, "preview", tmp_path / "missing.csv") != key
+
+
+def test_eviction_drops_expired_then_least_recently_used_entries(tmp_path):
+    frame = pd.DataFrame({"Id": np.arange(50), "Type": ["Long"] * 50})
+    now = time.time()
+    for idx, key in enumerate(["old", "a", "b", "c"]):
+        parse_cache.store(key, (frame,))
+        os.utime(parse_cache.CACHE_DIR / f"{key}.npz", (now, now - 1000 + idx))
+    os.utime(parse_cache.CACHE_DIR / "old.npz", (now, now - 10 * 86400))
+    assert parse_cache.load("a") is not None  # touched: now most recent
+    entry_size = (parse_cache.CACHE_DIR / "b.npz").stat().st_size
+
+    removed = parse_cache.evict(max_bytes=2 * entry_size, max_age_seconds=86400)
+
+    assert removed == 2
+    assert sorted(p.stem for p in parse_cache.CACHE_DIR.glob("*.npz")) == ["a", "c"]
+    pd.testing.assert_frame_equal(parse_cache.load("c")[0], frame)
+
+
+def test_parse_preview_reports_cache_hits(tmp_path, monkeypatch, broker_export):
+    temp_perf = tmp_path / "temp_performance"
+    temp_perf.mkdir()
+    monkeypatch.setattr(routes, "TEMP_PERF_DIR", temp_perf)
+    # In-process parsing, so the second file sees the first one's entry.
+    monkeypatch.setattr(parallel_parse, "parse_workers", lambda: 1)
+    raw = Path(broker_export(tmp_path / "fills.csv", 3, flat=True)).read_bytes()
+    client = app.test_client()
+
+    def _post():
+        data = {"files": [(io.BytesIO(raw), "a.csv"), (io.BytesIO(raw), "b.csv")]}
+        return client.post("/api/trade-upload/parse-preview", data=data, content_type="multipart/form-data").get_json()
+
+    first, second = _post(), _post()
+
+    assert first["parse_cache"] == {"hits": 1, "misses": 1}
+    assert second["parse_cache"] == {"hits": 2, "misses": 0}
+    assert [log["cache"] for log in second["parse_logs"]] == ["hit", "hit"]
+    assert second["parsed_trades"] == first["parsed_trades"]
+    assert len(second["execution_pool"]) == len(first["execution_pool"])
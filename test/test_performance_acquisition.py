@@ -3,6 +3,9 @@ import pandas as pd
 from dashboard.services.utils import performance_acquisition as pa
 from dashboard.services.utils.trade_enrichment import ensure_trade_id
 import dashboard.services.portfolio as portfolio
+from dashboard.services.analysis.daily_rollup import build_daily_rollup, read_daily_rollup, rollup_is_current
+from dashboard.services.analysis.running_metrics import read_running_state
+from dashboard.services.data.performance_store import read_performance
 
 
 def test_generate_aggregated_data_updates_existing_trade_on_corrections(tmp_path, monkeypatch):
@@ -328,6 +331,47 @@ def test_generate_aggregated_data_syncs_trade_sum_for_affected_days_only(tmp_pat
     assert by_day["2025-01-03"] == 8.0  # new trade day inserted
 
 
+def test_generate_aggregated_data_maintains_daily_rollup(tmp_path, monkeypatch):
+    perf_csv = tmp_path / "combined.csv"
+    monkeypatch.setattr(pa, "PERFORMANCE_CSV", str(perf_csv))
+    monkeypatch.setattr(pa, "sync_trade_sum_from_performance_rows", lambda *args, **kwargs: None)
+
+    def _incoming(entered, pnl):
+        entered = pd.to_datetime(entered, utc=True)
+        return pd.DataFrame(
+            {
+                "Id": range(1, len(entered) + 1),
+                "ContractName": "MESH5",
+                "EnteredAt": entered.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "ExitedAt": (entered + pd.Timedelta(minutes=10)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "EntryPrice": 6000.0,
+                "ExitPrice": 6001.0,
+                "Fees": 1.24,
+                "PnL": pnl,
+                "Size": 1,
+                "Type": "Long",
+                "TradeDuration": "0 days 00:10:00",
+            }
+        )
+
+    pa.generate_aggregated_data([_incoming(["2025-01-02T15:00:00Z", "2025-01-02T16:00:00Z", "2025-01-03T15:00:00Z"], [8.0, -20.0, 5.0])])
+    assert rollup_is_current(perf_csv)
+    pa.generate_aggregated_data([_incoming(["2025-01-03T17:00:00Z", "2025-01-06T15:00:00Z"], [-3.0, 12.0])])
+    assert rollup_is_current(perf_csv)
+
+    rollup = read_daily_rollup(perf_csv)
+    pd.testing.assert_frame_equal(rollup, build_daily_rollup(read_performance(perf_csv)[0]), check_dtype=False)
+    totals = rollup[(rollup["Symbol"] == "*") & (rollup["Setup"] == "*")]
+    assert totals["Date"].tolist() == ["2025-01-02", "2025-01-03", "2025-01-06"]
+    assert totals["Trades"].tolist() == [2, 2, 1]
+    assert set(rollup["Symbol"]) == {"*", "MES"}
+
+    state = read_running_state(perf_csv)
+    assert state["trades"] == 5
+    assert state["cumulative_pnl"] == 2.0
+    assert state["streak"] == 1 and state["max_loss_streak"] == 1
+
+
 def test_apply_phase_tags_uses_cme_windows():
     # UTC timestamps corresponding to US/Central: 08:45, 11:15, 14:30 on the same day.
     df = pd.DataFrame(
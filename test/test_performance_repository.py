@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from dashboard.services.data import performance_repository as repo_mod
+
+
+def _seed(path, pnl):
+    pd.DataFrame(
+        {
+            "TradeDay": ["2026-03-30", "2026-03-31"],
+            "ContractName": ["MESM6", "MESM6"],
+            "EnteredAt": ["2026-03-30T14:30:00Z", "2026-03-31T14:30:00Z"],
+            "ExitedAt": ["2026-03-30T14:40:00Z", "2026-03-31T14:40:00Z"],
+            "PnL(Net)": pnl,
+        }
+    ).to_csv(path, index=False)
+
+
+def test_snapshot_is_reused_until_invalidated(tmp_path):
+    perf_csv = tmp_path / "perf.csv"
+    _seed(perf_csv, [10.0, -5.0])
+
+    first = repo_mod.performance_snapshot(perf_csv)
+    assert repo_mod.performance_snapshot(perf_csv) is first
+    assert "trade_id" in first.columns
+
+    repo_mod.invalidate_performance_cache(perf_csv)
+    second = repo_mod.performance_snapshot(perf_csv)
+    assert second is not first
+    assert second.version > first.version
+
+
+def test_snapshot_reloads_when_file_replaced(tmp_path):
+    perf_csv = tmp_path / "perf.csv"
+    _seed(perf_csv, [10.0, -5.0])
+    first = repo_mod.performance_snapshot(perf_csv)
+
+    replacement = tmp_path / "next.csv"
+    _seed(replacement, [1.0, 2.0])
+    replacement.replace(perf_csv)
+    second = repo_mod.performance_snapshot(perf_csv)
+    assert second.version > first.version
+    assert second.view()["PnL(Net)"].tolist() == [1.0, 2.0]
+
+
+def test_views_do_not_leak_column_changes(tmp_path):
+    perf_csv = tmp_path / "perf.csv"
+    _seed(perf_csv, [10.0, -5.0])
+    snap = repo_mod.performance_snapshot(perf_csv)
+
+    view = snap.view()
+    view["TradeDay"] = snap.trade_day()
+    assert snap.view()["TradeDay"].tolist() == ["2026-03-30", "2026-03-31"]
+    assert str(snap.trade_day().dt.tz) == "US/Central"
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        repo_mod.performance_snapshot(tmp_path / "missing.csv")
+
+
+def test_handed_out_frames_do_not_share_cells_with_the_snapshot(tmp_path):
+    perf_csv = tmp_path / "perf.csv"
+    _seed(perf_csv, [10.0, -5.0])
+    snap = repo_mod.performance_snapshot(perf_csv)
+
+    for frame in (snap.copy(), snap.select([False, True])):
+        frame.loc[frame.index[-1], "PnL(Net)"] = 99.0
+    snap.records()[0]["PnL(Net)"] = 99.0
+    assert snap.view()["PnL(Net)"].tolist() == [10.0, -5.0]
+    assert snap.select([False, True]).index.tolist() == [1]
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.services.data import performance_store as store
+from dashboard.services.data.performance_repository import performance_repository
+from dashboard.services.utils import performance_acquisition as pa
+
+
+def _incoming(entered, pnl, contract="MESH5"):
+    entered = pd.to_datetime(entered, utc=True)
+    return pd.DataFrame(
+        {
+            "Id": range(1, len(entered) + 1),
+            "ContractName": contract,
+            "EnteredAt": entered.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "ExitedAt": (entered + pd.Timedelta(minutes=10)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "EntryPrice": 6000.0,
+            "ExitPrice": 6001.0,
+            "Fees": 1.24,
+            "PnL": pnl,
+            "Size": 1,
+            "Type": "Long",
+            "TradeDuration": "0 days 00:10:00",
+        }
+    )
+
+
+def _use(monkeypatch, perf_csv):
+    monkeypatch.setattr(pa, "PERFORMANCE_CSV", str(perf_csv))
+
+
+def test_upsert_rewrites_only_touched_months(tmp_path, monkeypatch):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    _use(monkeypatch, perf_csv)
+    pa.generate_aggregated_data(
+        [_incoming(["2025-01-06T15:00:00Z", "2025-02-03T15:00:00Z", "2025-03-03T15:00:00Z", "2025-03-04T15:00:00Z"], [5.0, -2.0, 3.0, 4.0])]
+    )
+    before = store.read_manifest(perf_csv)
+    assert sorted(before["partitions"]) == ["2025-01", "2025-02", "2025-03"]
+
+    # One correction in January, one new trade in April.
+    correction = _incoming(["2025-01-06T15:00:00Z"], [6.5])
+    correction["Fees"] = 0.5
+    out = pa.generate_aggregated_data([correction, _incoming(["2025-04-01T15:00:00Z"], [1.0])])
+
+    after = store.read_manifest(perf_csv)
+    assert after["generation"] == before["generation"] + 1
+    for month in ("2025-02", "2025-03"):
+        assert after["partitions"][month] == before["partitions"][month]
+    assert after["partitions"]["2025-01"]["file"] != before["partitions"]["2025-01"]["file"]
+    assert after["partitions"]["2025-04"]["rows"] == 1
+    assert after["index_bytes"] > before["index_bytes"]
+
+    stored, months = store.read_store(perf_csv)
+    assert len(stored) == len(out) == 5
+    assert months.tolist() == ["2025-01", "2025-02", "2025-03", "2025-03", "2025-04"]
+    january = stored[months == "2025-01"].iloc[0]
+    assert (float(january["PnL(Net)"]), float(january["Fees"])) == (6.5, 0.5)
+    index = store.trade_index(perf_csv)
+    assert {index[trade_id] for trade_id in stored["trade_id"]} == {"2025-01", "2025-02", "2025-03", "2025-04"}
+
+
+def test_spliced_snapshot_matches_a_fresh_read(tmp_path, monkeypatch):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    _use(monkeypatch, perf_csv)
+    rng = np.random.default_rng(1)
+    days = pd.bdate_range("2025-01-02", periods=60)
+    entered = [f"{day:%Y-%m-%d}T15:00:00Z" for day in days]
+    pa.generate_aggregated_data([_incoming(entered, np.round(rng.normal(0, 10, len(days)), 2))])
+    repository = performance_repository(perf_csv)
+    repository.snapshot()
+
+    spliced = pa.generate_aggregated_data([_incoming(["2025-02-14T16:00:00Z", "2025-03-20T16:00:00Z"], [1.0, 2.0], "MNQH5")])
+    repository.invalidate()
+    fresh = repository.snapshot()
+
+    pd.testing.assert_frame_equal(spliced, fresh.view())
+    assert fresh.months.tolist() == sorted(fresh.months.tolist())
+
+
+def test_first_write_migrates_the_legacy_csv(tmp_path, monkeypatch):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    _use(monkeypatch, perf_csv)
+    legacy, _ = pa._prepare_incoming([_incoming(["2024-12-30T15:00:00Z", "2025-01-02T15:00:00Z"], [3.0, -1.0])])
+    legacy.to_csv(perf_csv, index=False)
+    assert store.performance_exists(perf_csv) and store.source_path(perf_csv) == perf_csv
+
+    out = pa.generate_aggregated_data([_incoming(["2025-01-03T15:00:00Z"], [2.0])])
+
+    assert not perf_csv.exists() and (tmp_path / "Performance_sum.csv.migrated").exists()
+    assert store.source_path(perf_csv) == store.manifest_path(perf_csv)
+    assert sorted(store.read_manifest(perf_csv)["partitions"]) == ["2024-12", "2025-01"]
+    assert out["PnL(Net)"].tolist() == [3.0, -1.0, 2.0]
+
+
+def test_readers_keep_the_previous_generation_and_skip_unindexed_tails(tmp_path, monkeypatch):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    _use(monkeypatch, perf_csv)
+    pa.generate_aggregated_data([_incoming(["2025-01-06T15:00:00Z"], [1.0])])
+    first = store.read_manifest(perf_csv)
+    pa.generate_aggregated_data([_incoming(["2025-01-07T15:00:00Z"], [2.0])])
+    # A reader that took the first manifest can still open its files.
+    assert (store.store_dir(perf_csv) / first["partitions"]["2025-01"]["file"]).exists()
+    pa.generate_aggregated_data([_incoming(["2025-01-08T15:00:00Z"], [3.0])])
+    assert not (store.store_dir(perf_csv) / first["partitions"]["2025-01"]["file"]).exists()
+
+    # Index entries written by an interrupted upsert are past index_bytes: ignored, then overwritten.
+    with open(store.store_dir(perf_csv) / store.INDEX_NAME, "a", encoding="utf-8") as fh:
+        fh.write("ghost\t2031-01\n")
+    assert "ghost" not in store.trade_index(perf_csv)
+    pa.generate_aggregated_data([_incoming(["2025-02-03T15:00:00Z"], [4.0])])
+    index_text = (store.store_dir(perf_csv) / store.INDEX_NAME).read_text(encoding="utf-8")
+    assert "ghost" not in index_text
+    assert len(store.trade_index(perf_csv)) == 4
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from dashboard.services.analysis import compute
+from dashboard.services.analysis.prepared import PreparedPerformance, prepare_performance
+
+
+def _metrics(df):
+    return {
+        "pnl_growth": compute.pnl_growth(df, granularity="1W-MON"),
+        "drawdown": compute.drawdown(df, granularity="1M"),
+        "behavioral": compute.behavioral_patterns(df),
+        "rolling_win_rate": compute.rolling_win_rate(df, window=10),
+        "sharpe": compute.sharpe_ratio(df, window=5),
+        "efficiency": compute.trade_efficiency(df, window=10),
+        "hourly": compute.hourly_performance(df),
+        "envelope": compute.performance_envelope(df, granularity="1D")[1],
+        "overtrading": compute.overtrading_detection(df, cap_loss_per_trade=150)[1],
+        "kelly": compute.kelly_criterion(df)["data"],
+        "compliance": compute.rule_compliance_score(df)["daily"],
+    }
+
+
+def test_prepared_input_matches_raw_frames(monkeypatch, trades_frame):
+    monkeypatch.setattr(compute, "load_day_plan", lambda: pd.DataFrame(columns=["Date"]))
+    df = trades_frame()
+    prepared = PreparedPerformance(df)
+    from_prepared = _metrics(prepared)
+    for name, expected in _metrics(df).items():
+        pd.testing.assert_frame_equal(from_prepared[name].reset_index(drop=True), expected.reset_index(drop=True), obj=name)
+    params = {"month": "2025-03", "phase": ["Trend"], "min_trades": 1}
+    assert compute.insights_bundle(prepared, params=params) == compute.insights_bundle(df, params=params)
+
+
+def test_metrics_do_not_mutate_prepared_frame(monkeypatch, trades_frame):
+    monkeypatch.setattr(compute, "load_day_plan", lambda: pd.DataFrame(columns=["Date"]))
+    prepared = prepare_performance(trades_frame())
+    before = prepared.df.copy()
+    _metrics(prepared)
+    compute.insights_bundle(prepared)
+    pd.testing.assert_frame_equal(prepared.df, before)
+    assert prepare_performance(prepared) is prepared
+
+
+def test_subset_keeps_derived_keys_aligned(trades_frame):
+    prepared = PreparedPerformance(trades_frame())
+    weekly = prepared.period("1W-MON")
+    mask = prepared.month == "2025-03"
+    march = prepared.subset(mask)
+    assert len(march) == int(mask.sum())
+    assert march.period("1W-MON").equals(weekly[mask.to_numpy()])
+    assert march.trade_day.index.equals(march.df.index)
+    assert (march.trade_day.dt.strftime("%Y-%m") == "2025-03").all()
+    with pytest.raises(ValueError):
+        prepared.period("1H")
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.services.data.bar_cache import BAR_CACHE
+from dashboard.services.data.resample import parse_timeframe, resample_bars, resampled_bars
+
+
+def _reference(bars, timeframe):
+    """Line-by-line port of resampleCandles in web/lib/timeframes.ts."""
+    ms = {"15m": 15, "30m": 30, "1h": 60, "4h": 240}
+    rows = [(int(t.value // 1_000_000), o, h, l, c, v) for t, o, h, l, c, v in bars]
+    if timeframe in ms:
+        times = sorted(r[0] for r in rows)
+        diffs = sorted(b - a for a, b in zip(times, times[1:]) if b - a > 0)
+        base = diffs[len(diffs) // 2] if diffs else 300_000
+        per = max(1, int(np.floor(ms[timeframe] * 60_000 / base + 0.5)))
+        out, current, count, last = [], None, 0, 0
+        for ts, o, h, l, c, v in sorted(rows, key=lambda r: r[0]):
+            if current is None or ts - last > base * 1.5 or count >= per:
+                if current:
+                    out.append(current)
+                current, count = [ts, o, h, l, c, v], 1
+            else:
+                current[2] = max(current[2], h)
+                current[3] = min(current[3], l)
+                current[4] = c
+                current[5] += v
+                count += 1
+            last = ts
+        out.append(current)
+        return out
+    buckets = {}
+    for ts, o, h, l, c, v in rows:
+        day = ts // 86_400_000
+        if timeframe == "1w":
+            day -= (day + 3) % 7
+        key = day * 86_400_000
+        if key not in buckets:
+            buckets[key] = [key, o, h, l, c, v]
+        else:
+            b = buckets[key]
+            b[2], b[3], b[4], b[5] = max(b[2], h), min(b[3], l), c, b[5] + v
+    return [buckets[k] for k in sorted(buckets)]
+
+
+def _session_bars(days=3):
+    stamps = []
+    for day in pd.bdate_range("2026-03-05", periods=days):
+        open_ = pd.Timestamp(day).tz_localize("US/Central") - pd.Timedelta(hours=7)
+        stamps.extend(open_ + pd.Timedelta(minutes=5 * i) for i in range(276) if i != 40)
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, len(stamps)))
+    return pd.DataFrame(
+        {
+            "Datetime": pd.DatetimeIndex(stamps),
+            "Open": close - 0.5,
+            "High": close + rng.random(len(stamps)),
+            "Low": close - rng.random(len(stamps)),
+            "Close": close,
+            "Volume": rng.integers(1, 500, len(stamps)).astype(float),
+        }
+    )
+
+
+@pytest.mark.parametrize("timeframe", ["15m", "30m", "1h", "4h", "1d", "1w"])
+def test_resample_matches_frontend_buckets(timeframe):
+    df = _session_bars()
+    out = resample_bars(df, timeframe)
+    expected = _reference(df[["Datetime", "Open", "High", "Low", "Close", "Volume"]].itertuples(index=False), timeframe)
+    got = [[int(t.value // 1_000_000), o, h, l, c, v] for t, o, h, l, c, v in out.itertuples(index=False)]
+    assert got == expected
+
+
+def test_resample_default_timeframe_is_identity_and_invalid_rejected():
+    df = _session_bars(1)
+    assert resample_bars(df, "5m") is df
+    assert parse_timeframe(None) == "5m"
+    with pytest.raises(ValueError):
+        parse_timeframe("2m")
+
+
+def _write_bars(df, csv_path):
+    out = df.copy()
+    out["Datetime"] = out["Datetime"].dt.strftime("%Y-%m-%d %H:%M:%S%z").str.replace(r"(\d{2})(\d{2})$", r"\1:\2", regex=True)
+    out.to_csv(csv_path, index=False)
+
+
+@pytest.mark.parametrize("timeframe", ["15m", "30m", "1h", "4h", "1d", "1w"])
+def test_resampled_range_matches_one_pass_over_its_bars(tmp_path, timeframe):
+    # Several days, so sequential buckets run across CT midnight.
+    df = _session_bars()
+    csv_path = tmp_path / "MES.csv"
+    _write_bars(df, csv_path)
+    start = df["Datetime"].iloc[50]
+    end = df["Datetime"].iloc[-30]
+
+    BAR_CACHE.clear()
+    for lo, hi, bars in ((None, None, df), (start, end, df[(df["Datetime"] >= start) & (df["Datetime"] <= end)])):
+        served = resampled_bars(csv_path, timeframe, lo, hi)
+        pd.testing.assert_frame_equal(served, resample_bars(bars.reset_index(drop=True), timeframe), check_freq=False)
+
+    hits = BAR_CACHE.stats()["hits"]
+    again = resampled_bars(csv_path, timeframe, start, end)
+    assert BAR_CACHE.stats()["hits"] > hits
+    pd.testing.assert_frame_equal(again, served)
+
+
+def test_candles_route_timeframe(client, tmp_path, monkeypatch):
+    from dashboard.api import routes
+
+    csv_path = tmp_path / "MES.csv"
+    pd.DataFrame(
+        {
+            "Datetime": [f"2026-03-30 09:{m:02d}:00-05:00" for m in range(30, 60, 5)],
+            "Open": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "High": [1.5, 2.5, 3.5, 4.5, 5.5, 6.5],
+            "Low": [0.5, 1.5, 2.5, 3.5, 4.5, 5.5],
+            "Close": [1.25, 2.25, 3.25, 4.25, 5.25, 6.25],
+            "Volume": [10, 20, 30, 40, 50, 60],
+        }
+    ).to_csv(csv_path, index=False)
+    monkeypatch.setitem(routes.DATA_SOURCE_DROPDOWN, "MES", str(csv_path))
+
+    resp = client.get("/api/candles?symbol=MES&timeframe=15m&format=columnar")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["open"] == [1.0, 4.0]
+    assert body["close"] == [3.25, 6.25]
+    assert body["volume"] == [60.0, 150.0]
+    assert client.get("/api/candles?symbol=MES&timeframe=7m").status_code == 400
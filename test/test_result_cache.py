@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+
+from dashboard.api import routes
+from dashboard.services.analysis.result_cache import ResultCache, clear_result_cache
+from dashboard.services.utils import journal_live
+
+
+def _seed_perf_csv(path, pnl=10.0):
+    pd.DataFrame(
+        {
+            "TradeDay": ["2025-11-03", "2025-11-04"],
+            "ContractName": ["MES", "MES"],
+            "IntradayIndex": [1, 1],
+            "EnteredAt": ["2025-11-03T15:00:00Z", "2025-11-04T15:00:00Z"],
+            "ExitedAt": ["2025-11-03T15:10:00Z", "2025-11-04T15:10:00Z"],
+            "PnL(Net)": [pnl, -5.0],
+            "Type": ["Long", "Short"],
+            "Size": [1, 1],
+        }
+    ).to_csv(path, index=False)
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_result_cache_bounds_entries_and_bytes():
+    cache = ResultCache(max_entries=2, max_bytes=10_000)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    cache.get("a")
+    cache.put("c", [3])
+    assert cache.stats()["entries"] == 2
+    assert cache.get("a") == [1]
+    assert cache.get("c") == [3]
+
+    small = ResultCache(max_entries=10, max_bytes=20)
+    small.put("big", ["x" * 50])
+    assert small.stats()["entries"] == 0
+
+
+def test_analysis_results_cached_until_inputs_change(client, tmp_path, monkeypatch):
+    perf_csv = tmp_path / "perf.csv"
+    match_csv = tmp_path / "journal_matches.csv"
+    _seed_perf_csv(perf_csv)
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_csv))
+    monkeypatch.setattr(journal_live, "JOURNAL_MATCHES_CSV", str(match_csv))
+    clear_result_cache()
+
+    loads = []
+    original = routes._filter_performance_range
+    monkeypatch.setattr(routes, "_filter_performance_range", lambda *a, **k: loads.append(1) or original(*a, **k))
+    body = {"include_unmatched": True, "granularity": "1D"}
+
+    first = client.post("/api/analysis/pnl_distribution", json=body).get_json()
+    assert client.post("/api/analysis/pnl_distribution", json=body).get_json() == first
+    assert len(loads) == 1
+
+    client.post("/api/analysis/pnl_distribution", json={**body, "symbol": "MES"})
+    assert len(loads) == 2
+
+    _seed_perf_csv(perf_csv, pnl=99.0)
+    _bump_mtime(perf_csv)
+    changed = client.post("/api/analysis/pnl_distribution", json=body).get_json()
+    assert len(loads) == 3
+    assert changed != first
+
+    pd.DataFrame(columns=["trade_id"]).to_csv(match_csv, index=False)
+    client.post("/api/analysis/pnl_distribution", json=body)
+    assert len(loads) == 4
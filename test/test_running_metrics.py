@@ -0,0 +1,65 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.api import routes
+from dashboard.services.analysis.running_metrics import (
+    read_running_state,
+    running_summary,
+    sync_running_state,
+    update_running_state,
+)
+
+
+@pytest.fixture
+def trades(trades_frame):
+    # One contract, exited when entered: trades close in frame order.
+    return partial(trades_frame, days=20, symbols=("MESH5",), max_hold_hours=0)
+
+
+def test_appended_trades_advance_state_to_a_full_rebuild(trades):
+    first = trades(300, 1, "2025-01-02")
+    state, incremental = update_running_state(first)
+    assert not incremental
+
+    both = pd.concat([first, trades(40, 2, "2025-02-01")], ignore_index=True)
+    advanced, incremental = update_running_state(both, state)
+    assert incremental
+    assert advanced == update_running_state(both)[0]
+
+    pnl = both["PnL(Net)"].to_numpy()
+    cumulative = np.cumsum(pnl)
+    summary = running_summary(advanced)
+    assert summary["trades"] == 340
+    assert summary["cumulative_pnl"] == round(cumulative[-1], 2)
+    assert summary["max_drawdown"] == round((cumulative - np.maximum.accumulate(np.maximum(cumulative, 0))).min(), 2)
+    assert summary["rolling_win_rate"] == round((pnl[-7:] > 0).mean() * 100, 2)
+    assert summary["std_pnl"] == round(pnl.std(ddof=1), 2)
+
+
+def test_trade_inserted_in_the_past_rebuilds_state(trades):
+    first = trades(300, 1, "2025-01-02")
+    state, _ = update_running_state(first)
+    backfilled = pd.concat([first, trades(5, 3, "2025-01-05")], ignore_index=True)
+    rebuilt, incremental = update_running_state(backfilled, state)
+    assert not incremental
+    assert rebuilt == update_running_state(backfilled)[0]
+
+    corrected = first.copy()
+    corrected.loc[10, "PnL(Net)"] += 1.0
+    assert not update_running_state(corrected, state)[1]
+
+
+def test_running_route_reads_persisted_state(client, tmp_path, monkeypatch, trades):
+    perf_csv = tmp_path / "Performance_sum.csv"
+    df = trades(50, 4, "2025-03-03")
+    df.to_csv(perf_csv, index=False)
+    state, _ = sync_running_state(df, perf_csv)
+    assert read_running_state(perf_csv) == state
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_csv))
+
+    resp = client.get("/api/performance/running")
+    assert resp.status_code == 200
+    assert resp.get_json() == running_summary(state)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.services.analysis.studies import compute_studies, parse_studies
+
+
+def _chart_reference(bars, period=20):
+    """Port of computeStudyLines in web/app/trading/page.tsx for one loaded day."""
+    ema, cum_pv, cum_vol = None, 0.0, 0.0
+    emas, vwaps = [], []
+    for idx, (close, high, low, vol) in enumerate(zip(bars["Close"], bars["High"], bars["Low"], bars["Volume"])):
+        alpha = 2 / (period + 1)
+        ema = close if idx == 0 else close * alpha + ema * (1 - alpha)
+        emas.append(ema if idx >= period - 1 else np.nan)
+        v = vol if vol and not np.isnan(vol) else 1
+        cum_pv += (high + low + close) / 3 * v
+        cum_vol += v
+        vwaps.append(cum_pv / cum_vol)
+    return np.array(emas), np.array(vwaps)
+
+
+def _day(date, rows=60, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 5000 + np.cumsum(rng.normal(0, 2, rows))
+    volume = rng.integers(0, 50, rows).astype(float)
+    volume[3] = np.nan
+    return pd.DataFrame(
+        {
+            "Datetime": pd.date_range(f"{date} 08:30", periods=rows, freq="5min", tz="US/Central"),
+            "Open": close,
+            "High": close + 1.5,
+            "Low": close - 1.25,
+            "Close": close,
+            "Volume": volume,
+        }
+    )
+
+
+def test_studies_match_chart_for_one_day():
+    bars = _day("2026-04-01")
+    out = compute_studies(bars)
+    ema, vwap = _chart_reference(bars)
+    np.testing.assert_allclose(out["ema20"], ema, rtol=1e-12)
+    np.testing.assert_allclose(out["vwap"], vwap, rtol=1e-12)
+    assert out["bar_index"].tolist() == list(range(1, 61))
+
+
+def test_studies_reset_each_session():
+    first, second = _day("2026-04-01", seed=1), _day("2026-04-02", seed=2)
+    out = compute_studies(pd.concat([first, second], ignore_index=True))
+    alone = compute_studies(second)
+    np.testing.assert_allclose(out["vwap"].iloc[60:], alone["vwap"], rtol=1e-12)
+    np.testing.assert_allclose(out["ema20"].iloc[60:], alone["ema20"], rtol=1e-12)
+    assert out["bar_index"].iloc[60] == 1
+
+
+def test_parse_studies():
+    assert parse_studies(None) == []
+    assert parse_studies("vwap, ema20") == ["ema20", "vwap"]
+    assert parse_studies("all") == ["ema20", "vwap", "bar_index"]
+    with pytest.raises(ValueError):
+        parse_studies("rsi")
+
+
+def test_trading_session_returns_requested_studies(client, tmp_path, monkeypatch):
+    from dashboard.api import routes
+
+    csv_path = tmp_path / "MES.csv"
+    bars = _day("2026-04-01")
+    out = bars.copy()
+    out["Datetime"] = out["Datetime"].dt.strftime("%Y-%m-%d %H:%M:%S-05:00")
+    out.to_csv(csv_path, index=False)
+    perf_path = tmp_path / "Performance_sum.csv"
+    pd.DataFrame(columns=["TradeDay", "ContractName", "EnteredAt", "ExitedAt", "PnL(Net)"]).to_csv(perf_path, index=False)
+    monkeypatch.setitem(routes.DATA_SOURCE_DROPDOWN, "MES", str(csv_path))
+    monkeypatch.setattr(routes, "PERFORMANCE_CSV", str(perf_path))
+
+    plain = client.get("/api/trading/session?symbol=MES&start=2026-04-01&end=2026-04-01")
+    assert plain.status_code == 200
+    assert "studies" not in plain.get_json()
+
+    resp = client.get("/api/trading/session?symbol=MES&start=2026-04-01&end=2026-04-01&studies=vwap,bar_index")
+    assert resp.status_code == 200
+    studies = resp.get_json()["studies"]
+    assert set(studies) == {"time", "vwap", "bar_index"}
+    assert studies["time"] == [row["time"] for row in resp.get_json()["future"]]
+    np.testing.assert_allclose(studies["vwap"], _chart_reference(bars)[1], rtol=1e-12)
+    assert client.get("/api/trading/session?symbol=MES&studies=macd").status_code == 400
@@ -1,4 +1,6 @@
 import {
+  AnalysisBatchPayload,
+  AnalysisBatchResponse,
   AnalysisPayload,
   AnalysisResponse,
   Candle,
@@ -114,6 +116,16 @@ export async function postAnalysis(metric: string, payload: AnalysisPayload): Pr
   return handleResponse<AnalysisResponse>(res);
 }
 
+export async function postAnalysisBatch(payload: AnalysisBatchPayload): Promise<AnalysisBatchResponse> {
+  const url = new URL("/api/analysis/batch", API_BASE);
+  const res = await fetch(url.toString(), withAuth({
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload)
+  }));
+  return handleResponse<AnalysisBatchResponse>(res);
+}
+
 export async function postInsights(payload: InsightsPayload): Promise<InsightsResponse> {
   const url = new URL("/api/insights", API_BASE);
   const res = await fetch(
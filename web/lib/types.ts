@@ -34,6 +34,26 @@ export type AnalysisResponse =
       actual: AnalysisSeriesPoint[];
     };
 
+export interface AnalysisBatchItem {
+  metric: string;
+  key?: string;
+  granularity?: string;
+  window?: number;
+  params?: Record<string, unknown>;
+}
+
+export interface AnalysisBatchPayload extends Omit<AnalysisPayload, "params"> {
+  metrics: (string | AnalysisBatchItem)[];
+}
+
+export type AnalysisBatchResult =
+  | { ok: true; metric: string; data: AnalysisResponse }
+  | { ok: false; metric: string; status: number; error: string };
+
+export interface AnalysisBatchResponse {
+  results: Record<string, AnalysisBatchResult>;
+}
+
 export interface InsightsPayload {
   symbol?: string;
   start_date?: string;